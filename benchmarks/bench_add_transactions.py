@@ -0,0 +1,64 @@
+"""
+Times adding transactions to a ProcessingLine one add_transaction call at a time against
+add_transactions in batches, shuffled and presorted, for the linked and array backends.
+
+Usage: python -m benchmarks.bench_add_transactions [--count N] [--batch-size B] [--repeat R]
+"""
+import argparse
+import gc
+import random
+import time
+
+from data_structures import ArrayQueue, ArrayStack
+from processing_line import ProcessingLine, Transaction
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=500_000)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    timestamps = [rng.randrange(args.count) for _ in range(args.count)]
+    shuffled = [Transaction(timestamp, "alice", "bob") for timestamp in timestamps]
+    # Built in order rather than sorted from shuffled, so both are laid out in memory as they are read
+    ordered = [Transaction(timestamp, "alice", "bob") for timestamp in sorted(timestamps)]
+    batches = [(shuffled[start:start + args.batch_size], ordered[start:start + args.batch_size])
+               for start in range(0, args.count, args.batch_size)]
+    critical = Transaction(args.count // 2, "carol", "dave")
+
+    print(f"{args.count} transactions in batches of {args.batch_size}, best of {args.repeat}")
+    for name, backends in (("linked", {}), ("arrays", {"queue_type": ArrayQueue, "stack_type": ArrayStack})):
+        def one_by_one(line):
+            for transaction in shuffled:
+                line.add_transaction(transaction)
+
+        def batched(line):
+            for batch, _ in batches:
+                line.add_transactions(batch)
+
+        def presorted(line):
+            for _, batch in batches:
+                line.add_transactions(batch, presorted=True)
+
+        times = []
+        for add in (one_by_one, batched, presorted):
+            best = None
+            for _ in range(args.repeat):
+                line = ProcessingLine(critical, **backends)
+                gc.collect()
+                start = time.perf_counter()
+                add(line)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+                del line
+            times.append(best)
+
+        print(f"  {name}: add_transaction {times[0]:.3f}s, add_transactions {times[1]:.3f}s "
+              f"({times[0] / times[1]:.1f}x), presorted {times[2]:.3f}s ({times[0] / times[2]:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Streams transactions through an AsyncProcessingLine while a ticker task measures how late
+the event loop wakes it, against consuming a ProcessingLine's synchronous iterator inside the
+loop, which signs on the loop itself.
+
+Usage: python -m benchmarks.bench_async_line [--count N] [--batch-size B] [--processes]
+"""
+import argparse
+import asyncio
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from processing_line import AsyncProcessingLine, ProcessingLine, Transaction
+
+TICK = 0.001
+
+
+async def ticker(lags, stop):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+
+def make_transactions(count):
+    rng = random.Random(0)
+    return [Transaction(rng.randrange(count), f"user{rng.randrange(100_000)}", f"user{rng.randrange(100_000)}")
+            for _ in range(count)]
+
+
+async def consume_sync(transactions, batch_size, executor):
+    line = ProcessingLine(Transaction(len(transactions) // 2, "critical", "critical"))
+    for transaction in transactions:
+        line.add_transaction(transaction)
+    received = 0
+    for _ in line:
+        received += 1
+        if received % batch_size == 0:
+            # Give the loop a chance between batches, as a cooperative consumer would
+            await asyncio.sleep(0)
+    return received
+
+
+async def consume_async(transactions, batch_size, executor):
+    line = AsyncProcessingLine(Transaction(len(transactions) // 2, "critical", "critical"), batch_size=batch_size,
+                               executor=executor)
+
+    async def produce():
+        for transaction in transactions:
+            await line.add(transaction)
+        await line.close()
+
+    producer = asyncio.ensure_future(produce())
+    received = 0
+    async for _ in line:
+        received += 1
+    await producer
+    return received
+
+
+async def measure(consume, transactions, batch_size, executor):
+    lags = []
+    stop = asyncio.Event()
+    ticks = asyncio.ensure_future(ticker(lags, stop))
+    start = time.perf_counter()
+    received = await consume(transactions, batch_size, executor)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticks
+    lags.sort()
+    return received, elapsed, lags[len(lags) // 2], lags[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=AsyncProcessingLine.DEFAULT_BATCH_SIZE)
+    parser.add_argument("--processes", action="store_true", help="sign in a process pool instead of the default threads")
+    args = parser.parse_args()
+
+    executor = ProcessPoolExecutor() if args.processes else None
+    print(f"{args.count} transactions, batches of {args.batch_size}, "
+          f"signing in {'processes' if args.processes else 'the default thread pool'}")
+    for name, consume in (("sync iterator", consume_sync), ("AsyncProcessingLine", consume_async)):
+        transactions = make_transactions(args.count)
+        received, elapsed, median, worst = asyncio.run(measure(consume, transactions, args.batch_size, executor))
+        print(f"  {name:20} {received} in {elapsed:.3f}s, loop lag median {median * 1e3:.2f}ms, "
+              f"worst {worst * 1e3:.2f}ms")
+    if executor is not None:
+        executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Compares ProcessingBook against FlatProcessingBook: memory held after loading signed
+transactions (tracemalloc) and the time to look every transaction up again.
+
+Usage: python -m benchmarks.bench_book_backend [--count N]
+"""
+import argparse
+import time
+import tracemalloc
+
+from processing_book import FlatProcessingBook, ProcessingBook
+from processing_line import Transaction, sign_batch
+
+
+def load(book_class, transactions):
+    book = book_class()
+    for index, transaction in enumerate(transactions):
+        book[transaction] = index
+    return book
+
+
+def measure_memory(book_class, transactions):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    book = load(book_class, transactions)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del book
+    return after - before
+
+
+def time_lookups(book, transactions):
+    start = time.perf_counter()
+    for transaction in transactions:
+        book[transaction]
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=200_000)
+    args = parser.parse_args()
+
+    transactions = [Transaction(index, f"user{index % 977}", f"user{index % 1009}") for index in range(args.count)]
+    sign_batch(transactions)
+
+    print(f"transactions: {args.count}")
+    for book_class in (ProcessingBook, FlatProcessingBook):
+        held = measure_memory(book_class, transactions)
+        start = time.perf_counter()
+        book = load(book_class, transactions)
+        load_time = time.perf_counter() - start
+        lookup_time = time_lookups(book, transactions)
+        assert len(book) == args.count
+        print(f"{book_class.__name__:<20} memory {held / 2**20:8.1f} MiB ({held / args.count:6.1f} B/tx)  "
+              f"load {load_time:.3f}s  lookup {lookup_time:.3f}s ({lookup_time / args.count * 1e6:.2f} us/tx)")
+
+
+if __name__ == "__main__":
+    main()
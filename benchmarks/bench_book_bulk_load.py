@@ -0,0 +1,60 @@
+"""
+Compares loading a ProcessingBook one __setitem__ at a time against bulk_load.
+
+Usage: python -m benchmarks.bench_book_bulk_load [--count N] [--duplicates D]
+"""
+import argparse
+import random
+import time
+
+from processing_book import ProcessingBook
+from processing_line import Transaction, sign_batch
+
+
+def pages_of(book):
+    result = []
+    for page in book.pages:
+        if isinstance(page, ProcessingBook):
+            result.append(pages_of(page))
+        elif page is not None:
+            result.append((page[0].signature, page[1]))
+        else:
+            result.append(None)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--duplicates", type=int, default=1_000, help="pairs that repeat an earlier signature")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    transactions = [Transaction(index, f"user{index % 977}", f"user{index % 1009}") for index in range(args.count)]
+    sign_batch(transactions)
+    pairs = [(transaction, rng.randint(1, 1_000)) for transaction in transactions]
+    for _ in range(args.duplicates):
+        transaction, amount = rng.choice(pairs)
+        pairs.append((transaction, amount + rng.randint(0, 1)))
+
+    start = time.perf_counter()
+    sequential = ProcessingBook()
+    for transaction, amount in pairs:
+        sequential[transaction] = amount
+    sequential_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bulk = ProcessingBook()
+    bulk.bulk_load(pairs)
+    bulk_time = time.perf_counter() - start
+
+    assert pages_of(sequential) == pages_of(bulk), "page trees differ"
+    assert (len(sequential), sequential.get_error_count()) == (len(bulk), bulk.get_error_count())
+
+    print(f"pairs: {len(pairs)}, stored: {len(bulk)}, errors: {bulk.get_error_count()}")
+    print(f"sequential: {sequential_time:.3f}s")
+    print(f"bulk_load:  {bulk_time:.3f}s  speedup {sequential_time / bulk_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Compares rebuilding a ProcessingBook by re-inserting every transaction against reopening
+a saved copy with MappedProcessingBook, and times lookups on both.
+
+Usage: python -m benchmarks.bench_book_mmap [--count N] [--path FILE]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from processing_book import MappedProcessingBook, ProcessingBook
+from processing_line import Transaction, sign_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--path", default=os.path.join(tempfile.gettempdir(), "bench_book.pbook"))
+    args = parser.parse_args()
+
+    transactions = [Transaction(index, f"user{index % 977}", f"user{index % 1009}") for index in range(args.count)]
+    sign_batch(transactions)
+
+    start = time.perf_counter()
+    book = ProcessingBook()
+    for index, transaction in enumerate(transactions):
+        book[transaction] = index
+    rebuild_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    book.save(args.path)
+    save_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    mapped = MappedProcessingBook(args.path)
+    open_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for transaction in transactions:
+        book[transaction]
+    book_lookup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for index, transaction in enumerate(transactions):
+        assert mapped[transaction] == index
+    mapped_lookup = time.perf_counter() - start
+
+    print(f"transactions: {args.count}, file: {os.path.getsize(args.path) / 2**20:.1f} MiB")
+    print(f"rebuild by inserting: {rebuild_time:.3f}s")
+    print(f"save:                 {save_time:.3f}s")
+    print(f"open mapped file:     {open_time * 1e3:.3f}ms")
+    print(f"lookups in memory:    {book_lookup / args.count * 1e6:.2f} us/tx")
+    print(f"lookups in file:      {mapped_lookup / args.count * 1e6:.2f} us/tx")
+    mapped.close()
+    os.remove(args.path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Counts keys in a HashTableSeparateChaining the way detect_by_blocks does, once with a lookup
+followed by a store (two searches of the chain, as _increment used to do) and once with
+increment, which finds the key once and adds to it in place. Run with short chains (the
+table grows at its default load factor) and with long ones (a fixed table of 17 buckets).
+Then reports the memory a growing table takes per key, measured with tracemalloc (the keys
+themselves are built beforehand and not counted).
+
+Usage: python -m benchmarks.bench_chaining_buckets [--count N] [--fixed-count N] [--distinct D]
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from data_structures import HashTableSeparateChaining
+from processing_line import BASE36_CHARACTERS
+
+
+def get_then_set(table, keys):
+    for key in keys:
+        try:
+            table[key] = table[key] + 1
+        except KeyError:
+            table[key] = 1
+
+
+def increment(table, keys):
+    for key in keys:
+        table.increment(key)
+
+
+def bytes_per_key(keys):
+    gc.collect()
+    tracemalloc.start()
+    table = HashTableSeparateChaining()
+    for value, key in enumerate(keys):
+        table[key] = value
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return used / len(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=500_000)
+    parser.add_argument("--fixed-count", type=int, default=20_000)
+    parser.add_argument("--distinct", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    distinct = ["".join(rng.choice(BASE36_CHARACTERS) for _ in range(8)) for _ in range(args.distinct)]
+    keys = [rng.choice(distinct) for _ in range(args.count)]
+
+    for name, count, make_table in (
+        ("growing table", args.count, HashTableSeparateChaining),
+        ("17 fixed buckets", args.fixed_count, lambda: HashTableSeparateChaining(max_load_factor=None)),
+    ):
+        times = []
+        for count_keys in (get_then_set, increment):
+            table = make_table()
+            start = time.perf_counter()
+            count_keys(table, keys[:count])
+            times.append(time.perf_counter() - start)
+        print(f"{name}, {count} keys, {len(table)} distinct:")
+        print(f"  lookup then store: {times[0]:.3f}s")
+        print(f"  increment:         {times[1]:.3f}s ({times[0] / times[1]:.1f}x)")
+
+    print(f"memory, {len(distinct)} keys: {bytes_per_key(distinct):.0f} B/key")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Compares FraudDetection.detect_by_blocks against the original per-block-size implementation.
+
+The batch is random base36 signatures of length L, with a share of them rewritten as block
+permutations of earlier signatures so there are groups to find. The original implementation
+keeps 17 hash buckets whatever the batch size, so it only runs on the first --legacy-count
+transactions.
+
+With --workers W the full batch is also scored with detect_by_blocks(workers=W).
+
+Usage: python -m benchmarks.bench_detect_by_blocks [--count N] [--length L] [--fraud F] [--legacy-count M]
+       [--workers W]
+"""
+import argparse
+import random
+import time
+
+from algorithms import insertion_sort
+from data_structures import HashTableSeparateChaining, LinkedList
+from fraud_detection import FraudDetection
+from processing_line import BASE36_CHARACTERS, Transaction
+
+
+def legacy_detect_by_blocks(transactions):
+    """
+    detect_by_blocks as it was before the character grouping pass.
+    """
+    raw_signature_length = len(transactions[0].signature)
+    best_score_block_size = 1
+    best_score = 1
+    for S in range(1, raw_signature_length + 1):
+        table = HashTableSeparateChaining()
+        for transaction in transactions:
+            signature = transaction.signature
+            signature_length = (raw_signature_length // S) * S
+            prefix = signature[:signature_length]
+            suffix = signature[signature_length:]
+            blocks = LinkedList()
+            for i in range(0, signature_length, S):
+                blocks.append(prefix[i:i + S])
+            duplicates = "".join(insertion_sort(blocks)) + suffix
+            try:
+                table[duplicates] = table[duplicates] + 1
+            except KeyError:
+                table[duplicates] = 1
+        score = 1
+        for _, value in table.items():
+            score *= value
+        if score > best_score:
+            best_score = score
+            best_score_block_size = S
+    return (best_score_block_size, best_score)
+
+
+def make_transactions(count, length, fraud, rng):
+    signatures = []
+    for index in range(count):
+        if signatures and rng.random() < fraud:
+            signature = rng.choice(signatures)
+            block_size = rng.randint(1, length)
+            usable = length // block_size * block_size
+            blocks = [signature[i:i + block_size] for i in range(0, usable, block_size)]
+            rng.shuffle(blocks)
+            signature = "".join(blocks) + signature[usable:]
+        else:
+            signature = "".join(rng.choice(BASE36_CHARACTERS) for _ in range(length))
+        signatures.append(signature)
+
+    transactions = []
+    for index, signature in enumerate(signatures):
+        transaction = Transaction(index, "sender", "receiver")
+        transaction.signature = signature
+        transactions.append(transaction)
+    return transactions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--length", type=int, default=36)
+    parser.add_argument("--fraud", type=float, default=0.01, help="share of signatures permuted from earlier ones")
+    parser.add_argument("--legacy-count", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    transactions = make_transactions(args.count, args.length, args.fraud, random.Random(args.seed))
+    sample = transactions[:args.legacy_count]
+
+    start = time.perf_counter()
+    legacy = legacy_detect_by_blocks(sample)
+    legacy_time = time.perf_counter() - start
+    start = time.perf_counter()
+    result = FraudDetection(sample).detect_by_blocks()
+    sample_time = time.perf_counter() - start
+    assert result == legacy, (result, legacy)
+
+    print(f"first {len(sample)} transactions, L={args.length}:")
+    print(f"  original:          {legacy_time:.3f}s")
+    print(f"  detect_by_blocks:  {sample_time:.3f}s ({legacy_time / sample_time:.1f}x)")
+
+    start = time.perf_counter()
+    block_size, score = FraudDetection(transactions).detect_by_blocks()
+    elapsed = time.perf_counter() - start
+    print(f"all {args.count} transactions: {elapsed:.3f}s, block size {block_size}, score has {score.bit_length()} bits")
+
+    if args.workers > 1:
+        start = time.perf_counter()
+        parallel = FraudDetection(transactions).detect_by_blocks(workers=args.workers)
+        parallel_time = time.perf_counter() - start
+        assert parallel == (block_size, score)
+        print(f"  with {args.workers} workers: {parallel_time:.3f}s ({elapsed / parallel_time:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
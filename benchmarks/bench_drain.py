@@ -0,0 +1,40 @@
+"""
+Times ProcessingLine.drain for increasing numbers of worker processes.
+
+Usage: python -m benchmarks.bench_drain [--count N] [--workers 1 2 4 ...]
+"""
+import argparse
+import os
+import random
+import time
+
+from processing_line import ProcessingLine, Transaction
+
+
+def make_line(count, seed=0):
+    rng = random.Random(seed)
+    line = ProcessingLine(Transaction(count // 2, "critical", "critical"))
+    for _ in range(count):
+        line.add_transaction(Transaction(rng.randrange(count), f"user{rng.randrange(100_000)}", f"user{rng.randrange(100_000)}"))
+    return line
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=500_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    print(f"transactions: {args.count}, cpus: {os.cpu_count()}")
+    baseline = None
+    for workers in args.workers:
+        line = make_line(args.count)
+        start = time.perf_counter()
+        line.drain(workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"workers={workers:<3} {elapsed:.3f}s  speedup {baseline / elapsed:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
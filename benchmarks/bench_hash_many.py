@@ -0,0 +1,46 @@
+"""
+Times hashing a batch of equal length keys one hash call at a time against one hash_many call,
+for LinearProbeTable and HashTableSeparateChaining.
+
+hash_many uses NumPy when it is installed and the weighted sum in pure Python otherwise; the
+output says which one ran.
+
+Usage: python -m benchmarks.bench_hash_many [--count N] [--length K]
+"""
+import argparse
+import random
+import time
+
+from data_structures import HashTableSeparateChaining, LinearProbeTable
+from data_structures import universal_hash
+from processing_line import BASE36_CHARACTERS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--length", type=int, default=36)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    keys = ["".join(rng.choice(BASE36_CHARACTERS) for _ in range(args.length)) for _ in range(args.count)]
+    backend = "numpy" if universal_hash.numpy is not None else "pure Python"
+    print(f"{args.count} keys of length {args.length}, hash_many backend: {backend}")
+
+    for table in (LinearProbeTable(sizes=[1572869]), HashTableSeparateChaining(1572869)):
+        start = time.perf_counter()
+        scalar = [table.hash(key) for key in keys]
+        scalar_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = table.hash_many(keys)
+        batch_time = time.perf_counter() - start
+        assert batch.to_list() == scalar
+
+        name = type(table).__name__
+        print(f"  {name:26} hash: {scalar_time / args.count * 1e6:.2f} us/key, "
+              f"hash_many: {batch_time / args.count * 1e6:.2f} us/key ({scalar_time / batch_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
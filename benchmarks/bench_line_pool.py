@@ -0,0 +1,68 @@
+"""
+Routes transactions into a ProcessingLinePool and drains it. Routing by binary search over
+the critical timestamps is timed against scanning the lines in order for the last critical
+timestamp at or before each transaction, then the pool is drained with increasing numbers
+of worker processes.
+
+Usage: python -m benchmarks.bench_line_pool [--count N] [--lines L] [--scan-count N] [--workers 1 2 4 ...]
+"""
+import argparse
+import os
+import random
+import time
+
+from processing_line import ProcessingLinePool, Transaction
+
+
+def make_pool(count, lines, seed=0):
+    rng = random.Random(seed)
+    pool = ProcessingLinePool(Transaction(rng.randrange(count), "critical", "critical") for _ in range(lines))
+    transactions = [Transaction(rng.randrange(count), f"user{rng.randrange(100_000)}", f"user{rng.randrange(100_000)}")
+                    for _ in range(count)]
+    return pool, transactions
+
+
+def scan_route(pool, transactions):
+    for transaction in transactions:
+        target = pool[0]
+        for index in range(len(pool)):
+            if pool[index].critical_transaction.timestamp > transaction.timestamp:
+                break
+            target = pool[index]
+        target.add_transaction(transaction)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--lines", type=int, default=1_000)
+    parser.add_argument("--scan-count", type=int, default=5_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    print(f"transactions: {args.count}, lines: {args.lines}, cpus: {os.cpu_count()}")
+    pool, transactions = make_pool(args.count, args.lines)
+    start = time.perf_counter()
+    pool.add_transactions(transactions)
+    bisect_time = (time.perf_counter() - start) / args.count
+
+    scan_pool, _ = make_pool(args.count, args.lines)
+    start = time.perf_counter()
+    scan_route(scan_pool, transactions[:args.scan_count])
+    scan_time = (time.perf_counter() - start) / args.scan_count
+    print(f"routing per transaction: binary search {bisect_time * 1e6:.2f}us, "
+          f"linear scan {scan_time * 1e6:.2f}us ({scan_time / bisect_time:.0f}x)")
+
+    baseline = None
+    for workers in args.workers:
+        pool, transactions = make_pool(args.count, args.lines)
+        pool.add_transactions(transactions)
+        start = time.perf_counter()
+        pool.drain(workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"drain workers={workers:<3} {elapsed:.3f}s  speedup {baseline / elapsed:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
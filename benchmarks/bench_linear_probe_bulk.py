@@ -0,0 +1,51 @@
+"""
+Times filling a LinearProbeTable one __setitem__ at a time, growing through every table size,
+against LinearProbeTable.from_items, which sizes the table once and places every key in one pass.
+
+Usage: python -m benchmarks.bench_linear_probe_bulk [--count N] [--length K]
+"""
+import argparse
+import random
+import time
+
+from data_structures import LinearProbeTable
+from processing_line import BASE36_CHARACTERS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--length", type=int, default=12)
+    args = parser.parse_args()
+
+    if args.count > 786_000:
+        # Past half of the largest default size the table stops growing and fills up
+        sizes = [5, 13, 29, 53, 97, 193, 389, 769, 1543, 3079, 6151, 12289, 24593, 49157, 98317,
+                 196613, 393241, 786433, 1572869, 3145739]
+    else:
+        sizes = None
+
+    rng = random.Random(0)
+    pairs = [("".join(rng.choice(BASE36_CHARACTERS) for _ in range(args.length)), index) for index in range(args.count)]
+
+    start = time.perf_counter()
+    table = LinearProbeTable(sizes)
+    for key, value in pairs:
+        table[key] = value
+    insert_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loaded = LinearProbeTable.from_items(pairs, sizes)
+    bulk_time = time.perf_counter() - start
+
+    assert len(loaded) == len(table)
+    for key, value in pairs[::max(1, args.count // 1000)]:
+        assert loaded[key] == table[key]
+
+    print(f"{args.count} keys of length {args.length}, final table size {loaded.table_size}")
+    print(f"  __setitem__ per key: {insert_time:.3f}s")
+    print(f"  from_items:          {bulk_time:.3f}s ({insert_time / bulk_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Measures the memory held per element of a LinkedQueue, LinkedStack and LinkedList with
+tracemalloc, for the slotted Node against a Node with a __dict__ (the previous layout), then
+times steady append/serve and push/pop churn with and without a NodePool, best of 3 runs.
+
+Usage: python -m benchmarks.bench_node_pool [--count N] [--churn N] [--depth D]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from data_structures import LinkedList, LinkedQueue, LinkedStack, NodePool
+from data_structures import linked_list, linked_queue, linked_stack
+from data_structures.node import Node
+
+
+class DictNode:
+    def __init__(self, item=None):
+        self.item = item
+        self.link = None
+
+
+def held_bytes(make, add, items):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    container = make()
+    for item in items:
+        add(container, item)
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return held
+
+
+def churn(make, add, remove, depth, steps):
+    times = []
+    for _ in range(3):
+        container = make()
+        for item in range(depth):
+            add(container, item)
+        gc.collect()
+        start = time.perf_counter()
+        for item in range(steps):
+            add(container, item)
+            remove(container)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=500_000)
+    parser.add_argument("--churn", type=int, default=1_000_000)
+    parser.add_argument("--depth", type=int, default=10_000)
+    args = parser.parse_args()
+
+    structures = (
+        ("LinkedQueue", LinkedQueue, LinkedQueue.append, LinkedQueue.serve),
+        ("LinkedStack", LinkedStack, LinkedStack.push, LinkedStack.pop),
+        ("LinkedList", LinkedList, LinkedList.append, lambda structure: structure.delete_at_index(0)),
+    )
+    modules = (linked_list, linked_queue, linked_stack)
+
+    items = [object() for _ in range(args.count)]
+    print(f"bytes per element, {args.count} elements:")
+    for name, make, add, _ in structures:
+        sizes = []
+        for node_type in (DictNode, Node):
+            for module in modules:
+                module.Node = node_type
+            sizes.append(held_bytes(make, add, items) / args.count)
+        for module in modules:
+            module.Node = Node
+        print(f"  {name:12} __dict__ node {sizes[0]:6.1f}, slotted node {sizes[1]:6.1f}")
+
+    print(f"{args.churn} add/remove pairs at a depth of {args.depth}, best of 3:")
+    for name, make, add, remove in structures:
+        plain_time = churn(make, add, remove, args.depth, args.churn)
+        pool = NodePool()
+        pooled_time = churn(lambda: make(pool=pool), add, remove, args.depth, args.churn)
+        print(f"  {name:12} new nodes {plain_time:6.3f}s, pooled {pooled_time:6.3f}s "
+              f"({plain_time / pooled_time:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Measures clustering in the open-addressing tables by counting probes: every table type is
+wrapped so _probe_position counts the slots it visits past home, then filled with N keys. The
+output is the average and worst number of extra probes for a hit and for a miss.
+
+Sequential keys ("tx000001", ...) are where primary clustering shows up most for the universal
+hash; --random uses random base36 keys instead.
+
+Usage: python -m benchmarks.bench_probe_clustering [--count N] [--random]
+"""
+import argparse
+import random
+
+from data_structures import DoubleHashingTable, LinearProbeTable, QuadraticProbeTable
+from processing_line import BASE36_CHARACTERS
+
+
+def counting(table_type):
+    class Counting(table_type):
+        probes = 0
+
+        def _probe_position(self, home, step, attempt):
+            Counting.probes += 1
+            return super()._probe_position(home, step, attempt)
+
+    Counting.__name__ = table_type.__name__
+    return Counting
+
+
+def probe_counts(table_type, keys, table):
+    """
+    Extra probes of looking up each key, as an (average, worst) pair.
+    """
+    total = 0
+    worst = 0
+    for key in keys:
+        table_type.probes = 0
+        key in table
+        total += table_type.probes
+        worst = max(worst, table_type.probes)
+    return total / len(keys), worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=50_000)
+    parser.add_argument("--random", action="store_true", help="use random keys instead of sequential ones")
+    args = parser.parse_args()
+
+    if args.random:
+        rng = random.Random(0)
+        keys = ["".join(rng.choice(BASE36_CHARACTERS) for _ in range(10)) for _ in range(2 * args.count)]
+    else:
+        keys = [f"tx{index:08d}" for index in range(2 * args.count)]
+    present, missing = keys[:args.count], keys[args.count:]
+
+    print(f"{args.count} {'random' if args.random else 'sequential'} keys, extra probes per lookup")
+    print(f"  {'table':20} {'load':>6} {'hit avg':>8} {'hit max':>8} {'miss avg':>9} {'miss max':>9}")
+    for table_type in (LinearProbeTable, QuadraticProbeTable, DoubleHashingTable):
+        table_type = counting(table_type)
+        table = table_type()
+        for index, key in enumerate(present):
+            table[key] = index
+
+        hit_average, hit_worst = probe_counts(table_type, present, table)
+        miss_average, miss_worst = probe_counts(table_type, missing, table)
+        print(f"  {table_type.__name__:20} {len(table) / table.table_size:6.2f} {hit_average:8.2f} {hit_worst:8d} "
+              f"{miss_average:9.2f} {miss_worst:9d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Compares the linked and array-backed queues and stacks that ProcessingLine can hold its
+transactions in: the memory each holds per item (tracemalloc, not counting the items
+themselves), the time to fill and empty each, and the time to add and drain a line.
+
+Usage: python -m benchmarks.bench_queue_stack_backends [--count N] [--line-count N]
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from data_structures import ArrayQueue, ArrayStack, LinkedQueue, LinkedStack
+from processing_line import ProcessingLine, Transaction
+
+
+def held_bytes(make, add, items):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    container = make()
+    for item in items:
+        add(container, item)
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return held
+
+
+def fill_and_empty(make, add, remove, items):
+    container = make()
+    start = time.perf_counter()
+    for item in items:
+        add(container, item)
+    fill_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    while len(container) > 0:
+        remove(container)
+    return fill_time, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--line-count", type=int, default=200_000)
+    args = parser.parse_args()
+
+    items = [object() for _ in range(args.count)]
+    print(f"{args.count} items:")
+    for name, make, add, remove in (
+        ("LinkedQueue", LinkedQueue, LinkedQueue.append, LinkedQueue.serve),
+        ("ArrayQueue", ArrayQueue, ArrayQueue.append, ArrayQueue.serve),
+        ("LinkedStack", LinkedStack, LinkedStack.push, LinkedStack.pop),
+        ("ArrayStack", ArrayStack, ArrayStack.push, ArrayStack.pop),
+    ):
+        gc.collect()
+        held = held_bytes(make, add, items)
+        gc.collect()
+        fill_time, empty_time = fill_and_empty(make, add, remove, items)
+        print(f"  {name:12} {held / args.count:6.1f} bytes/item, fill {fill_time:6.3f}s, empty {empty_time:6.3f}s")
+
+    rng = random.Random(0)
+    transactions = [Transaction(rng.randrange(args.line_count), "alice", "bob") for _ in range(args.line_count)]
+    print(f"ProcessingLine with {args.line_count} transactions, add then empty the queue and stack:")
+    for name, backends in (
+        ("linked", {}),
+        ("arrays", {"queue_type": ArrayQueue, "stack_type": ArrayStack}),
+    ):
+        gc.collect()
+        line = ProcessingLine(Transaction(args.line_count // 2, "carol", "dave"), **backends)
+        start = time.perf_counter()
+        for transaction in transactions:
+            line.add_transaction(transaction)
+        add_time = time.perf_counter() - start
+        start = time.perf_counter()
+        while not line._before_queue.is_empty():
+            line._before_queue.serve()
+        while not line._after_stack.is_empty():
+            line._after_stack.pop()
+        print(f"  {name:8} add {add_time:6.3f}s, empty {time.perf_counter() - start:6.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Compares FraudDetection.rectify against the original implementation, which inserts every
+transaction into a real LinearProbeTable for every function.
+
+Usage: python -m benchmarks.bench_rectify [--count N] [--functions F] [--workers W]
+"""
+import argparse
+import random
+import time
+
+from data_structures.hash_table_linear_probing import LinearProbeTable
+from fraud_detection import FraudDetection
+from processing_line import Transaction
+
+
+def legacy_rectify(transactions, functions):
+    """
+    rectify as it was before probing was replayed on flat arrays.
+    """
+    best_func = None
+    best_mpcl = float("inf")
+    for f in functions:
+        table = LinearProbeTable()
+        max_chain = 0
+        for tx in transactions:
+            key = str(f(tx))
+            probe_chain = 0
+            position = table.hash(key)
+            while True:
+                if table._LinearProbeTable__array[position] is None:
+                    break
+                elif table._LinearProbeTable__array[position][0] == key:
+                    break
+                else:
+                    probe_chain += 1
+                    position = (position + 1) % table.table_size
+            max_chain = max(max_chain, probe_chain)
+            table[key] = tx.timestamp
+        if max_chain < best_mpcl:
+            best_mpcl = max_chain
+            best_func = f
+    return (best_func, best_mpcl)
+
+
+class Modulo:
+    """
+    A picklable candidate function: the timestamp times a multiplier, modulo a range.
+    """
+
+    def __init__(self, multiplier, modulus):
+        self.multiplier = multiplier
+        self.modulus = modulus
+
+    def __call__(self, transaction):
+        return transaction.timestamp * self.multiplier % self.modulus
+
+    def __repr__(self):
+        return f"Modulo({self.multiplier}, {self.modulus})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=20_000)
+    parser.add_argument("--functions", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    transactions = [Transaction(rng.randrange(10**9), "sender", "receiver") for _ in range(args.count)]
+    functions = [Modulo(rng.randrange(1, 10**6), rng.randrange(args.count, 10 * args.count)) for _ in range(args.functions)]
+    fraud_detection = FraudDetection(transactions)
+
+    if not args.skip_legacy:
+        start = time.perf_counter()
+        legacy = legacy_rectify(transactions, functions)
+        legacy_time = time.perf_counter() - start
+        print(f"original: {legacy_time:.3f}s -> {legacy}")
+
+    start = time.perf_counter()
+    result = fraud_detection.rectify(functions)
+    elapsed = time.perf_counter() - start
+    print(f"rectify:  {elapsed:.3f}s -> {result}")
+    if not args.skip_legacy:
+        assert result == legacy
+
+    if args.workers > 1:
+        start = time.perf_counter()
+        parallel = fraud_detection.rectify(functions, workers=args.workers)
+        parallel_time = time.perf_counter() - start
+        print(f"rectify with {args.workers} workers: {parallel_time:.3f}s -> {parallel}")
+        assert parallel == result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Compares RobinHoodProbeTable against LinearProbeTable, QuadraticProbeTable and DoubleHashingTable:
+time to insert N keys, to look up every key, and to look up N missing keys, plus the probe
+lengths of the Robin Hood table next to those of linear probing.
+
+Usage: python -m benchmarks.bench_robin_hood [--count N] [--length K]
+"""
+import argparse
+import random
+import time
+
+from data_structures import DoubleHashingTable, LinearProbeTable, QuadraticProbeTable, RobinHoodProbeTable
+from processing_line import BASE36_CHARACTERS
+
+
+def linear_probe_lengths(table):
+    """
+    Distance of every item of a LinearProbeTable from its home slot.
+    """
+    slots = table._LinearProbeTable__array
+    lengths = []
+    for position in range(table.table_size):
+        item = slots[position]
+        if item is not None and isinstance(item[0], str):
+            lengths.append((position - table.hash(item[0])) % table.table_size)
+    return lengths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=50_000)
+    parser.add_argument("--length", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    keys = ["".join(rng.choice(BASE36_CHARACTERS) for _ in range(args.length)) for _ in range(2 * args.count)]
+    present, missing = keys[:args.count], keys[args.count:]
+
+    print(f"{args.count} keys of length {args.length}")
+    print(f"  {'table':22} {'insert':>10} {'hit':>10} {'miss':>10}   probe length max / mean")
+    for table_type in (LinearProbeTable, QuadraticProbeTable, DoubleHashingTable, RobinHoodProbeTable):
+        table = table_type()
+        start = time.perf_counter()
+        for index, key in enumerate(present):
+            table[key] = index
+        insert_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for key in present:
+            table[key]
+        hit_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for key in missing:
+            key in table
+        miss_time = time.perf_counter() - start
+
+        if table_type is RobinHoodProbeTable:
+            probes = f"{table.max_probe_length} / {table.mean_probe_length:.2f}"
+        elif table_type is LinearProbeTable:
+            lengths = linear_probe_lengths(table)
+            probes = f"{max(lengths)} / {sum(lengths) / len(lengths):.2f}"
+        else:
+            probes = "-"
+
+        per_key = 1e6 / args.count
+        print(f"  {table_type.__name__:22} {insert_time * per_key:8.2f}us {hit_time * per_key:8.2f}us "
+              f"{miss_time * per_key:8.2f}us   {probes}")
+
+
+if __name__ == "__main__":
+    main()
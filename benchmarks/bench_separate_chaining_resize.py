@@ -0,0 +1,57 @@
+"""
+Fills a HashTableSeparateChaining that grows with its load factor, one presized from the expected
+count, and a fixed table of DEFAULT_TABLE_SIZE buckets, then times lookups in each. The growing
+tables keep the time per lookup flat as the count goes up; the fixed table scans chains of
+count / 17 items, so it is only run up to --fixed-count keys.
+
+Usage: python -m benchmarks.bench_separate_chaining_resize [--count N] [--fixed-count N] [--length K]
+"""
+import argparse
+import random
+import time
+
+from data_structures import HashTableSeparateChaining
+from processing_line import BASE36_CHARACTERS
+
+
+def fill_and_look_up(table, keys, lookups):
+    start = time.perf_counter()
+    for index, key in enumerate(keys):
+        table[key] = index
+    fill_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in lookups:
+        table[key]
+    lookup_time = time.perf_counter() - start
+    return fill_time, lookup_time / len(lookups)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--fixed-count", type=int, default=20_000)
+    parser.add_argument("--length", type=int, default=12)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    keys = ["".join(rng.choice(BASE36_CHARACTERS) for _ in range(args.length)) for _ in range(args.count)]
+
+    counts = sorted({min(args.fixed_count, args.count), args.count // 10, args.count} - {0})
+    print(f"keys of length {args.length}, per lookup over 10000 present keys")
+    for count in counts:
+        lookups = [rng.choice(keys[:count]) for _ in range(10_000)]
+        tables = [
+            ("growing", HashTableSeparateChaining()),
+            ("expected_count", HashTableSeparateChaining(expected_count=count)),
+        ]
+        if count <= args.fixed_count:
+            tables.append(("fixed 17", HashTableSeparateChaining(max_load_factor=None)))
+        for name, table in tables:
+            fill_time, lookup_time = fill_and_look_up(table, keys[:count], lookups)
+            print(f"  {count:8} {name:15} fill {fill_time:7.3f}s, lookup {lookup_time * 1e6:8.2f} us, "
+                  f"{table.table_size} buckets")
+
+
+if __name__ == "__main__":
+    main()
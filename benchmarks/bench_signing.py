@@ -0,0 +1,54 @@
+"""
+Compares Transaction.sign (one transaction at a time) against sign_batch.
+
+Usage: python -m benchmarks.bench_signing [--count N] [--repeat R]
+"""
+import argparse
+import random
+import time
+
+from processing_line import Transaction, sign_batch
+
+
+def make_transactions(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        Transaction(rng.randint(1_600_000_000, 1_700_000_000), f"user{rng.randrange(100_000)}", f"user{rng.randrange(100_000)}")
+        for _ in range(count)
+    ]
+
+
+def time_per_object(transactions):
+    start = time.perf_counter()
+    for transaction in transactions:
+        transaction.sign()
+    return time.perf_counter() - start
+
+
+def time_batch(transactions):
+    start = time.perf_counter()
+    sign_batch(transactions)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    transactions = make_transactions(args.count)
+    per_object = min(time_per_object(transactions) for _ in range(args.repeat))
+    expected = [transaction.signature for transaction in transactions]
+
+    batch = min(time_batch(transactions) for _ in range(args.repeat))
+    assert [transaction.signature for transaction in transactions] == expected, "signatures differ"
+
+    print(f"transactions:      {args.count}")
+    print(f"Transaction.sign:  {per_object:.3f}s ({per_object / args.count * 1e6:.2f} us/tx)")
+    print(f"sign_batch:        {batch:.3f}s ({batch / args.count * 1e6:.2f} us/tx)")
+    print(f"speedup:           {per_object / batch:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Feeds transactions to a StreamingFraudDetector one at a time and times adding them and asking
+for the best block size, against re-running FraudDetection.detect_by_blocks on everything
+seen so far after each micro-batch.
+
+Usage: python -m benchmarks.bench_streaming_detection [--count N] [--batch B] [--window W]
+"""
+import argparse
+import random
+import time
+
+from benchmarks.bench_detect_by_blocks import make_transactions
+from fraud_detection import FraudDetection, StreamingFraudDetector
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=50_000)
+    parser.add_argument("--length", type=int, default=36)
+    parser.add_argument("--fraud", type=float, default=0.05)
+    parser.add_argument("--batch", type=int, default=5_000, help="transactions between best() calls")
+    parser.add_argument("--window", type=int, default=None)
+    args = parser.parse_args()
+
+    transactions = make_transactions(args.count, args.length, args.fraud, random.Random(0))
+
+    detector = StreamingFraudDetector(window=args.window)
+    add_time = 0.0
+    best_time = 0.0
+    recompute_time = 0.0
+    for start in range(0, args.count, args.batch):
+        batch = transactions[start:start + args.batch]
+        began = time.perf_counter()
+        detector.extend(batch)
+        add_time += time.perf_counter() - began
+
+        began = time.perf_counter()
+        result = detector.best()
+        best_time += time.perf_counter() - began
+
+        if args.window is None:
+            began = time.perf_counter()
+            assert FraudDetection(transactions[:start + len(batch)]).detect_by_blocks() == result
+            recompute_time += time.perf_counter() - began
+
+    batches = (args.count + args.batch - 1) // args.batch
+    print(f"{args.count} transactions in {batches} micro-batches, L={args.length}, window={args.window}")
+    print(f"  add:              {add_time / args.count * 1e6:.1f} us/tx")
+    print(f"  best():           {best_time / batches * 1e3:.3f} ms/call")
+    if args.window is None:
+        print(f"  detect_by_blocks: {recompute_time / batches * 1e3:.1f} ms/call over everything seen")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Times an expiry-style workload on LinearProbeTable with cluster-rehash deletion against
+tombstone deletion: the table is filled, then every step deletes the oldest key and inserts a
+new one, so it stays close to its maximum load.
+
+Usage: python -m benchmarks.bench_tombstones [--live N] [--steps S]
+"""
+import argparse
+import time
+
+from data_structures import LinearProbeTable
+
+
+def run(live, steps, tombstones):
+    table = LinearProbeTable(tombstones=tombstones)
+    for index in range(live):
+        table[f"tx{index}"] = index
+
+    start = time.perf_counter()
+    for index in range(live, live + steps):
+        del table[f"tx{index - live}"]
+        table[f"tx{index}"] = index
+    elapsed = time.perf_counter() - start
+
+    assert len(table) == live
+    return elapsed, table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--live", type=int, default=24_000, help="keys kept in the table")
+    parser.add_argument("--steps", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{args.live} live keys, {args.steps} delete + insert steps")
+    for tombstones in (False, True):
+        elapsed, table = run(args.live, args.steps, tombstones)
+        name = "tombstones" if tombstones else "cluster rehash"
+        print(f"  {name:15} {elapsed / args.steps * 1e6:8.2f} us/step, table size {table.table_size}, "
+              f"tombstones left {table.tombstone_count}")
+
+
+if __name__ == "__main__":
+    main()
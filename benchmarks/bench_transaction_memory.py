@@ -0,0 +1,86 @@
+"""
+Measures the memory held per transaction by a dict-backed Transaction (the previous layout),
+the __slots__ Transaction and a TransactionBatch, using tracemalloc. Then times finding the
+rows whose signature starts with a prefix, over the Transaction objects, over the batch's
+decoded signatures, and over the batch's signature bytes with rows_starting_with.
+
+Usage: python -m benchmarks.bench_transaction_memory [--count N]
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from processing_line import Transaction, TransactionBatch, sign_batch
+
+
+class DictTransaction:
+    def __init__(self, timestamp, from_user, to_user):
+        self.timestamp = timestamp
+        self.from_user = from_user
+        self.to_user = to_user
+        self.signature = None
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return held, after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    users = [f"user{index}" for index in range(1_000)]
+    rows = [(rng.randint(1_600_000_000, 1_700_000_000), rng.choice(users), rng.choice(users)) for _ in range(args.count)]
+    signed = [Transaction(*row) for row in rows]
+    sign_batch(signed)
+    signatures = [transaction.signature for transaction in signed]
+
+    def build(cls):
+        def inner():
+            objects = []
+            for (timestamp, from_user, to_user), signature in zip(rows, signatures):
+                # Fresh int and str objects, as they would be when parsed from the feed.
+                transaction = cls(int(str(timestamp)), from_user, to_user)
+                transaction.signature = signature[:1] + signature[1:]
+                objects.append(transaction)
+            return objects
+        return inner
+
+    _, dict_bytes = measure(build(DictTransaction))
+    slotted, slots_bytes = measure(build(Transaction))
+    batch, batch_bytes = measure(lambda: TransactionBatch.from_transactions(slotted))
+
+    print(f"transactions: {args.count}")
+    for name, size in (("dict Transaction", dict_bytes), ("slots Transaction", slots_bytes), ("TransactionBatch", batch_bytes)):
+        print(f"{name:<18} {size / args.count:8.1f} bytes/tx")
+
+    # Signatures are zero padded, so the first row's first 16 characters pick out a fraction of the rows.
+    prefix = signatures[0][:16]
+
+    def best_of_3(scan):
+        times = []
+        for _ in range(3):
+            start = time.perf_counter()
+            found = scan()
+            times.append(time.perf_counter() - start)
+        return found, min(times)
+
+    scanned, objects_scan = best_of_3(lambda: sum(1 for transaction in slotted if transaction.signature.startswith(prefix)))
+    decoded, decoded_scan = best_of_3(lambda: sum(1 for signature in batch.signatures() if signature.startswith(prefix)))
+    matched, bytes_scan = best_of_3(lambda: sum(1 for _ in batch.rows_starting_with(prefix)))
+    assert scanned == decoded == matched
+    print(f"prefix scan, {scanned} of {args.count} rows match:")
+    print(f"  Transaction objects:      {objects_scan:.4f}s")
+    print(f"  batch.signatures():       {decoded_scan:.4f}s")
+    print(f"  batch.rows_starting_with: {bytes_scan:.4f}s")
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,13 @@ from .array_sorted_list import ArraySortedList
 from .linked_queue import LinkedQueue
 from .bit_vector_set import BitVectorSet
 from .linked_stack import LinkedStack
+from .array_queue import ArrayQueue
+from .array_stack import ArrayStack
 from .linked_list import LinkedList
 from .referential_array import ArrayR
+from .node import NodePool
 from .hash_table_separate_chaining import HashTableSeparateChaining
 from .hash_table_linear_probing import LinearProbeTable
 from .hash_table_double_hashing import DoubleHashingTable
 from .hash_table_quadratic_probing import QuadraticProbeTable
+from .hash_table_robin_hood import RobinHoodProbeTable
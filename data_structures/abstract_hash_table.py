@@ -1,6 +1,6 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic, Tuple
+from typing import TypeVar, Generic, Iterable, Tuple
 from data_structures.referential_array import ArrayR
 from data_structures.dunder_protected import DunderProtected
 
@@ -23,6 +23,17 @@ class HashTable(ABC, Generic[K, V], DunderProtected):
     def hash(self, key: K) -> int:
         pass
 
+    def hash_many(self, keys: Iterable[K]) -> ArrayR[int]:
+        """
+        Hash a batch of keys for the current table size, in order.
+        :complexity: O(N * H) where N is the number of keys and H the cost of hash.
+        """
+        keys = tuple(keys)
+        res = ArrayR(len(keys))
+        for i, key in enumerate(keys):
+            res[i] = self.hash(key)
+        return res
+
     @property
     @abstractmethod
     def table_size(self) -> int:
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic
+from typing import Iterable, TypeVar, Generic
 
 T = TypeVar('T')
 
@@ -14,6 +14,11 @@ class Queue(ABC, Generic[T]):
         """ Adds an element to the rear of the queue."""
         pass
 
+    def extend(self, items: Iterable[T]) -> None:
+        """ Adds every element of items to the rear of the queue, in order."""
+        for item in items:
+            self.append(item)
+
     @abstractmethod
     def serve(self) -> T:
         """ Deletes and returns the element at the queue's front."""
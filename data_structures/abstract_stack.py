@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic
+from typing import Iterable, TypeVar, Generic
 
 T = TypeVar('T')
 
@@ -14,6 +14,11 @@ class Stack(ABC, Generic[T]):
         """ Pushes an element to the top of the stack."""
         pass
 
+    def extend(self, items: Iterable[T]) -> None:
+        """ Pushes every element of items, in order, so the last one ends up on top."""
+        for item in items:
+            self.push(item)
+
     @abstractmethod
     def pop(self) -> T:
         """ Pops an element from the top of the stack."""
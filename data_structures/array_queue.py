@@ -0,0 +1,128 @@
+from typing import Iterable, Sized, TypeVar
+
+from data_structures.abstract_queue import Queue
+
+T = TypeVar("T")
+
+
+class ArrayQueue(Queue[T]):
+    """ Array Queue
+    The Queue ADT implemented as a circular buffer.
+    Items are appended after the rear and served from the front, both wrapping around the
+    end of the array, so no item ever moves until the array doubles when full. It halves
+    again once a quarter full, so it never holds on to the space of a past peak for long.
+
+    The buffer is a fixed-length Python list used as a plain array rather than an ArrayR:
+    ctypes keeps every reference stored in an ArrayR alive through a dict entry keyed by
+    its index, which costs as much memory per slot as a linked node.
+    """
+
+    MIN_CAPACITY = 16
+
+    def __init__(self, capacity: int = MIN_CAPACITY) -> None:
+        """
+        Constructor for the ArrayQueue class.
+        :param capacity: the number of items the queue holds before it first grows.
+        :complexity: O(C) where C is the capacity.
+        """
+        if capacity <= 0:
+            raise ValueError("Capacity should be larger than 0.")
+        self.__initial_capacity = capacity
+        self.clear()
+
+    def append(self, item: T) -> None:
+        """ Adds an element to the rear of the queue.
+        :complexity: O(1) amortised, O(N) when the array grows, where N is the number of items.
+        """
+        if self.__length == len(self.__array):
+            self.__resize(2 * len(self.__array))
+        self.__array[(self.__front + self.__length) % len(self.__array)] = item
+        self.__length += 1
+
+    def extend(self, items: Iterable[T]) -> None:
+        """ Adds every element of items to the rear of the queue, in order.
+        When items has a length the array grows at most once, to fit all of them. The queue
+        only counts the new items once all of them are in, so if items raises part way the
+        queue holds what it held before.
+        :complexity: O(N) amortised, where N is the number of items.
+        """
+        if isinstance(items, Sized):
+            capacity = len(self.__array)
+            while capacity < self.__length + len(items):
+                capacity *= 2
+            if capacity != len(self.__array):
+                self.__resize(capacity)
+
+        array = self.__array
+        front = self.__front
+        length = self.__length
+        try:
+            for item in items:
+                if length == len(array):
+                    self.__resize(2 * len(array), length)
+                    array = self.__array
+                    front = 0
+                position = front + length
+                if position >= len(array):
+                    position -= len(array)
+                array[position] = item
+                length += 1
+        except BaseException:
+            # Let go of the items written after the ones counted
+            for i in range(self.__length, length):
+                array[(front + i) % len(array)] = None
+            raise
+        self.__length = length
+
+    def serve(self) -> T:
+        """ Deletes and returns the element at the queue's front.
+        :raises Exception: if the queue is empty
+        :complexity: O(1) amortised, O(N) when the array shrinks, where N is the number of items.
+        """
+        if self.is_empty():
+            raise Exception("Queue is empty")
+
+        item = self.__array[self.__front]
+        self.__array[self.__front] = None
+        self.__front = (self.__front + 1) % len(self.__array)
+        self.__length -= 1
+        if self.__length <= len(self.__array) // 4 and len(self.__array) // 2 >= self.__initial_capacity:
+            self.__resize(len(self.__array) // 2)
+        return item
+
+    def peek(self) -> T:
+        """ Returns the element at the queue's front without deleting it.
+        :raises Exception: if the queue is empty
+        """
+        if self.is_empty():
+            raise Exception("Queue is empty")
+        return self.__array[self.__front]
+
+    def __resize(self, capacity: int, length: int | None = None) -> None:
+        """
+        Moves the items, front first, to the start of a new array of the given capacity.
+        length is how many slots from the front to move, by default the items counted.
+        :complexity: O(N + C) where N is the number of items and C the capacity.
+        """
+        if length is None:
+            length = self.__length
+        array = [None] * capacity
+        for i in range(length):
+            array[i] = self.__array[(self.__front + i) % len(self.__array)]
+        self.__array = array
+        self.__front = 0
+
+    def clear(self) -> None:
+        """ Clears all elements from the queue. """
+        self.__array = [None] * self.__initial_capacity
+        self.__front = 0
+        self.__length = 0
+
+    def __len__(self) -> int:
+        """ Returns the number of elements in the queue. """
+        return self.__length
+
+    def __str__(self) -> str:
+        """ Returns a string representation of the queue."""
+        items = ", ".join(str(self.__array[(self.__front + i) % len(self.__array)]) for i in range(self.__length))
+        return f"<ArrayQueue [{items}]>"
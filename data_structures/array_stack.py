@@ -0,0 +1,106 @@
+from typing import Iterable
+
+from data_structures.abstract_stack import Stack, T
+
+
+class ArrayStack(Stack[T]):
+    """ Implementation of a stack as a growable array of chunks.
+    Items live in chunks of CHUNK_SIZE slots, found through a directory of chunks that
+    doubles when it runs out of room. Growing never copies an item, only the directory, and a
+    chunk is released once the stack drops a whole chunk below it, so pushing and popping
+    around a chunk boundary does not keep reallocating it.
+
+    Chunks and directory are fixed-length Python lists used as plain arrays, for the same
+    reason as in ArrayQueue.
+    """
+
+    CHUNK_SIZE = 1024
+
+    def __init__(self, _=None) -> None:
+        self.clear()
+
+    def push(self, item: T) -> None:
+        """ Pushes an element to the top of the stack.
+        :complexity: O(1) amortised, O(N / CHUNK_SIZE) when the directory grows, where N is
+        the number of items.
+        """
+        chunk, offset = divmod(self.__length, ArrayStack.CHUNK_SIZE)
+        self.__chunk_at(chunk)[offset] = item
+        self.__length += 1
+
+    def extend(self, items: Iterable[T]) -> None:
+        """ Pushes every element of items, in order, so the last one ends up on top.
+        Items are written chunk by chunk and only counted once all of them are in.
+        :complexity: O(N) amortised, where N is the number of items.
+        """
+        length = self.__length
+        chunk, offset = divmod(length, ArrayStack.CHUNK_SIZE)
+        current = self.__chunk_at(chunk)
+        for item in items:
+            if offset == ArrayStack.CHUNK_SIZE:
+                chunk += 1
+                offset = 0
+                current = self.__chunk_at(chunk)
+            current[offset] = item
+            offset += 1
+            length += 1
+        self.__length = length
+
+    def __chunk_at(self, chunk: int) -> list:
+        """ Returns the chunk at the given position, allocating it (and doubling the directory)
+        when it is not there yet.
+        :complexity: O(1), O(D) when the directory of D chunks grows.
+        """
+        if chunk == len(self.__chunks):
+            chunks = [None] * (2 * len(self.__chunks))
+            for i in range(len(self.__chunks)):
+                chunks[i] = self.__chunks[i]
+            self.__chunks = chunks
+        if self.__chunks[chunk] is None:
+            self.__chunks[chunk] = [None] * ArrayStack.CHUNK_SIZE
+        return self.__chunks[chunk]
+
+    def pop(self) -> T:
+        """ Pops the element at the top of the stack.
+        :complexity: O(1)
+        :raises Exception: if the stack is empty
+        """
+        if self.is_empty():
+            raise Exception('Stack is empty')
+
+        self.__length -= 1
+        chunk, offset = divmod(self.__length, ArrayStack.CHUNK_SIZE)
+        item = self.__chunks[chunk][offset]
+        self.__chunks[chunk][offset] = None
+        if offset == 0 and chunk + 1 < len(self.__chunks):
+            # Keep this chunk as the spare and release the one above it
+            self.__chunks[chunk + 1] = None
+        return item
+
+    def peek(self) -> T:
+        """ Returns the element at the top, without popping it from stack.
+        :complexity: O(1)
+        :raises Exception: if the stack is empty
+        """
+        if self.is_empty():
+            raise Exception('Stack is empty')
+        chunk, offset = divmod(self.__length - 1, ArrayStack.CHUNK_SIZE)
+        return self.__chunks[chunk][offset]
+
+    def clear(self) -> None:
+        """" Resets the stack to an empty state. """
+        self.__chunks = [None]
+        self.__length = 0
+
+    def __len__(self) -> int:
+        """ Returns the number of elements in the stack.
+        :complexity: O(1)
+        """
+        return self.__length
+
+    def __str__(self) -> str:
+        """ Returns a string representation of the stack."""
+        stack_str = ", ".join(
+            str(self.__chunks[i // ArrayStack.CHUNK_SIZE][i % ArrayStack.CHUNK_SIZE]) for i in range(self.__length)
+        )
+        return f"<ArrayStack [{stack_str}]>"
@@ -1,10 +1,15 @@
 from __future__ import annotations
-from typing import TypeVar, Tuple, List
+from typing import Iterable, TypeVar, Tuple, List
 from data_structures.abstract_hash_table import HashTable
 from data_structures.referential_array import ArrayR
+from data_structures.universal_hash import hash_many
 
 V = TypeVar('V')
 
+# Left in the slot of a key deleted in tombstone mode. Probing walks past it like any other
+# item (no string key equals its key), and inserts may reuse its slot.
+TOMBSTONE = (object(), None)
+
 
 class LinearProbeTable(HashTable[str, V]):
     """
@@ -16,14 +21,23 @@ class LinearProbeTable(HashTable[str, V]):
         - V:    Value Type.
 
     Unless stated otherwise, all methods have O(1) complexity.
+
+    By default a deletion rehashes the rest of its cluster. With tombstones=True it leaves a
+    TOMBSTONE in the slot instead, which is O(1); once tombstones take more than
+    TOMBSTONE_COMPACTION_LOAD of the table, or tombstones and items together fill half of it,
+    the table is rehashed to clear them.
     """
 
-    __TABLE_SIZES = [5, 13, 29, 53, 97, 193, 389, 769, 1543, 3079, 6151, 12289, 24593, 49157, 98317, 196613, 393241, 786433, 1572869]
+    TOMBSTONE_COMPACTION_LOAD = 0.25
+    DEFAULT_TABLE_SIZES = (5, 13, 29, 53, 97, 193, 389, 769, 1543, 3079, 6151, 12289, 24593, 49157, 98317, 196613, 393241, 786433, 1572869)
+
+    __TABLE_SIZES = DEFAULT_TABLE_SIZES
 
-    def __init__(self, sizes: None | List[int] = None, hash_base: int | None = 31) -> None:
+    def __init__(self, sizes: None | List[int] = None, hash_base: int | None = 31, tombstones: bool = False) -> None:
         """
         :param sizes: Optional list of sizes to use for the hash table.
-                      If not provided, a default list of sizes will be used.
+                      If not provided, DEFAULT_TABLE_SIZES will be used.
+        :param tombstones: Whether deletions leave a tombstone instead of rehashing their cluster.
         :complexity: O(1) - Assuming the default sizes are used, we can assume the array is created in O(1) time.
             If you use this function in any way that passes some variable input for the sizes, then the complexity
             needs to change accordingly.
@@ -35,6 +49,8 @@ class LinearProbeTable(HashTable[str, V]):
         self.__array: ArrayR[tuple[str, V]] = ArrayR(self.__TABLE_SIZES[self.__size_index])
         self.__length = 0
         self.__hash_base = hash_base
+        self.__use_tombstones = tombstones
+        self.__tombstones = 0
 
     def hash(self, key: str) -> int:
         """
@@ -43,18 +59,55 @@ class LinearProbeTable(HashTable[str, V]):
         """
         value = 0
         a = 31415
+        size = self.table_size
+        hash_base = self.__hash_base
         for char in key:
-            value = (ord(char) + a * value) % self.table_size
-            a = (a * self.__hash_base % (self.table_size - 1)) + 1
+            value = (ord(char) + a * value) % size
+            a = (a * hash_base % (size - 1)) + 1
         return value
 
+    def hash_many(self, keys: Iterable[str]) -> ArrayR[int]:
+        """
+        Hash a batch of keys for the current table size, in order, with the same
+        values as hash. Keys of equal length are evaluated together with NumPy
+        when it is installed. A subclass overriding hash gets HashTable.hash_many,
+        which calls it for every key.
+        :complexity: O(N * K) where N is the number of keys and K their length.
+        """
+        if type(self).hash is not LinearProbeTable.hash:
+            return HashTable.hash_many(self, keys)
+        return hash_many(keys, self.table_size, self.__hash_base)
+
     @property
     def table_size(self) -> int:
         return len(self.__array)
 
-    def __handle_probing(self, key: str, is_insert: bool) -> int:
+    def _probe_step(self, key: str) -> int:
+        """
+        The step of the probe sequence of key, passed on to _probe_position.
+        Linear probing always moves on by one slot. Subclasses override this and
+        _probe_position to probe differently.
+        """
+        return 1
+
+    def _probe_position(self, home: int, step: int, attempt: int) -> int:
         """
-        Find the correct position for this key in the hash table using linear probing.
+        The slot a probe sequence starting at home visits on the given attempt, 0 being home.
+        """
+        return (home + step * attempt) % self.table_size
+
+    @property
+    def tombstone_count(self) -> int:
+        """
+        The number of slots holding a tombstone.
+        """
+        return self.__tombstones
+
+    def __handle_probing(self, key: str, is_insert: bool, position: int | None = None) -> int:
+        """
+        Find the correct position for this key in the hash table, following the probe
+        sequence of _probe_step and _probe_position (linear probing unless overridden).
+        position is the hash of the key, when it is already known.
         :complexity: 
             Best: O(K) happens when we hash the key and the position is empty.
             Worst: O(N + K) happens when we hash the key but the position is taken and we have to
@@ -65,21 +118,29 @@ class LinearProbeTable(HashTable[str, V]):
         :raises FullError: When a table is full and cannot be inserted.
         """
         # Initial position
-        position = self.hash(key)
+        if position is None:
+            position = self.hash(key)
+        home = position
+        step = self._probe_step(key)
+        free = None
 
-        for _ in range(self.table_size):
+        for attempt in range(1, self.table_size + 1):
             if self.__array[position] is None:
                 # Empty spot. Am I upserting or retrieving?
                 if is_insert:
-                    return position
+                    return position if free is None else free
                 else:
                     raise KeyError(key)
             elif self.__array[position][0] == key:
                 return position
             else:
-                # Taken by something else. Time to linear probe.
-                position = (position + 1) % self.table_size
+                # Taken by something else. Time to probe.
+                if free is None and self.__array[position] is TOMBSTONE:
+                    free = position
+                position = self._probe_position(home, step, attempt)
 
+        if is_insert and free is not None:
+            return free
         if is_insert:
             raise RuntimeError("Table is full!")
         else:
@@ -93,7 +154,7 @@ class LinearProbeTable(HashTable[str, V]):
         res = ArrayR(self.__length)
         i = 0
         for x in range(self.table_size):
-            if self.__array[x] is not None:
+            if self.__array[x] is not None and self.__array[x] is not TOMBSTONE:
                 res[i] = self.__array[x]
                 i += 1
         return res
@@ -106,6 +167,8 @@ class LinearProbeTable(HashTable[str, V]):
         Deletes a (key, value) pair in our hash table.
 
         :complexity: 
+            With tombstones: amortised O(K) plus the probing to find the key, as the compaction
+                rehash needs a constant fraction of the table to be deleted first.
             Best: O(K) when the key is at the beginning of the table and no cluster is present to rehash.
             Worst: O(N * (N + K)) when the key is at the beginning of a large cluster and we have to effectively
                 rehash all elements. And each element has to linear probe over all (or a factor of) other elements currently
@@ -116,6 +179,14 @@ class LinearProbeTable(HashTable[str, V]):
         :raises KeyError: when the key doesn't exist.
         """
         position = self.__handle_probing(key, False)
+        if self.__use_tombstones:
+            self.__array[position] = TOMBSTONE
+            self.__length -= 1
+            self.__tombstones += 1
+            if self.__tombstones > self.table_size * self.TOMBSTONE_COMPACTION_LOAD:
+                self.__rehash(self.__size_index)
+            return
+
         # Remove the element
         self.__array[position] = None
         self.__length -= 1
@@ -153,15 +224,62 @@ class LinearProbeTable(HashTable[str, V]):
 
         if self.__array[position] is None:
             self.__length += 1
+        elif self.__array[position] is TOMBSTONE:
+            self.__length += 1
+            self.__tombstones -= 1
 
         self.__array[position] = (key, data)
 
         if len(self) > self.table_size / 2:
             self.__rehash()
+        elif len(self) + self.__tombstones > self.table_size / 2:
+            # Mostly tombstones: clear them, growing only if the items alone fill a quarter
+            self.__rehash(self.__size_index if len(self) <= self.table_size / 4 else None)
 
-    def __rehash(self) -> None:
+    def update(self, pairs: Iterable[Tuple[str, V]]) -> None:
         """
-        Need to resize table and reinsert all values
+        Set every (key, value) pair in order, as repeated __setitem__ calls would.
+        The table is first resized once, straight to the first size that stays at most
+        half full even if every key is new; the pairs are then placed without checking
+        the load factor per item, and their keys are hashed as one batch.
+
+        :complexity:
+            Best: O(N * K + S) when every key can be placed immediately after being hashed.
+            Worst: O(N * (N + K) + S) when every key needs maximum probing.
+            N is the number of pairs, K the length of a key and S the new table size.
+        :raises FullError: when the table cannot be resized to hold every key.
+        """
+        pairs = tuple(pairs)
+        size_index = self.__size_index
+        while size_index + 1 < len(self.__TABLE_SIZES) and len(self) + len(pairs) > self.__TABLE_SIZES[size_index] / 2:
+            size_index += 1
+        if size_index != self.__size_index or self.__tombstones > 0:
+            self.__rehash(size_index)
+
+        hashes = self.hash_many(pair[0] for pair in pairs)
+        for i, (key, data) in enumerate(pairs):
+            position = self.__handle_probing(key, True, hashes[i])
+            if self.__array[position] is None:
+                self.__length += 1
+            self.__array[position] = (key, data)
+
+    @classmethod
+    def from_items(cls, pairs: Iterable[Tuple[str, V]], sizes: None | List[int] = None, hash_base: int | None = 31) -> LinearProbeTable[V]:
+        """
+        Create a table holding every (key, value) pair, see update.
+        :complexity: See update.
+        """
+        table = cls(sizes, hash_base)
+        table.update(pairs)
+        return table
+
+    def __rehash(self, size_index: int | None = None) -> None:
+        """
+        Need to resize table and reinsert all values.
+        By default the table grows to the next size, otherwise straight to the given index
+        of the table sizes, which may be the current one to clear tombstones. Items are placed
+        in the order of the old slots without going through __setitem__, so no load factor is
+        checked along the way.
 
         :complexity:
             Best: O(N * K) happens when all items can be inserted immediately after being hashed
@@ -175,17 +293,25 @@ class LinearProbeTable(HashTable[str, V]):
                 cost of creating a new table is constant. This assumption can be extended to any table size
                 as long as the sizes are growing by a constant factor (e.g. each table size is almost double the previous one).
         """
+        if size_index is None:
+            size_index = self.__size_index + 1
+        if size_index >= len(self.__TABLE_SIZES):
+            # Cannot be resized further, but tombstones can still be cleared.
+            if self.__tombstones == 0:
+                return
+            size_index = self.__size_index
+
         old_array = self.__array
-        self.__size_index += 1
-        if self.__size_index == len(self.__TABLE_SIZES):
-            # Cannot be resized further.
-            return
+        self.__size_index = size_index
         self.__array = ArrayR(self.__TABLE_SIZES[self.__size_index])
-        self.__length = 0
+        self.__tombstones = 0
+        hashes = self.hash_many(item[0] for item in old_array if item is not None and item is not TOMBSTONE)
+        i = 0
         for item in old_array:
-            if item is not None:
-                key, value = item
-                self[key] = value
+            if item is not None and item is not TOMBSTONE:
+                position = self.__handle_probing(item[0], True, hashes[i])
+                self.__array[position] = item
+                i += 1
 
     def __len__(self) -> int:
         """
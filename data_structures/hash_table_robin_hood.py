@@ -0,0 +1,237 @@
+from __future__ import annotations
+from array import array
+from typing import Iterable, List, Tuple, TypeVar
+from data_structures.abstract_hash_table import HashTable
+from data_structures.referential_array import ArrayR
+from data_structures.universal_hash import hash_many, universal_hash
+
+V = TypeVar('V')
+
+
+class RobinHoodProbeTable(HashTable[str, V]):
+    """
+    Robin Hood Probe Table.
+    Defines a Hash Table using linear probing with Robin Hood displacement: an item being inserted
+    takes the slot of any item that is closer to its own home slot, and that item carries on
+    probing instead. Along any probe sequence, items are then ordered by how far they are from
+    home, so probe lengths stay even and a lookup for a missing key stops as soon as it passes a
+    slot whose item is closer to home than the key would be.
+    Deletion shifts the rest of the cluster back by one slot, so no tombstones are needed.
+    If you want to use this with a different key type, you should override the hash function.
+
+    Type Arguments:
+        - V:    Value Type.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    __TABLE_SIZES = [5, 13, 29, 53, 97, 193, 389, 769, 1543, 3079, 6151, 12289, 24593, 49157, 98317, 196613, 393241, 786433, 1572869]
+
+    def __init__(self, sizes: None | List[int] = None, hash_base: int = 31) -> None:
+        """
+        :param sizes: Optional list of sizes to use for the hash table.
+                      If not provided, a default list of sizes will be used.
+        :complexity: O(1) - Assuming the default sizes are used, see LinearProbeTable.
+        """
+        if sizes is not None:
+            self.__TABLE_SIZES = sizes
+
+        self.__size_index = 0
+        self.__hash_base = hash_base
+        self.__length = 0
+        self.__allocate(self.__TABLE_SIZES[self.__size_index])
+
+    def __allocate(self, size: int) -> None:
+        """
+        Replace the slots with size empty ones.
+        Each slot's distance from the home slot of its item is kept next to it, -1 when empty.
+        :complexity: O(S) where S is the size.
+        """
+        self.__array: ArrayR[Tuple[str, V]] = ArrayR(size)
+        self.__distances = array("l", (-1,)) * size
+
+    def hash(self, key: str) -> int:
+        """
+        Hash a key for insert/retrieve/update into the hashtable.
+        Same universal hash as LinearProbeTable.
+        :complexity: O(K) where K is the length of the key.
+        """
+        return universal_hash(key, self.table_size, self.__hash_base)
+
+    def hash_many(self, keys: Iterable[str]) -> ArrayR[int]:
+        """
+        Hash a batch of keys for the current table size, in order, with the same
+        values as hash. A subclass overriding hash gets HashTable.hash_many, which
+        calls it for every key.
+        :complexity: O(N * K) where N is the number of keys and K their length.
+        """
+        if type(self).hash is not RobinHoodProbeTable.hash:
+            return HashTable.hash_many(self, keys)
+        return hash_many(keys, self.table_size, self.__hash_base)
+
+    @property
+    def table_size(self) -> int:
+        return len(self.__array)
+
+    def __find(self, key: str, position: int) -> int:
+        """
+        Returns the position of key, or -1 when it is not in the table.
+        position is the home slot of the key, its hash.
+        :complexity:
+            Best: O(K) when the home slot is empty, or holds the key.
+            Worst: O(P + K) where P is the longest probe length in the table, since the search
+                stops once it is further from home than the item it reached.
+            K is the length of the key.
+        """
+        distance = 0
+        while True:
+            slot_distance = self.__distances[position]
+            if slot_distance < distance:
+                # Empty, or an item closer to home: the key would have displaced it.
+                return -1
+            if slot_distance == distance and self.__array[position][0] == key:
+                return position
+            position = (position + 1) % self.table_size
+            distance += 1
+
+    def __place(self, item: Tuple[str, V], position: int) -> None:
+        """
+        Insert an item for a key not in the table, starting from its home position.
+        :complexity: O(P) where P is the length of the probe sequence until an empty slot.
+        """
+        distance = 0
+        while True:
+            slot_distance = self.__distances[position]
+            if slot_distance == -1:
+                self.__array[position] = item
+                self.__distances[position] = distance
+                return
+            if slot_distance < distance:
+                # Take from the rich: the resident is closer to home, so it moves on instead.
+                item, self.__array[position] = self.__array[position], item
+                distance, self.__distances[position] = slot_distance, distance
+            position = (position + 1) % self.table_size
+            distance += 1
+
+    def items(self) -> ArrayR[Tuple[str, V]]:
+        """
+        Returns all keys in the hash table.
+        :complexity: O(N) where N is the table size.
+        """
+        res = ArrayR(self.__length)
+        i = 0
+        for x in range(self.table_size):
+            if self.__distances[x] != -1:
+                res[i] = self.__array[x]
+                i += 1
+        return res
+
+    def is_empty(self) -> bool:
+        return self.__length == 0
+
+    def __delitem__(self, key: str) -> None:
+        """
+        Deletes a (key, value) pair in our hash table, shifting the items after it in the cluster
+        back by one slot until one is already at home or a slot is empty.
+
+        :complexity: O(K + P) where K is the length of the key and P the longest probe length.
+        :raises KeyError: when the key doesn't exist.
+        """
+        position = self.__find(key, self.hash(key))
+        if position == -1:
+            raise KeyError(key)
+
+        following = (position + 1) % self.table_size
+        while self.__distances[following] > 0:
+            self.__array[position] = self.__array[following]
+            self.__distances[position] = self.__distances[following] - 1
+            position = following
+            following = (following + 1) % self.table_size
+
+        self.__array[position] = None
+        self.__distances[position] = -1
+        self.__length -= 1
+
+    def __getitem__(self, key: str) -> V:
+        """
+        Get the value at a certain key
+
+        :complexity: See __find.
+        :raises KeyError: when the key doesn't exist.
+        """
+        position = self.__find(key, self.hash(key))
+        if position == -1:
+            raise KeyError(key)
+        return self.__array[position][1]
+
+    def __setitem__(self, key: str, data: V) -> None:
+        """
+        Set an (key, value) pair in our hash table.
+
+        :complexity:
+            Best: Same as __find, when the key is updated or lands in an empty slot.
+            Worst: Same as __rehash.
+        :raises FullError: when the table is full and cannot be resized further.
+        """
+        home = self.hash(key)
+        position = self.__find(key, home)
+        if position != -1:
+            self.__array[position] = (key, data)
+            return
+
+        if self.__length == self.table_size:
+            raise RuntimeError("Table is full!")
+        self.__place((key, data), home)
+        self.__length += 1
+        if len(self) > self.table_size / 2:
+            self.__rehash()
+
+    def __rehash(self) -> None:
+        """
+        Grow to the next table size and place every item again, hashing their keys as one batch.
+        :complexity: O(N * K + S) when no probing is needed, where N is the number of items,
+            K the length of a key and S the new table size.
+        """
+        if self.__size_index + 1 == len(self.__TABLE_SIZES):
+            # Cannot be resized further.
+            return
+
+        old_items = self.items()
+        self.__size_index += 1
+        self.__allocate(self.__TABLE_SIZES[self.__size_index])
+        hashes = self.hash_many(old_items[i][0] for i in range(len(old_items)))
+        for i in range(len(old_items)):
+            self.__place(old_items[i], hashes[i])
+
+    @property
+    def max_probe_length(self) -> int:
+        """
+        The furthest any item sits from its home slot, 0 for an empty table.
+        :complexity: O(S) where S is the table size.
+        """
+        return max(self.__distances) if self.__length > 0 else 0
+
+    @property
+    def mean_probe_length(self) -> float:
+        """
+        The average distance of an item from its home slot, 0 for an empty table.
+        :complexity: O(S) where S is the table size.
+        """
+        if self.__length == 0:
+            return 0.0
+        return sum(distance for distance in self.__distances if distance > 0) / self.__length
+
+    def __len__(self) -> int:
+        """
+        Returns the number of elements in the hash table
+        """
+        return self.__length
+
+    def __str__(self) -> str:
+        """
+        Returns all they key/value pairs in our hash table (no particular
+        order).
+        """
+        items = self.items()
+        items = '\n'.join(map(lambda x: f"({x[0]}, {x[1]})", items))
+        return f"<RobinHoodProbeTable\n{items}\n>"
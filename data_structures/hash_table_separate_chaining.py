@@ -1,36 +1,88 @@
+from array import array
+import math
 from data_structures.abstract_hash_table import HashTable
 from data_structures.referential_array import ArrayR
-from data_structures.linked_list import LinkedList
-from typing import TypeVar, Tuple
+from data_structures.universal_hash import hash_many
+from typing import Iterable, TypeVar, Tuple
 
 V = TypeVar('V')
 
+
 class HashTableSeparateChaining(HashTable[str, V]):
     """
-    Separate Chaining Hash Table Implementation using a Linked List.
-    It currently rehashes the primary cluster to handle deletion.
+    Separate Chaining Hash Table Implementation.
+    Items are kept in one flat, table-wide layout rather than one object per chain: parallel
+    lists of keys and data, an array of the Python hash of each key, and an array linking each
+    item to the next one in its chain. Each bucket holds the position of the first item of its
+    chain, or -1 when it is empty. A search walks the chain and only compares keys whose hashes
+    match, and an existing key is read or written in place once it is found.
+    The table grows through TABLE_SIZES whenever the number of items per bucket would go over
+    its maximum load factor, so chains stay short on average.
 
     constants:
         DEFAULT_TABLE_SIZE: default table size used in the __init__
         DEFAULT_HASH_TABLE: default hash base used for the hash function
+        DEFAULT_MAX_LOAD_FACTOR: default maximum number of items per bucket
+        TABLE_SIZES: primes, each roughly double the last, that the table grows through
 
     attributes:
-        length: number of elements in the hash table
-        array: used to represent our internal array
+        heads: for each bucket, the position of the first item in its chain, or -1
+        keys: the key of each item
+        values: the data of each item
+        hashes: hash(key) of each item
+        next: the position of the next item in the same chain, or -1
     """
 
     DEFAULT_TABLE_SIZE = 17
     DEFAULT_HASH_BASE = 31
+    DEFAULT_MAX_LOAD_FACTOR = 1.0
+    TABLE_SIZES = (17, 37, 79, 163, 331, 673, 1361, 2729, 5471, 10949, 21911, 43853, 87719, 175447, 350899,
+                   701819, 1403641, 2807303, 5614657, 11229331, 22458671, 44917381, 89834777, 179669557, 359339171)
 
-    def __init__(self, table_size: int = DEFAULT_TABLE_SIZE) -> None:
+    def __init__(self, table_size: int = DEFAULT_TABLE_SIZE, max_load_factor: float | None = DEFAULT_MAX_LOAD_FACTOR,
+                 expected_count: int | None = None) -> None:
         """
+        :param table_size: the number of buckets to start with.
+        :param max_load_factor: the most items per bucket before the table grows, or None
+                                to keep table_size buckets forever.
+        :param expected_count: when given, start with the first of TABLE_SIZES (at least
+                               table_size) that holds this many items without growing.
         :complexity: O(N) where N is the table size.
         """
         if table_size <= 0:
             raise ValueError("Table size should be larger than 0.")
-        
-        self.__table: ArrayR[LinkedList | None] = ArrayR(table_size)
-        self.__length = 0
+        if max_load_factor is not None and max_load_factor <= 0:
+            raise ValueError("Max load factor should be larger than 0.")
+
+        self.max_load_factor = max_load_factor
+        if expected_count is not None and max_load_factor is not None:
+            table_size = max(table_size, self.__size_for(expected_count))
+
+        self.__heads = array("q", (-1,)) * table_size
+        self.__keys: list[str] = []
+        self.__values: list[V] = []
+        self.__hashes = array("q")
+        self.__next = array("q")
+        self.__grow_at = self.__limit_for(table_size)
+
+    def __limit_for(self, table_size: int) -> float:
+        """
+        The most items a table of table_size buckets holds before it grows.
+        """
+        if self.max_load_factor is None:
+            return math.inf
+        return table_size * self.max_load_factor
+
+    def __size_for(self, count: int) -> int:
+        """
+        The first of TABLE_SIZES that holds count items within the max load factor.
+        Past the last one, an odd size with room for twice as many.
+        :complexity: O(log S) where S is the size returned.
+        """
+        for size in HashTableSeparateChaining.TABLE_SIZES:
+            if count <= size * self.max_load_factor:
+                return size
+        return int(2 * count / self.max_load_factor) | 1
 
     def hash(self, key: str) -> int:
         """
@@ -40,30 +92,36 @@ class HashTableSeparateChaining(HashTable[str, V]):
         """
         value = 0
         a = 31415
+        size = len(self.__heads)
         for char in key:
-            value = (ord(char) + a * value) % len(self.__table)
-            a = (a * HashTableSeparateChaining.DEFAULT_HASH_BASE % (len(self.__table) - 1)) + 1
+            value = (ord(char) + a * value) % size
+            a = (a * HashTableSeparateChaining.DEFAULT_HASH_BASE % (size - 1)) + 1
         return value
 
+    def hash_many(self, keys: Iterable[str]) -> ArrayR[int]:
+        """
+        Hash a batch of keys for the current table size, in order, with the same
+        values as hash. Keys of equal length are evaluated together with NumPy
+        when it is installed. A subclass overriding hash gets HashTable.hash_many,
+        which calls it for every key.
+        :complexity: O(N * K) where N is the number of keys and K their length.
+        """
+        if type(self).hash is not HashTableSeparateChaining.hash:
+            return HashTable.hash_many(self, keys)
+        return hash_many(keys, len(self.__heads), HashTableSeparateChaining.DEFAULT_HASH_BASE)
+
     @property
     def table_size(self) -> int:
-        return len(self.__array)
+        return len(self.__heads)
 
     def items(self) -> ArrayR[Tuple[str, V]]:
         """
         Returns all keys in the hash table
-        :complexity: O(N + S) where N is the number of items in our hash table
-        and S is the table size. Depending on how the table is created, if the table size
-        is not variable (e.g. it's always using the default size), then S can be ignored as
-        a constant, simplifying the complexity to O(N).
-        """
-        res = ArrayR(self.__length)
-        i = 0
-        for list in self.__table:
-            if list is not None:
-                for item in list:
-                    res[i] = item
-                    i += 1
+        :complexity: O(N) where N is the number of items in our hash table
+        """
+        res = ArrayR(len(self.__keys))
+        for i, item in enumerate(zip(self.__keys, self.__values)):
+            res[i] = item
         return res
     
     def is_empty(self):
@@ -71,33 +129,72 @@ class HashTableSeparateChaining(HashTable[str, V]):
         Returns whether the hash table is empty
         :complexity: O(1)
         """
-        return self.__length == 0
+        return len(self.__keys) == 0
+
+    def __find(self, key: str, key_hash: int, position: int) -> int:
+        """
+        Returns where key is stored, searching the chain of the bucket at position,
+        or -1 when it is not there.
+        :complexity: O(C + M * K) where C is the length of the chain, M the number of keys
+            in it sharing the hash of key and K the length of the key.
+        """
+        hashes, keys, following = self.__hashes, self.__keys, self.__next
+        index = self.__heads[position]
+        while index != -1 and (hashes[index] != key_hash or keys[index] != key):
+            index = following[index]
+        return index
 
     def __delitem__(self, key: str) -> None:
         """
-        Deletes an item from our hash table
+        Deletes an item from our hash table.
+        The last item stored takes the place of the deleted one, so the layout stays dense.
         :raises KeyError: when the key doesn't exist
         :complexity:
-            Best: O(K) where K is the length of the key (for hashing). Happens when the chain (linked list) does
+            Best: O(K) where K is the length of the key (for hashing). Happens when the chains do
                 not have many elements.
             Worst: O(N + K) where N is the number of items in the hash table and K is the length of the key.
-                Happens when the position has many elements and we have to traverse the linked list.
+                Happens when the position has many elements and we have to scan the chain.
         """
+        heads, following = self.__heads, self.__next
         position = self.hash(key)
-        if self.__table[position] is None:
+        index = self.__find(key, hash(key), position)
+        if index == -1:
             raise KeyError(key)
+        self.__unlink(position, index)
 
-        for index, item in enumerate(self.__table[position]):
-            if item[0] == key:
-                if len(self.__table[position]) <= 1:
-                    self.__table[position] = None
-                else:
-                    self.__table[position].delete_at_index(index)
+        last = len(self.__keys) - 1
+        if index != last:
+            last_key = self.__keys[last]
+            last_position = self.hash(last_key)
+            if heads[last_position] == last:
+                heads[last_position] = index
+            else:
+                previous = heads[last_position]
+                while following[previous] != last:
+                    previous = following[previous]
+                following[previous] = index
+            self.__keys[index] = last_key
+            self.__values[index] = self.__values[last]
+            self.__hashes[index] = self.__hashes[last]
+            following[index] = following[last]
+        self.__keys.pop()
+        self.__values.pop()
+        self.__hashes.pop()
+        following.pop()
 
-                self.__length -= 1
-                return
-
-        raise KeyError(key)
+    def __unlink(self, position: int, index: int) -> None:
+        """
+        Takes the item at index out of the chain of the bucket at position.
+        :complexity: O(C) where C is the length of the chain.
+        """
+        heads, following = self.__heads, self.__next
+        if heads[position] == index:
+            heads[position] = following[index]
+            return
+        previous = heads[position]
+        while following[previous] != index:
+            previous = following[previous]
+        following[previous] = following[index]
 
     def __getitem__(self, key: str) -> V:
         """
@@ -107,56 +204,87 @@ class HashTableSeparateChaining(HashTable[str, V]):
             Best: O(K) where K is the length of the key (for hashing). Happens when the chain at the position
                 doesn't have many items.
             Worst: O(N + K) where N is the number of items in the hash table and K is the length of the key.
-                Happens when we have to traverse a long chain to find the key.
+                Happens when we have to scan a long chain to find the key.
         """
-        position = self.hash(key)
-        if self.__table[position] is None:
+        index = self.__find(key, hash(key), self.hash(key))
+        if index == -1:
             raise KeyError(key)
-        for item in self.__table[position]:
-            if item[0] == key:
-                return item[1]
-
-        raise KeyError(key)
+        return self.__values[index]
 
     def __setitem__(self, key: str, data: V) -> None:
         """
-        Set a (key, data) pair in our hash table
+        Set a (key, data) pair in our hash table.
+        An existing key has its data replaced where it was found, without a second search.
         :complexity:
             Best: O(K) where K is the length of the key (for hashing). Happens when the position is empty.
             Worst: O(N + K) where N is the number of items in the hash table and K is the length of the key.
-                Happens when the position is not empty and we have to traverse the linked list.
+                Happens when the position is not empty and we have to scan the chain.
+            When the insert takes the table over its max load factor, add the cost of __rehash.
         """
         position = self.hash(key)
-        if self.__table[position] is None:
-            self.__table[position] = LinkedList()
+        key_hash = hash(key)
+        index = self.__find(key, key_hash, position)
+        if index != -1:
+            self.__values[index] = data
+            return
+        self.__add(key, key_hash, data, position)
 
-        # Attempt to find the key in our linked list
-        if len(self.__table[position]) > 0:
-            for index, item in enumerate(self.__table[position]):
-                if item[0] == key:
-                    # If found update the data
-                    self.__table[position][index] = (key, data)
-                    return
+    def increment(self, key: str, amount: int = 1) -> int:
+        """
+        Adds amount to the number stored against key, starting it at amount when the key is
+        new, and returns the new number. The key is found once and updated in place.
+        :complexity: Same as __setitem__.
+        """
+        position = self.hash(key)
+        key_hash = hash(key)
+        index = self.__find(key, key_hash, position)
+        if index != -1:
+            self.__values[index] += amount
+            return self.__values[index]
+        self.__add(key, key_hash, amount, position)
+        return amount
 
-        # Insert at the beginning for better time complexity
-        self.__table[position].insert(0, (key, data))
-        self.__length += 1
+    def __add(self, key: str, key_hash: int, data: V, position: int) -> None:
+        """
+        Stores a new key at the head of the chain of the bucket at position, growing the
+        table when that takes it over its max load factor.
+        :complexity: O(1), or the cost of __rehash when the table grows.
+        """
+        length = len(self.__keys)
+        self.__keys.append(key)
+        self.__values.append(data)
+        self.__hashes.append(key_hash)
+        self.__next.append(self.__heads[position])
+        self.__heads[position] = length
+        if length + 1 > self.__grow_at:
+            self.__rehash(self.__size_for(length + 1))
+
+    def __rehash(self, table_size: int) -> None:
+        """
+        Relink every item into a new table of table_size buckets, hashing all keys as one batch.
+        Items stay where they are stored; only the chains are rebuilt.
+        :complexity: O(N * K + S) where N is the number of items, K the length of a key and
+            S the new table size.
+        """
+        heads = self.__heads = array("q", (-1,)) * table_size
+        self.__grow_at = self.__limit_for(table_size)
+        following = self.__next
+        for index, position in enumerate(self.hash_many(self.__keys)):
+            following[index] = heads[position]
+            heads[position] = index
 
     def __iter__(self):
         """
         Returns an iterator for the hash table
         :complexity: O(N) where N n is the number of items in our hash table
         """
-        for list in self.__table:
-            if list is not None:
-                for item in list:
-                    yield item[1]
+        yield from self.__values
 
     def __len__(self) -> int:
         """
         Returns number of elements in the hash table
         """
-        return self.__length
+        return len(self.__keys)
 
     def __str__(self) -> str:
         """
@@ -1,5 +1,5 @@
 from data_structures.abstract_list import List, T
-from data_structures.node import Node
+from data_structures.node import Node, NodePool
 
 
 class LinkedListIterator:
@@ -23,11 +23,21 @@ class LinkedList(List[T]):
     """ Linked-node based implementation of List ADT. """
 
 
-    def __init__(self):
+    def __init__(self, pool: NodePool[T] | None = None):
+        """
+        :param pool: optional NodePool to take nodes from and give deleted nodes back to.
+        """
+        self.__pool = pool
         self.__head = None
         self.__rear = None
         self.__length = 0
 
+    def __new_node(self, item: T) -> Node[T]:
+        """ Returns a node for item, from the pool when there is one. """
+        if self.__pool is None:
+            return Node(item)
+        return self.__pool.take(item)
+
     def insert(self, index: int, item: T) -> None:
         """
         Inserts a new item before position index.
@@ -38,7 +48,7 @@ class LinkedList(List[T]):
         if index == len(self):
             self.append(item)
         else:
-            new_node = Node(item)
+            new_node = self.__new_node(item)
             if index == 0:
                 new_node.link = self.__head
                 self.__head = new_node
@@ -53,7 +63,7 @@ class LinkedList(List[T]):
         """ Append the item to the end of the list.
         :complexity: Given we have a reference to the rear of the list, this is O(1).
         """
-        new_node = Node(item)
+        new_node = self.__new_node(item)
         if self.__head is None:
             self.__head = new_node
         else:
@@ -78,11 +88,11 @@ class LinkedList(List[T]):
         if not self.is_empty():
             if index > 0:
                 previous_node = self.__get_node_at_index(index-1)
-                item = previous_node.link.item
-                previous_node.link = previous_node.link.link
+                node = previous_node.link
+                previous_node.link = node.link
             elif index == 0:
-                item = self.__head.item
-                self.__head = self.__head.link
+                node = self.__head
+                self.__head = node.link
                 previous_node = self.__head
             else:
                 raise ValueError("Index out of bounds")
@@ -91,6 +101,9 @@ class LinkedList(List[T]):
                 self.__rear = previous_node
 
             self.__length -= 1
+            item = node.item
+            if self.__pool is not None:
+                self.__pool.give(node)
             return item
         else:
             raise ValueError("Index out of bounds: list is empty")
@@ -1,7 +1,7 @@
 
-from typing import TypeVar
+from typing import Iterable, TypeVar
 
-from data_structures.node import Node
+from data_structures.node import Node, NodePool
 from data_structures.abstract_queue import Queue
 
 T = TypeVar("T")
@@ -12,13 +12,21 @@ class LinkedQueue(Queue[T]):
     The Queue ADT implemented using a linked structure.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, pool: NodePool[T] | None = None) -> None:
         """
         Constructor for the LinkedQueue class.
+        :param pool: optional NodePool to take nodes from and give served nodes back to.
         :complexity: O(1)
         """
+        self.__pool = pool
         self.clear()
 
+    def __new_node(self, item: T) -> Node[T]:
+        """ Returns a node for item, from the pool when there is one. """
+        if self.__pool is None:
+            return Node(item)
+        return self.__pool.take(item)
+
     def append(self, item: T) -> None:
         """ Adds an element to the rear of the queue.
         :raises Exception: if the queueu is full.
@@ -26,18 +34,46 @@ class LinkedQueue(Queue[T]):
         """
         # Case 1: Empty queue
         if self.__front is None:
-            self.__front = Node(item)
+            self.__front = self.__new_node(item)
             self.__rear = self.__front
             self.__length += 1
             return
 
         # Case 2: Non Empty queue
         # Add to the rear
-        new_node = Node(item)
+        new_node = self.__new_node(item)
         self.__rear.link = new_node
         self.__rear = new_node
         self.__length += 1
 
+    def extend(self, items: Iterable[T]) -> None:
+        """ Adds every element of items to the rear of the queue, in order.
+        The new nodes are linked into a chain first, which is then spliced onto the rear in
+        one step, so the queue is left unchanged if items raises part way.
+        :complexity: O(N) where N is the number of items.
+        """
+        pool = self.__pool
+        head = None
+        rear = None
+        count = 0
+        for item in items:
+            node = Node(item) if pool is None else pool.take(item)
+            if head is None:
+                head = node
+            else:
+                rear.link = node
+            rear = node
+            count += 1
+
+        if head is None:
+            return
+        if self.__front is None:
+            self.__front = head
+        else:
+            self.__rear.link = head
+        self.__rear = rear
+        self.__length += count
+
     def serve(self) -> T:
         """ Deletes and returns the element at the queue's front.
         :raises Exception: if the queue is empty
@@ -46,18 +82,19 @@ class LinkedQueue(Queue[T]):
         if self.is_empty():
             raise Exception("Queue is empty")
 
+        node = self.__front
         # Case 1: Single element in the queue
         if self.__front == self.__rear:
-            item = self.__front.item
             self.__front = None
             self.__rear = None
-            self.__length -= 1
-            return item
-
         # Case 2: Multiple elements in the queue
-        item = self.__front.item
-        self.__front = self.__front.link
+        else:
+            self.__front = self.__front.link
         self.__length -= 1
+
+        item = node.item
+        if self.__pool is not None:
+            self.__pool.give(node)
         return item
 
     def peek(self) -> T:
@@ -1,11 +1,17 @@
-from data_structures.node import Node
+from typing import Iterable
+
+from data_structures.node import Node, NodePool
 from data_structures.abstract_stack import Stack, T
 
 
 class LinkedStack(Stack[T]):
     """ Implementation of a stack with linked nodes. """
 
-    def __init__(self, _=None) -> None:
+    def __init__(self, _=None, pool: NodePool[T] | None = None) -> None:
+        """
+        :param pool: optional NodePool to take nodes from and give popped nodes back to.
+        """
+        self.__pool = pool
         self.__top = None
         self.__length = 0
 
@@ -13,11 +19,28 @@ class LinkedStack(Stack[T]):
         """ Pushes an element to the top of the stack.
         :complexity: O(1)
         """
-        new_node = Node(item)
+        new_node = Node(item) if self.__pool is None else self.__pool.take(item)
         new_node.link = self.__top
         self.__top = new_node
         self.__length += 1
 
+    def extend(self, items: Iterable[T]) -> None:
+        """ Pushes every element of items, in order, so the last one ends up on top.
+        The new nodes are linked onto the current top as a chain that only becomes the
+        stack once complete, so the stack is left unchanged if items raises part way.
+        :complexity: O(N) where N is the number of items.
+        """
+        pool = self.__pool
+        top = self.__top
+        count = 0
+        for item in items:
+            node = Node(item) if pool is None else pool.take(item)
+            node.link = top
+            top = node
+            count += 1
+        self.__top = top
+        self.__length += count
+
     def pop(self) -> T:
         """ Pops the element at the top of the stack.
         :complexity: O(1)
@@ -26,9 +49,13 @@ class LinkedStack(Stack[T]):
         if self.is_empty():
             raise Exception('Stack is empty')
 
-        item = self.__top.item
-        self.__top = self.__top.link
+        node = self.__top
+        self.__top = node.link
         self.__length -= 1
+
+        item = node.item
+        if self.__pool is not None:
+            self.__pool.give(node)
         return item
 
     def peek(self) -> T:
@@ -6,7 +6,9 @@ class Node(Generic[T]):
     """ Simple linked node.
     It contains an item and has a reference to next node. It can be used in
     linked structures.
+    Its attributes are slots, so a node holds no __dict__.
     """
+    __slots__ = ("item", "link")
 
     def __init__(self, item: T = None):
         self.item = item
@@ -14,3 +16,58 @@ class Node(Generic[T]):
 
     def __str__(self) -> str:
         return f"Node({self.item}, {'...' if self.link else 'None'})"
+
+
+class NodePool(Generic[T]):
+    """ Free list of nodes for linked structures.
+    A linked structure given a pool takes its new nodes from it and gives back the nodes it
+    unlinks, so a structure that keeps adding and removing items reuses the same nodes
+    instead of allocating a new one per item. A pool can be shared between structures.
+
+    A node given back is reused by the next take, so nothing should keep a reference to a
+    node (or an iterator over it) once it has been removed from a structure using a pool.
+
+    Pooling is opt-in and does not make churn faster: CPython already recycles the memory of
+    small objects like a slotted Node, and benchmarks/bench_node_pool measured pooled
+    append/serve, push/pop and append/delete churn at 0.93x to 1.06x the speed of new nodes.
+    """
+
+    def __init__(self, capacity: int | None = None) -> None:
+        """
+        :param capacity: the most free nodes to keep, or None to keep every node given back.
+        :complexity: O(1)
+        """
+        if capacity is not None and capacity < 0:
+            raise ValueError("Capacity cannot be negative.")
+        self.capacity = capacity
+        self.__free: Node[T] | None = None
+        self.__length = 0
+
+    def take(self, item: T) -> Node[T]:
+        """ Returns an unlinked node holding item, reusing a free node when there is one.
+        :complexity: O(1)
+        """
+        node = self.__free
+        if node is None:
+            return Node(item)
+        self.__free = node.link
+        self.__length -= 1
+        node.item = item
+        node.link = None
+        return node
+
+    def give(self, node: Node[T]) -> None:
+        """ Takes back a node that is no longer linked into any structure.
+        The node drops its item, so the pool never keeps items alive.
+        :complexity: O(1)
+        """
+        if self.capacity is not None and self.__length >= self.capacity:
+            return
+        node.item = None
+        node.link = self.__free
+        self.__free = node
+        self.__length += 1
+
+    def __len__(self) -> int:
+        """ Returns the number of free nodes. """
+        return self.__length
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+"""
+Batch evaluation of the universal string hash used by LinearProbeTable and
+HashTableSeparateChaining.
+
+Their hash walks a key once, keeping a running coefficient a that starts at
+UNIVERSAL_HASH_SEED and only depends on the position and the table size:
+
+    value = (ord(char) + a * value) % table_size
+    a = (a * hash_base % (table_size - 1)) + 1
+
+Expanding the loop, every character ends up multiplied by the product of the
+coefficients after it, so the hash of a key of length K is a weighted sum
+of its character codes. Those K weights are computed once per table size and
+key length, after which a hash is a dot product. For a batch of equal length
+keys that dot product becomes one matrix operation in NumPy, when it is
+installed.
+"""
+
+__docformat__ = 'reStructuredText'
+
+from functools import lru_cache
+from operator import mul
+from typing import Iterable, Sequence, Tuple
+
+from data_structures.referential_array import ArrayR
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+UNIVERSAL_HASH_SEED = 31415
+
+# A code point is below 2**21, so products of codes and weights fit in int64 below this size.
+NUMPY_TABLE_SIZE_LIMIT = 2**42
+
+
+@lru_cache(maxsize=256)
+def hash_weights(table_size: int, hash_base: int, length: int) -> Tuple[int, ...]:
+    """
+    Returns the weight of each character of a key of this length, so that
+    the universal hash of a key is sum(ord(char) * weight) % table_size.
+    :complexity: O(K) where K is the length, the first time it is asked for
+        with this table size and hash base, O(1) after that.
+    """
+    coefficients = [0] * length
+    a = UNIVERSAL_HASH_SEED
+    for i in range(length):
+        coefficients[i] = a
+        a = (a * hash_base % (table_size - 1)) + 1
+
+    # The first coefficient only ever multiplies the initial value of 0.
+    weights = [0] * length
+    weight = 1
+    for i in range(length - 1, -1, -1):
+        weights[i] = weight
+        weight = weight * coefficients[i] % table_size
+    return tuple(weights)
+
+
+def universal_hash(key: str, table_size: int, hash_base: int) -> int:
+    """
+    Returns the same value as the universal hash of the hash tables.
+    :complexity: O(K) where K is the length of the key.
+    """
+    weights = hash_weights(table_size, hash_base, len(key))
+    return sum(map(mul, map(ord, key), weights)) % table_size
+
+
+def hash_many(keys: Iterable[str], table_size: int, hash_base: int) -> ArrayR[int]:
+    """
+    Returns the universal hash of every key, in order.
+    When NumPy is installed and every key has the same length, the batch is
+    evaluated as one matrix product; otherwise every key is hashed with
+    universal_hash.
+    :complexity: O(N * K) where N is the number of keys and K their length.
+    """
+    if not isinstance(keys, Sequence):
+        keys = tuple(keys)
+    result = ArrayR(len(keys))
+    if len(keys) == 0:
+        return result
+
+    length = len(keys[0])
+    if numpy is not None and length > 0 and table_size < NUMPY_TABLE_SIZE_LIMIT \
+            and all(len(key) == length for key in keys):
+        codes = numpy.frombuffer(
+            "".join(keys).encode("utf-32-le", "surrogatepass"), dtype="<u4"
+        ).reshape(len(keys), length).astype(numpy.int64)
+        weights = numpy.array(hash_weights(table_size, hash_base, length), dtype=numpy.int64)
+        hashes = ((codes * weights) % table_size).sum(axis=1) % table_size
+        for i, value in enumerate(hashes.tolist()):
+            result[i] = value
+        return result
+
+    for i, key in enumerate(keys):
+        result[i] = universal_hash(key, table_size, hash_base)
+    return result
@@ -1,113 +1,558 @@
 
-from processing_line import Transaction
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import math
+
+from processing_line import BASE36_CHARACTERS, Transaction, TransactionBatch
 from data_structures import ArrayR
 from data_structures import HashTableSeparateChaining
 from data_structures import LinkedList
-from algorithms import insertion_sort
+from data_structures import LinkedQueue
 from data_structures.hash_table_linear_probing import LinearProbeTable
+from data_structures.universal_hash import universal_hash
+
+
+def _sorted_characters(text):
+    """
+    Returns the characters of text in sorted order.
+    Signature characters are counted in alphabet order instead of compared, which is O(L);
+    anything outside the base36 alphabet falls back to sorting.
+    """
+    result = "".join(map(str.__mul__, BASE36_CHARACTERS, map(text.count, BASE36_CHARACTERS)))
+    if len(result) != len(text):
+        return _sorted_blocks(text, 1)
+    return result
+
+
+def _sorted_blocks(prefix, block_size):
+    """
+    Splits prefix into blocks of block_size characters and returns them joined in sorted order.
+    """
+    blocks = ArrayR((len(prefix) + block_size - 1) // block_size)
+    for index in range(len(blocks)):
+        block = prefix[index * block_size:(index + 1) * block_size]
+        position = index
+        while position > 0 and block < blocks[position - 1]:
+            blocks[position] = blocks[position - 1]
+            position -= 1
+        blocks[position] = block
+    return "".join(blocks[index] for index in range(len(blocks)))
+
+
+def _block_key(signature, block_size, raw_signature_length):
+    """
+    Returns the key grouping signature at this block size: its full blocks sorted, followed by
+    the suffix left over after the last full block.
+    """
+    signature_length = (raw_signature_length // block_size) * block_size
+    if signature_length == block_size:
+        # A single block has nowhere to move
+        return signature
+
+    prefix = signature[:signature_length]
+    suffix = signature[signature_length:]
+    if block_size == 1:
+        return _sorted_characters(prefix) + suffix
+    if signature_length == 2 * block_size:
+        first, second = prefix[:block_size], prefix[block_size:]
+        return (first + second if first <= second else second + first) + suffix
+    return _sorted_blocks(prefix, block_size) + suffix
+
+
+def _group_sizes(signatures, raw_signature_length, expected_count):
+    """
+    Returns, as a tuple, the sizes of the groups holding more than one signature at every block
+    size from 1 up to the first size that leaves a single block; larger sizes all group the same
+    as that one. Each entry is an array of sizes, in no particular order.
+    signatures is called twice and should return an iterator over the same signatures each time.
+    """
+    # Only signatures sharing their characters with another signature can ever be grouped
+    characters = HashTableSeparateChaining(expected_count=expected_count)
+    for signature in signatures():
+        characters.increment(_sorted_characters(signature))
+
+    candidates = LinkedList()
+    for signature in signatures():
+        if characters[_sorted_characters(signature)] > 1:
+            candidates.append(signature)
+
+    sizes = ArrayR(min(raw_signature_length, raw_signature_length // 2 + 1))
+    for S in range(1, len(sizes) + 1):
+        table = HashTableSeparateChaining(expected_count=len(candidates))
+        for signature in candidates:
+            table.increment(_block_key(signature, S, raw_signature_length))
+        sizes[S - 1] = array("q", (count for count in table if count > 1))
+
+    return tuple(sizes[index] for index in range(len(sizes)))
+
+
+def _shard_group_sizes(shard, raw_signature_length):
+    """
+    Process pool entry point: the group sizes of one shard of signatures.
+    """
+    return _group_sizes(lambda: iter(shard), raw_signature_length, len(shard))
+
+
+def _log_units(count):
+    """
+    Returns the natural logarithm of a group size in fixed point, StreamingFraudDetector.LOG_SCALE
+    units per 1. Groups of 0 or 1 signatures contribute nothing to a score.
+    """
+    if count < 2:
+        return 0
+    return round(math.log(count) * StreamingFraudDetector.LOG_SCALE)
+
+
+class _ProbeChains:
+    """
+    Replays inserting keys into a LinearProbeTable with the given sizes and its default hash
+    base, on flat arrays: slots hold the index of a key in an array of keys, and -1 when empty.
+    Hashes come from the shared per size, per key length weights of universal_hash.
+    """
+    HASH_BASE = 31
+
+    def __init__(self, sizes=LinearProbeTable.DEFAULT_TABLE_SIZES):
+        """
+        :param sizes: the table sizes to grow through, as LinearProbeTable takes them.
+        """
+        self.sizes = sizes
+
+    def hash(self, key, size_index):
+        """
+        Returns LinearProbeTable.hash(key) for a table of sizes[size_index] slots.
+        :complexity: O(K) where K is the length of the key.
+        """
+        return universal_hash(key, self.sizes[size_index], _ProbeChains.HASH_BASE)
+
+    def max_probe_chain(self, keys, bound=None):
+        """
+        Inserts keys in order and returns the longest probe chain any of them walked, or None as
+        soon as a chain reaches bound.
+        :complexity: O(N * K) for N keys of length K, plus the probing and rehashing a
+        LinearProbeTable would do.
+        :raises RuntimeError: when a new key finds the table full at its last size, as
+        LinearProbeTable does.
+        """
+        sizes = self.sizes
+        size_index = 0
+        size = sizes[size_index]
+        slots = array("l", (-1,)) * size
+        stored = ArrayR(size)
+        count = 0
+        max_chain = 0
+
+        for key in keys:
+            position = self.hash(key, size_index)
+            chain = 0
+            slot = slots[position]
+            while slot >= 0 and stored[slot] != key:
+                chain += 1
+                if chain == size:
+                    raise RuntimeError("Table is full!")
+                position += 1
+                if position == size:
+                    position = 0
+                slot = slots[position]
+
+            if chain > max_chain:
+                max_chain = chain
+                if bound is not None and max_chain >= bound:
+                    return None
+            if slot >= 0:
+                # Updating a key already in the table
+                continue
+
+            if count == len(stored):
+                grown = ArrayR(2 * count)
+                for index in range(count):
+                    grown[index] = stored[index]
+                stored = grown
+            stored[count] = key
+            slots[position] = count
+            count += 1
+
+            if count > size / 2 and size_index + 1 < len(sizes):
+                # Rehash into the next size, in the order of the old slots
+                size_index += 1
+                size = sizes[size_index]
+                old_slots = slots
+                slots = array("l", (-1,)) * size
+                for slot in old_slots:
+                    if slot >= 0:
+                        position = self.hash(stored[slot], size_index)
+                        while slots[position] >= 0:
+                            position += 1
+                            if position == size:
+                                position = 0
+                        slots[position] = slot
+
+        return max_chain
+
+
+def _rectify_functions(functions, transactions):
+    """
+    Returns (index, MPCL) of the first function with the lowest maximum probe chain over the
+    transactions, or (None, inf) without functions. Also the process pool entry point.
+    """
+    chains = _ProbeChains()
+    best_index = None
+    best_mpcl = float("inf")
+    for index in range(len(functions)):
+        function = functions[index]
+        keys = (str(function(transaction)) for transaction in transactions)
+        max_chain = chains.max_probe_chain(keys, None if best_index is None else best_mpcl)
+        if max_chain is not None and max_chain < best_mpcl:
+            best_index = index
+            best_mpcl = max_chain
+    return (best_index, best_mpcl)
 
 
 class FraudDetection:
+    DEFAULT_SHARDS_PER_WORKER = 4
+    # Relative gap under which two summed logarithms are too close to rank without exact products
+    LOG_SCORE_TOLERANCE = 1e-9
+
     def __init__(self, transactions):
         self.transactions = transactions
 
-    def detect_by_blocks(self):
+    def _signatures(self):
+        """
+        Returns an iterator over the signature of every transaction, in order.
+        A TransactionBatch hands out its signature column directly, so no Transaction
+        objects are built for it.
+        """
+        if isinstance(self.transactions, TransactionBatch):
+            return self.transactions.signatures()
+        return (transaction.signature for transaction in self.transactions)
+
+    def detect_by_blocks(self, workers=1, exact=True):
         """
         Analyse your time complexity of this method.
-        :complexity: Best case is O(N * L^2) where N is the number of transactions and L is the 
+        :complexity: Best case is O(N * L) where N is the number of transactions and L is the
         length of a signature.
-        
-        The best case happens when the block size S is large (close to the length of a signature), 
-        so each signature only splits into a small number of blocks. In this case, insertion sort 
-        works on very few blocks, and the cost per transaction is dominated by string slicing and 
-        hashing, both of which are O(L). Over all block sizes, this totals to O(N * L^2).
 
-        Worst case is O(N * L^3). This happens when the block size S = 1, so each signature of length 
-        L is split into L single-character blocks. Insertion sort must then sort L blocks, which costs 
-        O(L^2) per transaction. Since there are N transactions and up to L different block sizes to 
-        test, the total becomes O(N * L^3).
+        Two signatures that share a group at any block size S hold the same characters, so the
+        first pass groups every signature by its characters, counted rather than compared in O(L).
+        A signature alone in that grouping is alone at every S and only multiplies the score by 1,
+        so the best case happens when every signature is alone and nothing else runs.
+
+        Worst case is O(N * L^2). This happens when every signature shares its characters with
+        another one, so all of them are grouped again for each block size. Block sizes above L / 2
+        leave a single block that cannot move, so they all group by the whole signature and are
+        counted once. S = 1 reuses the character grouping, S = 2 and above insertion sort L / S
+        blocks of S characters in O(L^2 / S), which sums to O(L^2) over the remaining block sizes.
+
+        With workers > 1 the signatures are split into shards by their characters, so every group
+        at every block size falls in one shard. Each shard is grouped in a pool of that many
+        processes and the groups of a block size are gathered from every shard. The result, ties
+        included, is the same as with one worker.
+
+        Block sizes are compared by the sum of the logarithms of their group sizes, in O(G) float
+        work for G groups of more than one signature. Only sums within LOG_SCORE_TOLERANCE of the
+        best so far are settled by multiplying the group sizes out exactly. With exact=False the
+        winning logarithm is returned as the score instead of its exact product.
         """
+        if workers < 1:
+            raise ValueError("workers should be at least 1.")
+
         first_signature = self.transactions[0].signature
         raw_signature_length = len(first_signature)
 
+        if workers == 1:
+            sizes = _group_sizes(self._signatures, raw_signature_length, len(self.transactions))
+        else:
+            sizes = self.__parallel_group_sizes(raw_signature_length, workers)
+
         best_score_block_size = 1
+        best_log_score = 0.0
+        best_sizes = None
         best_score = 1
-
-        # Try all block sizes
-        for S in range(1, raw_signature_length + 1):
-            table = HashTableSeparateChaining()
-
-            # For each transaction sort the blocks and add to hash table to find how many transactions match
-            for transaction in self.transactions:
-                signature = transaction.signature
-                signature_length = (raw_signature_length // S) * S
-                prefix = signature[:signature_length]
-                suffix = signature[signature_length:]
-
-                # Split the signature into blocks
-                blocks = LinkedList()
-                for i in range(0, signature_length, S):
-                    blocks.append(prefix[i:i+S])
-
-                # Insertion sort
-                sorted_blocks = insertion_sort(blocks)
-                duplicates = "".join(sorted_blocks) + suffix
-
-                # Increment duplicate count in hash table
-                try:
-                    curr = table[duplicates]
-                    table[duplicates] = curr + 1
-                except KeyError:
-                    table[duplicates] = 1
-
-            # Calculate suspicion score
-            items = table.items()
-            score = 1
-            for j in range(len(items)):
-                key, value = items[j]
-                score *= value
+        for index in range(len(sizes)):
+            log_score = math.fsum(map(math.log, sizes[index]))
+            tolerance = FraudDetection.LOG_SCORE_TOLERANCE * max(1.0, best_log_score)
+            if log_score > best_log_score + tolerance:
+                score = None
+            elif log_score >= best_log_score - tolerance:
+                # Too close to call from the logarithms, so compare the exact products
+                if best_score is None:
+                    best_score = math.prod(best_sizes)
+                score = math.prod(sizes[index])
+                if score <= best_score:
+                    continue
+            else:
+                continue
 
             # Update best score
-            if score > best_score:
-                best_score = score
-                best_score_block_size = S
-
+            best_score_block_size = index + 1
+            best_log_score = log_score
+            best_sizes = sizes[index]
+            best_score = score
+
+        if not exact:
+            return (best_score_block_size, best_log_score)
+        if best_score is None:
+            best_score = math.prod(best_sizes)
         return (best_score_block_size, best_score)
 
-    def rectify(self, functions):
-        best_func = None
-        best_mpcl = float("inf")
+    def __parallel_group_sizes(self, raw_signature_length, workers):
+        """
+        Groups every block size over shards of signatures that share no characters grouping,
+        in a pool of processes, and gathers the group sizes of each block size from every shard.
+        :complexity: O(N * L) to split the signatures, plus the work of _group_sizes spread
+        over the given number of workers.
+        """
+        shards = ArrayR(workers * FraudDetection.DEFAULT_SHARDS_PER_WORKER)
+        for index in range(len(shards)):
+            shards[index] = LinkedList()
+        for signature in self._signatures():
+            shards[hash(_sorted_characters(signature)) % len(shards)].append(signature)
+
+        sizes = None
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shard_sizes = executor.map(
+                _shard_group_sizes,
+                (tuple(shards[index]) for index in range(len(shards))),
+                repeat(raw_signature_length),
+            )
+            for partial in shard_sizes:
+                if sizes is None:
+                    sizes = partial
+                else:
+                    for index in range(len(partial)):
+                        sizes[index].extend(partial[index])
+        return sizes
+
+    def rectify(self, functions, workers=1):
+        """
+        Returns (function, MPCL) for the function whose str(function(transaction)) keys give the
+        lowest maximum probe chain length when every transaction is inserted in order into a
+        LinearProbeTable with its default settings. The first such function wins ties.
 
-        for f in functions:
-            table = LinearProbeTable()
-            max_chain = 0
-
-            # Insert each transaction's key
-            for tx in self.transactions:
-                key = str(f(tx))
-                probe_chain = 0
-                position = table.hash(key)
-
-                # count probes until empty slot or match
-                while True:
-                    if table._LinearProbeTable__array[position] is None:
-                        break
-                    elif table._LinearProbeTable__array[position][0] == key:
-                        break
-                    else:
-                        probe_chain += 1
-                        position = (position + 1) % table.table_size
-
-                # update MPCL
-                max_chain = max(max_chain, probe_chain)
-                table[key] = tx.timestamp
-
-            if max_chain < best_mpcl:
-                best_mpcl = max_chain
-                best_func = f
+        :complexity: O(F * N * K) where F is the number of functions, N the number of
+        transactions and K the length of a key, plus the probing itself.
 
+        Probing is replayed by _ProbeChains on flat arrays instead of a real table, and a function
+        stops being evaluated as soon as its chain reaches the best MPCL so far, since it can no
+        longer win. With workers > 1 consecutive runs of functions are evaluated in a pool of that
+        many processes, so the functions and transactions have to be picklable.
+        """
+        if workers < 1:
+            raise ValueError("workers should be at least 1.")
+        if workers == 1 or len(functions) <= 1:
+            best_index, best_mpcl = _rectify_functions(functions, self.transactions)
+        else:
+            best_index, best_mpcl = self.__parallel_rectify(functions, workers)
+
+        best_func = None if best_index is None else functions[best_index]
         return (best_func, best_mpcl)
 
+    def __parallel_rectify(self, functions, workers):
+        """
+        Evaluates consecutive runs of functions in a pool of processes and keeps the earliest
+        function with the lowest MPCL.
+        :complexity: The work of _rectify_functions, spread over the given number of workers.
+        """
+        run_length = (len(functions) + workers - 1) // workers
+        transactions = tuple(self.transactions[index] for index in range(len(self.transactions)))
+        runs = (
+            tuple(functions[index] for index in range(start, min(start + run_length, len(functions))))
+            for start in range(0, len(functions), run_length)
+        )
+
+        best_index = None
+        best_mpcl = float("inf")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_rectify_functions, runs, repeat(transactions))
+            for run, (index, mpcl) in enumerate(results):
+                if index is not None and mpcl < best_mpcl:
+                    best_index = run * run_length + index
+                    best_mpcl = mpcl
+        return (best_index, best_mpcl)
+
+
+class StreamingFraudDetector:
+    """
+    Keeps the result of FraudDetection.detect_by_blocks up to date while signed transactions
+    arrive one at a time, e.g. straight from iterating a ProcessingLine.
+
+    Every block size S up to the first one leaving a single block has a table counting its
+    group keys, and a running sum of the logarithms of its group sizes. Like detect_by_blocks,
+    a signature only joins those tables once another signature shares its characters.
+
+    The logarithms are kept in fixed point (LOG_SCALE units each), so adding and then expiring
+    a transaction restores the sums exactly instead of drifting.
+
+    With a window, only transactions whose timestamp is within window of the newest one added
+    are counted; older ones expire in the order they were added. The tables are
+    HashTableSeparateChaining, which keeps growing with the number of keys and deletes in O(1),
+    so an unbounded feed neither fills them nor slows down expiring.
+    """
+    LOG_SCALE = 2**32
+
+    def __init__(self, signature_length=None, window=None):
+        """
+        :param signature_length: the L used to split signatures into blocks. By default it is
+        the length of the first signature added, as detect_by_blocks uses the first transaction.
+        :param window: how far behind the newest timestamp a transaction is still counted,
+        or None to count every transaction.
+        :complexity: O(L) where L is the signature length, if it is given.
+        """
+        if window is not None and window < 0:
+            raise ValueError("Window should not be negative.")
+        self.window = window
+        self.signature_length = None
+        self.__length = 0
+        self.__window = LinkedQueue()
+        self.__characters = HashTableSeparateChaining()
+        if signature_length is not None:
+            self.__start(signature_length)
+
+    def __start(self, signature_length):
+        """
+        Creates the per block size tables for signatures of this length.
+        :complexity: O(L) where L is the signature length.
+        """
+        self.signature_length = signature_length
+        block_sizes = min(signature_length, signature_length // 2 + 1)
+        self.__tables = ArrayR(block_sizes)
+        self.__log_scores = ArrayR(block_sizes)
+        self.__groups = array("q", bytes(8 * block_sizes))
+        for index in range(block_sizes):
+            self.__tables[index] = HashTableSeparateChaining()
+            self.__log_scores[index] = 0
+
+    def add(self, transaction):
+        """
+        Counts a signed transaction, expiring any that fall out of the window.
+        :complexity: O(L^2) where L is the signature length, as detect_by_blocks spends per
+        transaction, plus the cost of the expired transactions.
+        :raises ValueError: if the transaction is not signed.
+        """
+        signature = transaction.signature
+        if signature is None:
+            raise ValueError("Transaction should be signed before it is counted.")
+        if self.signature_length is None:
+            self.__start(len(signature))
+
+        if self.window is not None:
+            while not self.__window.is_empty() and self.__window.peek()[0] < transaction.timestamp - self.window:
+                self.__discard(self.__window.serve()[1])
+            self.__window.append((transaction.timestamp, signature))
+
+        self.__length += 1
+        key = _sorted_characters(signature)
+        try:
+            count, lone = self.__characters[key]
+        except KeyError:
+            # Alone for now, so it cannot be grouped at any block size yet
+            self.__characters[key] = (1, signature)
+            return
+
+        self.__characters[key] = (count + 1, None)
+        if lone is not None:
+            self.__count(lone, 1)
+        self.__count(signature, 1)
+
+    def extend(self, transactions):
+        """
+        Counts every transaction of an iterable in order, e.g. a ProcessingLine or a micro-batch.
+        :complexity: O(T * L^2) for T transactions of signature length L.
+        """
+        for transaction in transactions:
+            self.add(transaction)
+
+    def __discard(self, signature):
+        """
+        Stops counting one transaction with this signature.
+        :complexity: O(L^2) where L is the signature length.
+        """
+        self.__length -= 1
+        key = _sorted_characters(signature)
+        count, lone = self.__characters[key]
+        if count == 1:
+            del self.__characters[key]
+            if lone is None:
+                # It was grouped while it had company, so it is in the block size tables
+                self.__count(signature, -1)
+            return
+
+        # Whatever is left stays in the block size tables, so there is no lone signature to keep
+        self.__characters[key] = (count - 1, None)
+        self.__count(signature, -1)
+
+    def __count(self, signature, change):
+        """
+        Adds change to the group of this signature at every block size, keeping the running
+        logarithm sums and the number of groups with more than one signature up to date.
+        :complexity: O(L^2) where L is the signature length.
+        """
+        for index in range(len(self.__tables)):
+            table = self.__tables[index]
+            key = _block_key(signature, index + 1, self.signature_length)
+            new_count = table.increment(key, change)
+            count = new_count - change
+            if new_count == 0:
+                del table[key]
+
+            self.__log_scores[index] += _log_units(new_count) - _log_units(count)
+            if count < 2 <= new_count:
+                self.__groups[index] += 1
+            elif new_count < 2 <= count:
+                self.__groups[index] -= 1
+
+    def best(self, exact=True):
+        """
+        Returns (block_size, score) as detect_by_blocks would for the transactions counted.
+        With exact=False the score is the natural logarithm of the suspicion score.
+        :complexity: O(L) where L is the signature length, when no two block sizes are too close
+        to rank by their logarithms; otherwise, and for the exact score of the winner, O(G) for
+        the G groups of each block size that has to be multiplied out.
+        """
+        best_score_block_size = 1
+        best_log_score = 0
+        best_score = 1
+        if self.signature_length is None:
+            return (best_score_block_size, 0.0 if not exact else best_score)
+
+        for index in range(len(self.__tables)):
+            log_score = self.__log_scores[index]
+            # Each term was rounded by at most half a unit
+            tolerance = self.__groups[index] + self.__groups[best_score_block_size - 1]
+            if log_score > best_log_score + tolerance:
+                score = None
+            elif log_score >= best_log_score - tolerance:
+                if best_score is None:
+                    best_score = self.__exact_score(best_score_block_size - 1)
+                score = self.__exact_score(index)
+                if score <= best_score:
+                    continue
+            else:
+                continue
+
+            best_score_block_size = index + 1
+            best_log_score = log_score
+            best_score = score
+
+        if not exact:
+            return (best_score_block_size, best_log_score / StreamingFraudDetector.LOG_SCALE)
+        if best_score is None:
+            best_score = self.__exact_score(best_score_block_size - 1)
+        return (best_score_block_size, best_score)
+
+    def __exact_score(self, index):
+        """
+        Multiplies out the group sizes of one block size.
+        :complexity: O(G) where G is the number of groups at that block size.
+        """
+        return math.prod(self.__tables[index])
+
+    def __len__(self):
+        """
+        Returns the number of transactions currently counted.
+        """
+        return self.__length
+
 
 
 if __name__ == "__main__":
@@ -1,16 +1,116 @@
+import mmap
+import random
+import struct
+from array import array
+
 from data_structures import ArrayR
 
 from processing_line import Transaction
 
 
+_LEGAL_CHARACTERS = "abcdefghijklmnopqrstuvwxyz0123456789"
+_ILLEGAL_PAGE = 255
+_PAGE_TABLE = bytes(_LEGAL_CHARACTERS.find(chr(code)) % 256 for code in range(256))
+# Pages in the order of their characters ("0" to "9", then "a" to "z").
+_LEXICOGRAPHIC_PAGES = bytes(_PAGE_TABLE[code] for code in range(256) if _PAGE_TABLE[code] != 255)
+
+# On-disk layout written by ProcessingBook.save, all little-endian:
+#   header: magic, root node offset, count, error count
+#   node:   one (tag, offset) entry per page, tag is _EMPTY, _LEAF or _NODE
+#   leaf:   signature, amount, timestamp, from_user, to_user
+# Strings are a 32-bit byte length followed by UTF-8, numbers a tag byte (_INTEGER or
+# _REAL) followed by 8 bytes. Nodes are written after everything they point to.
+_MAGIC = b"PBOOK\x00\x00\x01"
+_HEADER = struct.Struct("<8sQQQ")
+_ENTRY = struct.Struct("<BQ")
+_LENGTH = struct.Struct("<I")
+_INTEGER_VALUE = struct.Struct("<q")
+_REAL_VALUE = struct.Struct("<d")
+_EMPTY, _LEAF, _NODE = 0, 1, 2
+_INTEGER, _REAL = 0, 1
+
+
+def _pack_string(text):
+    encoded = text.encode("utf-8")
+    return _LENGTH.pack(len(encoded)) + encoded
+
+
+def _pack_number(value):
+    """
+    :raises TypeError: if value is not an int or a float.
+    :raises struct.error: if an int does not fit in 64 bits.
+    """
+    if isinstance(value, int):
+        return bytes((_INTEGER,)) + _INTEGER_VALUE.pack(value)
+    if isinstance(value, float):
+        return bytes((_REAL,)) + _REAL_VALUE.pack(value)
+    raise TypeError(f"Cannot store {value!r}, only int and float values can be saved.")
+
+
+def _signature_pages(signature, strict=True):
+    """
+    Returns the page number of every character of signature as a bytes object, using a
+    256 entry lookup table (one bytes.translate call). Illegal characters become
+    _ILLEGAL_PAGE when strict is False.
+    :raises ValueError: if strict and signature has a character outside the legal characters.
+    :complexity: O(L) where L is the length of the signature.
+    """
+    pages = signature.encode("latin-1", "replace").translate(_PAGE_TABLE)
+    if strict and _ILLEGAL_PAGE in pages:
+        raise ValueError(f"Illegal character in signature {signature!r}")
+    return pages
+
+
+def _shift_total(total, added, removed=0):
+    """
+    Returns total + added - removed for a ProcessingBook's amount_total. The total becomes
+    None, meaning unknown, once an amount that cannot be added to a number is stored, and
+    stays None from then on, so any amount can still be stored.
+    :complexity: O(1)
+    """
+    if total is None or added is None or removed is None:
+        return None
+    try:
+        return total + added - removed
+    except TypeError:
+        return None
+
+
+def _same_lengths(keys, order, low, high):
+    """
+    Returns whether keys[order[low]], ..., keys[order[high - 1]] all have the same length.
+    :complexity: O(high - low)
+    """
+    length = len(keys[order[low]])
+    for index in range(low + 1, high):
+        if len(keys[order[index]]) != length:
+            return False
+    return True
+
+
+class _DrawnPages:
+    """
+    How much ProcessingBook.sample has drawn from each page of one book, without replacement:
+    taken[page] is the count (or amount, if weighted) drawn from it so far, and below[page]
+    the _DrawnPages of the nested book on that page, once something was drawn from it.
+    """
+    __slots__ = ("taken", "below")
+
+    def __init__(self, typecode):
+        self.taken = array(typecode, bytes(8 * len(_LEGAL_CHARACTERS)))
+        self.below = ArrayR(len(_LEGAL_CHARACTERS))
+
+
 class ProcessingBook:
-    LEGAL_CHARACTERS = "abcdefghijklmnopqrstuvwxyz0123456789"
+    LEGAL_CHARACTERS = _LEGAL_CHARACTERS
+    BULK_LOAD_CUTOFF = 16
 
     def __init__(self, level=0):
         self.pages = ArrayR(len(ProcessingBook.LEGAL_CHARACTERS))
         self.level = level
         self.error_count = 0
         self.count = 0
+        self.amount_total = 0
     
     def page_index(self, character):
         """
@@ -56,15 +156,18 @@ class ProcessingBook:
             if existing_transaction.signature == signature:
                 self.pages[index] = None
                 self.count -= 1
+                self.amount_total = _shift_total(self.amount_total, 0, existing_amount)
                 return
             else:
                 raise KeyError(f"Transaction {signature} not found")
         
         if isinstance(current, ProcessingBook):
             before = len(current)
+            before_total = current.amount_total
             del current[transaction]
             after = len(current)
             self.count -= (before - after)
+            self.amount_total = _shift_total(self.amount_total, current.amount_total, before_total)
             
             if after == 0:
                 self.pages[index] = None
@@ -88,6 +191,7 @@ class ProcessingBook:
         if current is None:
             self.pages[index] = (transaction, amount)
             self.count += 1
+            self.amount_total = _shift_total(self.amount_total, amount)
             return
         
         if isinstance(current, tuple):
@@ -102,17 +206,20 @@ class ProcessingBook:
                 nested[transaction] = amount
                 self.pages[index] = nested
                 self.count += 1
+                self.amount_total = _shift_total(self.amount_total, amount)
                 return
         
         if isinstance(current, ProcessingBook):
             before_error = current.get_error_count()
             before_count = len(current)
+            before_total = current.amount_total
             current[transaction] = amount
             after_error = current.get_error_count()
             after_count = len(current)
             
             self.error_count += (after_error - before_error)
             self.count += (after_count - before_count)
+            self.amount_total = _shift_total(self.amount_total, current.amount_total, before_total)
             return
         
     def __getitem__(self, transaction):
@@ -136,12 +243,725 @@ class ProcessingBook:
         raise KeyError(f"Transaction {signature} not found")
                 
     
-    def sample(self, required_size):
+    def items(self):
+        """
+        Yields every stored (transaction, amount) pair, in lexicographic order of signature.
+        Pages are visited in the order of their characters and nested books are walked
+        recursively, so nothing is copied into an intermediate array.
+        :complexity: O(N + B) where N is the number of transactions and B the number of
+        nested books, each of which scans its 36 pages once.
+        """
+        for page in _LEXICOGRAPHIC_PAGES:
+            current = self.pages[page]
+            if current is None:
+                continue
+            if isinstance(current, tuple):
+                yield current
+            else:
+                yield from current.items()
+
+    def prefix_items(self, prefix):
+        """
+        Yields the (transaction, amount) pairs whose signature starts with prefix, in
+        lexicographic order of signature. The pages are followed straight down to the one
+        that holds every such signature, and only that page is walked.
+        :complexity: O(P + M + B) where P is the length of the prefix, M the number of
+        matches and B the number of nested books below the page reached.
+        """
+        book = self
+        for level in range(self.level, len(prefix)):
+            index = ProcessingBook.LEGAL_CHARACTERS.find(prefix[level])
+            if index < 0:
+                return
+            current = book.pages[index]
+            if current is None:
+                return
+            if isinstance(current, tuple):
+                if current[0].signature.startswith(prefix):
+                    yield current
+                return
+            book = current
+        yield from book.items()
+
+    def __iter__(self):
+        """
+        Yields every stored transaction, in lexicographic order of signature.
+        :complexity: See items.
+        """
+        for transaction, _ in self.items():
+            yield transaction
+
+    def bulk_load(self, pairs):
+        """
+        Stores every (transaction, amount) pair in pairs. The resulting pages, count and
+        error count are the same as inserting the pairs one by one, in order, with
+        book[transaction] = amount.
+
+        On an empty book the pages are built level by level: the pairs are partitioned by
+        the page of their signature character at this level (a stable counting sort), a
+        page holding one distinct signature becomes a stored pair (later duplicates with a
+        different amount count as errors, like repeated inserts) and a page holding more
+        becomes a nested book built the same way. Every signature is translated to its
+        page numbers once, and the partitioning moves integer positions around in flat
+        arrays rather than the pairs themselves. A page where some signature ends before
+        the others (one is a prefix of another, or too short for a nested book) is filled
+        by inserting its pairs one at a time, since how repeated inserts count those
+        depends on the order they arrive in. A non-empty book falls back to inserting the
+        pairs one at a time.
+
+        :complexity: O(N * (L + D)) where N is the number of pairs, L the signature length
+        (translated once) and D the depth of the deepest page built. Every pair is looked
+        at a constant number of times per level, instead of walking from the root once per
+        pair and snapshotting the nested counts on the way back up.
+        """
+        if len(self) > 0:
+            for transaction, amount in pairs:
+                self[transaction] = amount
+            return
+
+        pairs = tuple(pairs)
+        # The extra trailing page marks the level at which a signature runs out of characters.
+        end_marker = bytes((len(ProcessingBook.LEGAL_CHARACTERS),))
+        keys = tuple(_signature_pages(transaction.signature, strict=False) + end_marker for transaction, _ in pairs)
+        self._build(pairs, keys, array("l", range(len(pairs))), array("l", range(len(pairs))), 0, len(pairs))
+
+    def _build(self, pairs, keys, order, scratch, low, high):
+        """
+        Fills the empty pages of this book with pairs[order[low]], ..., pairs[order[high - 1]].
+        keys holds the page numbers of each pair's signature and scratch is a work array as
+        long as order. See bulk_load.
+        :complexity: O((high - low) * D), see bulk_load.
+        """
+        if high - low <= ProcessingBook.BULK_LOAD_CUTOFF:
+            # A counting sort over every page costs more than a few plain inserts.
+            self._insert_run(pairs, order, low, high)
+            return
+
+        level = self.level
+        run_keys = tuple(keys[order[index]] for index in range(low, high))
+        smallest = min(run_keys)
+        largest = max(run_keys)
+        if smallest != largest and smallest[level] == largest[level]:
+            if not _same_lengths(keys, order, low, high):
+                # A signature ending inside the shared page is counted the way the order of
+                # inserts dictates, so replay them.
+                self._insert_run(pairs, order, low, high)
+                return
+
+            # Every signature shares the next few characters, so each of those levels is a
+            # book with a single nested page. Build that chain directly and only partition
+            # where the signatures start to differ.
+            common = level
+            while smallest[common] == largest[common]:
+                common += 1
+            top = ProcessingBook(level + 1)
+            book = top
+            for depth in range(level, common):
+                if smallest[depth] == _ILLEGAL_PAGE:
+                    raise ValueError(f"Illegal character in signature {pairs[order[low]][0].signature!r}")
+                if depth > level:
+                    nested = ProcessingBook(depth + 1)
+                    book.pages[smallest[depth]] = nested
+                    book = nested
+            book._build(pairs, keys, order, scratch, low, high)
+
+            walk = top
+            while walk is not book:
+                walk.count = book.count
+                walk.error_count = book.error_count
+                walk.amount_total = book.amount_total
+                walk = walk.pages[smallest[walk.level]]
+            self.pages[smallest[level]] = top
+            self.count += book.count
+            self.error_count += book.error_count
+            self.amount_total = _shift_total(self.amount_total, book.amount_total)
+            return
+
+        page_count = len(ProcessingBook.LEGAL_CHARACTERS)
+        too_short = page_count
+        pages_of = array("b", (0,)) * (high - low)
+        # Room for the too short page after the legal ones, see below.
+        starts = array("l", (0,)) * (page_count + 3)
+
+        for index in range(low, high):
+            page = keys[order[index]][level]
+            if page == _ILLEGAL_PAGE:
+                raise ValueError(f"Illegal character in signature {pairs[order[index]][0].signature!r}")
+            pages_of[index - low] = page
+            starts[page + 2] += 1
+
+        # Stable counting sort of order[low:high] by page, through scratch.
+        for page in range(2, page_count + 2):
+            starts[page] += starts[page - 1]
+        for index in range(low, high):
+            page = pages_of[index - low] + 1
+            scratch[low + starts[page]] = order[index]
+            starts[page] += 1
+        order[low:high] = scratch[low:high]
+
+        # starts[page] is now the start of page's run, and starts[page + 1] its end.
+        self.error_count += starts[too_short + 1] - starts[too_short]
+        for page in range(page_count):
+            start = low + starts[page]
+            end = low + starts[page + 1]
+            if start == end:
+                continue
+
+            key = keys[order[start]]
+            distinct = False
+            for index in range(start + 1, end):
+                if keys[order[index]] != key:
+                    distinct = True
+                    break
+
+            if distinct and not _same_lengths(keys, order, start, end):
+                # Some signature ends in the nested book, where a repeated __setitem__ counts
+                # it depending on when it arrived, so the page is built by replaying them.
+                self._insert_run(pairs, order, start, end)
+            elif distinct:
+                nested = ProcessingBook(level + 1)
+                nested._build(pairs, keys, order, scratch, start, end)
+                self.pages[page] = nested
+                self.count += nested.count
+                self.error_count += nested.error_count
+                self.amount_total = _shift_total(self.amount_total, nested.amount_total)
+            else:
+                first_transaction, first_amount = pairs[order[start]]
+                self.pages[page] = (first_transaction, first_amount)
+                self.count += 1
+                self.amount_total = _shift_total(self.amount_total, first_amount)
+                for index in range(start + 1, end):
+                    if pairs[order[index]][1] != first_amount:
+                        self.error_count += 1
+
+    def _insert_run(self, pairs, order, low, high):
+        """
+        Inserts pairs[order[low]], ..., pairs[order[high - 1]] one by one with __setitem__.
+        :complexity: O((high - low) * D) where D is the depth of the deepest page reached.
+        """
+        for index in range(low, high):
+            transaction, amount = pairs[order[index]]
+            self[transaction] = amount
+
+    def save(self, path):
+        """
+        Writes the book to path in the format read by MappedProcessingBook.
+        Amounts and timestamps must be int (64-bit) or float values and user names strings.
+        :complexity: O(N + B) where N is the number of transactions and B the number of
+        nested books. Every page is written exactly once.
+        """
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, 0, 0, 0))
+            root = self._write_pages(file)
+            file.seek(0)
+            file.write(_HEADER.pack(_MAGIC, root, self.count, self.error_count))
+
+    def _write_pages(self, file):
+        """
+        Writes every page of this book, then the node pointing to them, and returns the
+        offset of the node.
+        :complexity: O(N + B), see save.
+        """
+        entries = bytearray(_ENTRY.size * len(ProcessingBook.LEGAL_CHARACTERS))
+        for page in range(len(self.pages)):
+            current = self.pages[page]
+            if current is None:
+                continue
+            if isinstance(current, tuple):
+                transaction, amount = current
+                offset = file.tell()
+                file.write(_pack_string(transaction.signature) + _pack_number(amount)
+                           + _pack_number(transaction.timestamp)
+                           + _pack_string(transaction.from_user) + _pack_string(transaction.to_user))
+                _ENTRY.pack_into(entries, page * _ENTRY.size, _LEAF, offset)
+            else:
+                _ENTRY.pack_into(entries, page * _ENTRY.size, _NODE, current._write_pages(file))
+
+        offset = file.tell()
+        file.write(entries)
+        return offset
+
+    def _draw(self, position, weighted, drawn=None):
+        """
+        Returns the (transaction, amount) pair found at position, where positions are laid
+        out page by page: a stored pair spans 1 (or its amount, if weighted) and a nested
+        book spans its count (or its amount_total, if weighted). What drawn records as
+        already taken from a page is left out of its span.
+        :raises ValueError: if weighted and a page visited spans a negative amount, or if
+            nothing is left to draw.
+        :complexity: O(D * P) where D is the depth of the pair found and P = 36 is the
+        number of pages, which is constant, so O(D).
+        """
+        book = self
+        while True:
+            taken = None if drawn is None else drawn.taken
+            last = None
+            found = None
+            for index in range(len(book.pages)):
+                page = book.pages[index]
+                if page is None:
+                    continue
+                if isinstance(page, tuple):
+                    width = page[1] if weighted else 1
+                else:
+                    width = page.amount_total if weighted else len(page)
+                if width < 0:
+                    raise ValueError("Weighted sampling needs amounts that are not negative.")
+                if taken is not None:
+                    width -= taken[index]
+                if width <= 0:
+                    continue
+                last = index
+                if position < width:
+                    found = index
+                    break
+                position -= width
+
+            if found is None:
+                # Only reachable through floating point rounding on the last weighted page.
+                found = last
+            if found is None:
+                raise ValueError("Not enough transactions left to sample from.")
+            page = book.pages[found]
+            if isinstance(page, tuple):
+                return page
+            book = page
+            drawn = None if drawn is None else drawn.below[found]
+
+    def _mark_drawn(self, drawn, pair, weighted):
+        """
+        Records in drawn, the _DrawnPages of this book, that pair was taken: its span comes
+        off the page leading to it in every book from this one down to the one holding it.
+        :complexity: O(D) where D is the depth of the pair.
+        """
+        transaction, amount = pair
+        signature = transaction.signature
+        width = amount if weighted else 1
+        book = self
+        level = self.level
+        while True:
+            index = book.page_index(signature[level])
+            drawn.taken[index] += width
+            page = book.pages[index]
+            if isinstance(page, tuple):
+                return
+            if drawn.below[index] is None:
+                drawn.below[index] = _DrawnPages(drawn.taken.typecode)
+            drawn = drawn.below[index]
+            book = page
+            level += 1
+
+    def sample(self, required_size, replace=False, seed=None, weighted=False):
         """
-        1054 Only - 1008/2085 welcome to attempt if you're up for a challenge, but no marks are allocated.
-        Analyse your time complexity of this method.
+        Returns an ArrayR of required_size transactions drawn at random from the book.
+
+        :param replace: Whether the same transaction can be drawn more than once.
+        :param seed: Seed for the random generator, the same seed on the same book gives
+            the same sample.
+        :param weighted: Draw each transaction with probability proportional to its
+            amount (amounts must be non-negative numbers) instead of uniformly.
+        :raises ValueError: if the book cannot provide required_size transactions, or if
+            weighted and an amount is negative or the book holds an amount that is not a
+            number (its amount_total is None).
+
+        Each draw picks a position in [0, count) (or [0, amount_total) when weighted) and
+        walks down the pages using the count (or amount_total) kept by every nested book,
+        so no transaction is ever visited unless it is returned.
+        Without replacement, the book is only read: every drawn pair is recorded against
+        the pages on its path in a _DrawnPages tree shaped like the books walked, and
+        later draws take that off the spans they walk through.
+
+        :complexity: O(K * D) where K is required_size and D is the depth of the deepest
+        page reached (at most the signature length, about log36(N) for random signatures
+        where N is the number of transactions). Each level scans at most 36 pages, which
+        is constant. The amounts are never touched beyond the pages visited.
         """
-        pass
+        if required_size < 0:
+            raise ValueError("Sample size cannot be negative.")
+        if not replace and required_size > len(self):
+            raise ValueError(f"Cannot sample {required_size} transactions without replacement from {len(self)}.")
+        if weighted and self.amount_total is None:
+            raise ValueError("Weighted sampling needs every amount to be a number.")
+
+        rng = random.Random(seed)
+        result = ArrayR(required_size)
+        total = self.amount_total if weighted else len(self)
+        drawn = None if replace else _DrawnPages("q" if isinstance(total, int) else "d")
+        for index in range(required_size):
+            if total <= 0:
+                raise ValueError("Not enough transactions left to sample from.")
+            if isinstance(total, int):
+                position = rng.randrange(total)
+            else:
+                position = rng.random() * total
+
+            pair = self._draw(position, weighted, drawn)
+            result[index] = pair[0]
+            if not replace:
+                self._mark_drawn(drawn, pair, weighted)
+                total -= pair[1] if weighted else 1
+
+        return result
+
+
+class FlatProcessingBook:
+    """
+    A ProcessingBook that keeps its whole page tree in flat integer arrays instead of one
+    ProcessingBook object and one ArrayR per level.
+
+    Every node owns PAGES consecutive integers in children: 0 is an empty page, a positive
+    value is the id of the nested node and a negative value -(leaf + 1) refers to the
+    (transaction, amount) pair stored at position leaf of leaves. Node 0 is the root.
+    node_counts holds how many transactions sit below each node, which is what the
+    collapse-on-delete rule needs. Signatures are mapped to page numbers through a
+    256 entry lookup table (one bytes.translate per operation) instead of a scan of
+    LEGAL_CHARACTERS per level.
+
+    Lookups, insertions, deletions and error counting behave like ProcessingBook. The one
+    exception is a signature that is a strict prefix of a stored one: the two cannot be
+    told apart by any page, so the insertion is counted as an error.
+    """
+    PAGES = len(ProcessingBook.LEGAL_CHARACTERS)
+    _EMPTY_NODE = array("i", (0,)) * len(ProcessingBook.LEGAL_CHARACTERS)
+
+    def __init__(self, capacity=1):
+        """
+        :param capacity: Number of nodes and transactions to allocate space for up front.
+        :complexity: O(capacity)
+        """
+        if capacity <= 0:
+            raise ValueError("Capacity should be larger than 0.")
+        self.children = FlatProcessingBook._EMPTY_NODE * capacity
+        self.node_counts = array("i", (0,)) * capacity
+        self._node_top = 1
+        self._free_nodes = array("i")
+
+        self.leaves = ArrayR(capacity)
+        self._leaf_top = 0
+        self._free_leaves = array("i")
+
+        self.error_count = 0
+        self._path = array("i")
+
+    def page_index(self, character):
+        """
+        Returns the index of the page for character.
+        :raises ValueError: if character is not one of LEGAL_CHARACTERS.
+        :complexity: O(1)
+        """
+        return _signature_pages(character)[0]
+
+    def get_error_count(self):
+        """
+        Returns the number of errors encountered while storing transactions.
+        """
+        return self.error_count
+
+    def __len__(self):
+        return self.node_counts[0]
+
+    def _allocate_node(self):
+        """
+        :complexity: O(1) amortised, the arrays double when full.
+        """
+        if len(self._free_nodes) > 0:
+            return self._free_nodes.pop()
+        if self._node_top == len(self.node_counts):
+            self.children.extend(FlatProcessingBook._EMPTY_NODE * len(self.node_counts))
+            self.node_counts.extend(array("i", (0,)) * len(self.node_counts))
+        node = self._node_top
+        self._node_top += 1
+        return node
+
+    def _release_node(self, node):
+        base = node * FlatProcessingBook.PAGES
+        self.children[base:base + FlatProcessingBook.PAGES] = FlatProcessingBook._EMPTY_NODE
+        self.node_counts[node] = 0
+        self._free_nodes.append(node)
+
+    def _allocate_leaf(self, transaction, amount):
+        """
+        Stores a (transaction, amount) pair in leaves and returns its page entry.
+        :complexity: O(1) amortised, leaves doubles when full.
+        """
+        if len(self._free_leaves) > 0:
+            leaf = self._free_leaves.pop()
+        else:
+            if self._leaf_top == len(self.leaves):
+                leaves = ArrayR(2 * len(self.leaves))
+                for index in range(self._leaf_top):
+                    leaves[index] = self.leaves[index]
+                self.leaves = leaves
+            leaf = self._leaf_top
+            self._leaf_top += 1
+        self.leaves[leaf] = (transaction, amount)
+        return -(leaf + 1)
+
+    def _release_leaf(self, leaf):
+        self.leaves[leaf] = None
+        self._free_leaves.append(leaf)
+
+    def __getitem__(self, transaction):
+        """
+        :complexity: O(L + D) where L is the signature length (translated to pages once)
+        and D is the depth of the page holding the transaction.
+        :raises KeyError: if the transaction is not in the book.
+        """
+        signature = transaction.signature
+        pages = _signature_pages(signature)
+        children = self.children
+        entry = children[pages[0]]
+        level = 1
+        while entry > 0:
+            entry = children[entry * FlatProcessingBook.PAGES + pages[level]]
+            level += 1
+        if entry < 0:
+            existing_transaction, amount = self.leaves[-entry - 1]
+            if existing_transaction.signature == signature:
+                return amount
+        raise KeyError(f"Transaction {signature} not found")
+
+    def __setitem__(self, transaction, amount):
+        """
+        Stores the amount of a transaction. Storing a different amount for a signature that
+        is already in the book counts as an error and keeps the original amount.
+        :complexity: O(L + D) where L is the signature length and D is the depth reached.
+        """
+        signature = transaction.signature
+        pages = _signature_pages(signature)
+        children = self.children
+        path = self._path
+        del path[:]
+        node = 0
+        level = 0
+        while True:
+            if len(signature) <= level:
+                self.error_count += 1
+                return
+            slot = node * FlatProcessingBook.PAGES + pages[level]
+            entry = children[slot]
+            path.append(node)
+            if entry > 0:
+                node = entry
+                level += 1
+                continue
+
+            if entry == 0:
+                children[slot] = self._allocate_leaf(transaction, amount)
+                break
+
+            existing_transaction, existing_amount = self.leaves[-entry - 1]
+            existing = existing_transaction.signature
+            if existing == signature:
+                if existing_amount != amount:
+                    self.error_count += 1
+                return
+            if existing.startswith(signature) or signature.startswith(existing):
+                self.error_count += 1
+                return
+
+            # Push both transactions down until their signatures land on different pages.
+            existing_pages = _signature_pages(existing)
+            new_entry = self._allocate_leaf(transaction, amount)
+            level += 1
+            while True:
+                nested = self._allocate_node()
+                children[slot] = nested
+                self.node_counts[nested] = 2
+                base = nested * FlatProcessingBook.PAGES
+                if existing_pages[level] != pages[level]:
+                    children[base + existing_pages[level]] = entry
+                    children[base + pages[level]] = new_entry
+                    break
+                slot = base + pages[level]
+                level += 1
+            break
+
+        node_counts = self.node_counts
+        for node in path:
+            node_counts[node] += 1
+
+    def __delitem__(self, transaction):
+        """
+        Removes a transaction. A nested level left with a single transaction is collapsed
+        into its parent's page, exactly like ProcessingBook.
+        :complexity: O(L + D) where L is the signature length and D is the depth of the
+        transaction's page. Each collapsed level costs an extra O(PAGES) scan.
+        :raises KeyError: if the transaction is not in the book.
+        """
+        signature = transaction.signature
+        pages = _signature_pages(signature)
+        children = self.children
+        path = self._path
+        del path[:]
+        slot = pages[0]
+        entry = children[slot]
+        path.append(slot)
+        level = 1
+        while entry > 0:
+            slot = entry * FlatProcessingBook.PAGES + pages[level]
+            entry = children[slot]
+            path.append(slot)
+            level += 1
+        if entry == 0 or self.leaves[-entry - 1][0].signature != signature:
+            raise KeyError(f"Transaction {signature} not found")
+
+        children[slot] = 0
+        self._release_leaf(-entry - 1)
+        node_counts = self.node_counts
+        for slot in path:
+            node_counts[slot // FlatProcessingBook.PAGES] -= 1
+
+        # path[depth] is the slot in the parent that points at the node owning path[depth + 1].
+        for depth in range(len(path) - 2, -1, -1):
+            nested = path[depth + 1] // FlatProcessingBook.PAGES
+            remaining = node_counts[nested]
+            if remaining > 1:
+                break
+            single = 0
+            if remaining == 1:
+                base = nested * FlatProcessingBook.PAGES
+                for page in range(FlatProcessingBook.PAGES):
+                    if children[base + page] != 0:
+                        single = children[base + page]
+                        break
+            children[path[depth]] = single
+            self._release_node(nested)
+
+
+class MappedProcessingBook:
+    """
+    A read-only ProcessingBook backed by a file written with ProcessingBook.save.
+
+    The file is memory-mapped and never parsed up front: a lookup follows the page
+    entries from the root node straight to the leaf it needs, so opening a book is
+    immediate and the operating system only loads the parts of the file that are used.
+    Several processes opening (or unpickling) the same file share one copy of it in the
+    page cache.
+    """
+
+    def __init__(self, path):
+        """
+        :raises ValueError: if path is not a saved ProcessingBook.
+        :complexity: O(1)
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            self._map.close()
+            raise ValueError(f"{path} is not a saved ProcessingBook.")
+        magic, self._root, self.count, self.error_count = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a saved ProcessingBook.")
+
+    def page_index(self, character):
+        return ProcessingBook.LEGAL_CHARACTERS.index(character)
+
+    def get_error_count(self):
+        """
+        Returns the number of errors the book had encountered when it was saved.
+        """
+        return self.error_count
+
+    def __len__(self):
+        return self.count
+
+    def _read_string(self, offset):
+        """
+        Returns the string stored at offset and the offset just past it.
+        :complexity: O(K) where K is the length of the string.
+        """
+        (length,) = _LENGTH.unpack_from(self._map, offset)
+        start = offset + _LENGTH.size
+        return self._map[start:start + length].decode("utf-8"), start + length
+
+    def _read_number(self, offset):
+        """
+        Returns the number stored at offset and the offset just past it.
+        :complexity: O(1)
+        """
+        if self._map[offset] == _INTEGER:
+            (value,) = _INTEGER_VALUE.unpack_from(self._map, offset + 1)
+        else:
+            (value,) = _REAL_VALUE.unpack_from(self._map, offset + 1)
+        return value, offset + 1 + _INTEGER_VALUE.size
+
+    def _read_transaction(self, offset):
+        """
+        Rebuilds the (transaction, amount) pair of the leaf at offset.
+        :complexity: O(K) where K is the total length of the stored strings.
+        """
+        signature, offset = self._read_string(offset)
+        amount, offset = self._read_number(offset)
+        timestamp, offset = self._read_number(offset)
+        from_user, offset = self._read_string(offset)
+        to_user, offset = self._read_string(offset)
+        transaction = Transaction(timestamp, from_user, to_user)
+        transaction.signature = signature
+        return transaction, amount
+
+    def __getitem__(self, transaction):
+        """
+        :complexity: O(D + L) where D is the depth of the page holding the transaction and
+        L is the length of its signature (compared once, at the leaf).
+        :raises KeyError: if the transaction is not in the book.
+        """
+        signature = transaction.signature
+        node = self._root
+        level = 0
+        while True:
+            tag, offset = _ENTRY.unpack_from(self._map, node + _ENTRY.size * self.page_index(signature[level]))
+            if tag == _NODE:
+                node = offset
+                level += 1
+                continue
+            if tag == _LEAF:
+                stored, offset = self._read_string(offset)
+                if stored == signature:
+                    return self._read_number(offset)[0]
+            raise KeyError(f"Transaction {signature} not found")
+
+    def __contains__(self, transaction):
+        try:
+            self[transaction]
+        except KeyError:
+            return False
+        return True
+
+    def items(self):
+        """
+        Yields every (transaction, amount) pair, in lexicographic order of signature.
+        :complexity: O(N + B) where N is the number of transactions and B the number of
+        nested books.
+        """
+        return self._items(self._root)
+
+    def _items(self, node):
+        for page in _LEXICOGRAPHIC_PAGES:
+            tag, offset = _ENTRY.unpack_from(self._map, node + _ENTRY.size * page)
+            if tag == _LEAF:
+                yield self._read_transaction(offset)
+            elif tag == _NODE:
+                yield from self._items(offset)
+
+    def __iter__(self):
+        for transaction, _ in self.items():
+            yield transaction
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __reduce__(self):
+        # Worker processes reopen the file instead of receiving a copy of it.
+        return MappedProcessingBook, (self.path,)
 
 
 if __name__ == "__main__":
@@ -1,7 +1,41 @@
+from array import array
+import asyncio
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+
 from data_structures.linked_stack import LinkedStack
 from data_structures.linked_queue import LinkedQueue
+from data_structures.linked_list import LinkedList
+from data_structures.hash_table_separate_chaining import HashTableSeparateChaining
+from data_structures.referential_array import ArrayR
+
+SIGNATURE_PRIME = 2**127 - 1
+SIGNATURE_BITS = 127
+SIGNATURE_BASE = 37
+SIGNATURE_LENGTH = 36
+BASE36_CHARACTERS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+# Every pair of base36 digits, so the encoder peels off two characters per divmod.
+_BASE36_PAIRS = tuple(first + second for first in BASE36_CHARACTERS for second in BASE36_CHARACTERS)
+_BASE36_PAIR_RADIX = len(_BASE36_PAIRS)
+
+
+def _count_pair_chunks(value):
+    chunks = 0
+    while value > 0:
+        value //= _BASE36_PAIR_RADIX
+        chunks += 1
+    return chunks
+
+
+# A reduced hash is always below SIGNATURE_PRIME, so only this many pairs can be non-zero.
+# The leading characters of every signature are therefore a constant run of zeros.
+_SIGNATURE_PAIR_CHUNKS = _count_pair_chunks(SIGNATURE_PRIME - 1)
+_SIGNATURE_ZERO_PREFIX = "0" * (SIGNATURE_LENGTH - 2 * _SIGNATURE_PAIR_CHUNKS)
 
 class Transaction:
+    __slots__ = ("timestamp", "from_user", "to_user", "signature")
+
     def __init__(self, timestamp, from_user, to_user):
         self.timestamp = timestamp
         self.from_user = from_user
@@ -45,6 +79,352 @@ class Transaction:
         
         self.signature = base36_string
 
+
+def _signature_hash(data_string):
+    """
+    Computes the same value as the hash loop in Transaction.sign.
+    The polynomial is accumulated without an intermediate modulo and reduced once at the end.
+    Because the modulus is the Mersenne prime 2^127 - 1, the reduction is a shift-and-add
+    instead of a big-integer division.
+    :complexity: O(N) where N is the length of data_string.
+    """
+    value = 0
+    for char in data_string:
+        value = value * SIGNATURE_BASE + ord(char)
+
+    while value >> SIGNATURE_BITS:
+        value = (value & SIGNATURE_PRIME) + (value >> SIGNATURE_BITS)
+    if value == SIGNATURE_PRIME:
+        value = 0
+    return value
+
+
+def _encode_signature(value):
+    """
+    Encodes a reduced hash as the 36 character base36 string produced by Transaction.sign.
+    The string is built in a single pass by looking up two digits per divmod.
+    :complexity: O(1), the signature length is constant.
+    """
+    encoded = ""
+    for _ in range(_SIGNATURE_PAIR_CHUNKS):
+        value, pair = divmod(value, _BASE36_PAIR_RADIX)
+        encoded = _BASE36_PAIRS[pair] + encoded
+    return _SIGNATURE_ZERO_PREFIX + encoded
+
+
+def _sign_data_string(data_string):
+    """
+    Returns the signature of a "timestamp-from_user-to_user" data string.
+    :complexity: O(N) where N is the length of data_string.
+    """
+    return _encode_signature(_signature_hash(data_string))
+
+
+def _sign_data_strings(data_strings):
+    """
+    Process pool entry point: signs a chunk of data strings.
+    Only strings cross the process boundary, so the transactions themselves are never pickled.
+    :complexity: O(T * N) where T is the number of data strings and N is the longest one.
+    """
+    return tuple(_sign_data_string(data_string) for data_string in data_strings)
+
+
+def _data_string(transaction):
+    return f"{transaction.timestamp}-{transaction.from_user}-{transaction.to_user}"
+
+
+def _as_array(items):
+    """
+    Returns items as something that can be indexed and measured.
+    Sized inputs (ArrayR, LinkedList, ...) are returned untouched, anything else is
+    drained into an ArrayR.
+    :complexity: O(N) where N is the number of items, O(1) for sized inputs.
+    """
+    if hasattr(items, "__len__"):
+        return items
+
+    collected = LinkedList()
+    for item in items:
+        collected.append(item)
+
+    array = ArrayR(len(collected))
+    for index, item in enumerate(collected):
+        array[index] = item
+    return array
+
+
+def sign_batch(transactions):
+    """
+    Signs every transaction in transactions and returns their signatures, in order, as an ArrayR.
+    The signatures are bit-identical to the ones produced by Transaction.sign.
+
+    :complexity: O(T * N) where T is the number of transactions and N is the length of
+    the longest data string. This is the same bound as calling sign on each transaction,
+    but the per-character modulo and the 36 string prepends are replaced by a single
+    Mersenne reduction and 13 table lookups per transaction.
+    """
+    transactions = _as_array(transactions)
+    signatures = ArrayR(len(transactions))
+
+    index = 0
+    for transaction in transactions:
+        signature = _sign_data_string(_data_string(transaction))
+        transaction.signature = signature
+        signatures[index] = signature
+        index += 1
+
+    return signatures
+
+
+class TransactionBatch:
+    """
+    Column-oriented storage for a large number of transactions.
+
+    Timestamps are stored in an array of 64-bit integers, user names are interned once and
+    referenced by integer id, and signatures share a single bytearray of fixed
+    SIGNATURE_LENGTH-byte slots (all zero bytes for an unsigned row). A row only becomes a
+    Transaction object when it is indexed or iterated, so a batch can be handed to anything
+    that reads transactions sequentially: ProcessingLine.add_transaction, ProcessingBook
+    and FraudDetection all accept its rows.
+
+    Those Transaction objects are copies: signing one, e.g. while it passes through a
+    ProcessingLine, leaves the batch unsigned. Sign the batch itself with sign, or write a
+    row back with batch[index] = transaction.
+
+    Scans that only need to compare signatures, like rows_starting_with, search the
+    signature column's bytes directly. signatures builds a str for every row, so it costs
+    more than reading the signature of Transaction objects that already exist.
+
+    Timestamps must be integers and signatures must be SIGNATURE_LENGTH ASCII characters.
+    """
+    SCAN_ROWS = 4096
+    _UNSIGNED = bytes(SIGNATURE_LENGTH)
+
+    def __init__(self, capacity=1):
+        """
+        capacity is the number of distinct user names expected; more can be added.
+        :complexity: O(capacity) to allocate the user name array and its index.
+        """
+        if capacity <= 0:
+            raise ValueError("Capacity should be larger than 0.")
+        self._timestamps = array("q")
+        self._from_ids = array("I")
+        self._to_ids = array("I")
+        self._signatures = bytearray()
+        # A chaining table keeps growing with the number of users, where the default
+        # LinearProbeTable sizes stop at about 1.5 million slots.
+        self._user_ids = HashTableSeparateChaining(expected_count=capacity)
+        self._users = ArrayR(capacity)
+        self._user_count = 0
+
+    @classmethod
+    def from_transactions(cls, transactions):
+        """
+        Builds a batch holding a copy of every transaction in transactions.
+        :complexity: See extend.
+        """
+        batch = cls()
+        batch.extend(transactions)
+        return batch
+
+    def _intern(self, user):
+        """
+        Returns the integer id of a user name, assigning the next free id to new names.
+        :complexity: O(K) on average where K is the length of the name (for hashing).
+        """
+        try:
+            return self._user_ids[user]
+        except KeyError:
+            pass
+
+        if self._user_count == len(self._users):
+            users = ArrayR(2 * len(self._users))
+            for index in range(self._user_count):
+                users[index] = self._users[index]
+            self._users = users
+
+        user_id = self._user_count
+        self._users[user_id] = user
+        self._user_ids[user] = user_id
+        self._user_count += 1
+        return user_id
+
+    def append(self, transaction):
+        """
+        Stores a copy of transaction as the last row of the batch.
+        :raises ValueError: if the signature is not SIGNATURE_LENGTH ASCII characters.
+        :complexity: O(K) on average where K is the length of the user names (for interning).
+        """
+        encoded = TransactionBatch._encode_signature(transaction.signature)
+        self._timestamps.append(transaction.timestamp)
+        self._from_ids.append(self._intern(transaction.from_user))
+        self._to_ids.append(self._intern(transaction.to_user))
+        self._signatures += encoded
+
+    @staticmethod
+    def _encode_signature(signature):
+        """
+        Returns the bytes stored for signature, all zero bytes for None.
+        :raises ValueError: if the signature is not SIGNATURE_LENGTH ASCII characters.
+        :complexity: O(1), as signatures have a fixed length.
+        """
+        if signature is None:
+            return TransactionBatch._UNSIGNED
+        encoded = signature.encode("ascii")
+        if len(encoded) != SIGNATURE_LENGTH:
+            raise ValueError(f"Signature should have {SIGNATURE_LENGTH} characters: {signature}")
+        return encoded
+
+    def extend(self, transactions):
+        """
+        Appends every transaction in transactions.
+        :complexity: O(T * K) where T is the number of transactions, see append.
+        """
+        for transaction in transactions:
+            self.append(transaction)
+
+    def timestamp_at(self, index):
+        return self._timestamps[index]
+
+    def from_user_at(self, index):
+        return self._users[self._from_ids[index]]
+
+    def to_user_at(self, index):
+        return self._users[self._to_ids[index]]
+
+    def signature_at(self, index):
+        """
+        Returns the signature stored in row index, or None if the row is unsigned.
+        :complexity: O(1)
+        """
+        if index < 0:
+            index += len(self)
+        start = index * SIGNATURE_LENGTH
+        encoded = self._signatures[start:start + SIGNATURE_LENGTH]
+        if len(encoded) != SIGNATURE_LENGTH:
+            raise IndexError("Out of bounds access in batch.")
+        if encoded == TransactionBatch._UNSIGNED:
+            return None
+        return encoded.decode("ascii")
+
+    def signatures(self):
+        """
+        Yields the signature of every row, in order, without building Transaction objects.
+        The signature column is decoded SCAN_ROWS rows at a time rather than row by row.
+        :complexity: O(T) where T is the number of rows.
+        """
+        unsigned = TransactionBatch._UNSIGNED.decode("ascii")
+        chunk_bytes = TransactionBatch.SCAN_ROWS * SIGNATURE_LENGTH
+        for chunk_start in range(0, len(self._signatures), chunk_bytes):
+            chunk = self._signatures[chunk_start:chunk_start + chunk_bytes].decode("ascii")
+            for start in range(0, len(chunk), SIGNATURE_LENGTH):
+                signature = chunk[start:start + SIGNATURE_LENGTH]
+                yield None if signature == unsigned else signature
+
+    def rows_starting_with(self, prefix):
+        """
+        Yields, in order, the index of every signed row whose signature starts with prefix.
+        The prefix is searched for in the signature column with bytearray.find, and only
+        matches starting on a row boundary are kept, so no row is decoded or copied.
+        :complexity: O(T * L) byte comparisons in C, where T is the number of rows and L the
+        signature length, plus O(1) Python work per match found.
+        """
+        encoded = prefix.encode("ascii")
+        if len(encoded) > SIGNATURE_LENGTH:
+            return
+        if not encoded:
+            for index in range(len(self)):
+                if self.signature_at(index) is not None:
+                    yield index
+            return
+
+        column = self._signatures
+        position = column.find(encoded)
+        while position != -1:
+            row, offset = divmod(position, SIGNATURE_LENGTH)
+            if offset == 0:
+                yield row
+            position = column.find(encoded, (row + 1) * SIGNATURE_LENGTH)
+
+    def sign(self):
+        """
+        Signs every row in place. The signatures are identical to Transaction.sign.
+        :complexity: O(T * N) where T is the number of rows and N is the longest data string.
+        """
+        users = self._users
+        for index in range(len(self)):
+            data_string = f"{self._timestamps[index]}-{users[self._from_ids[index]]}-{users[self._to_ids[index]]}"
+            start = index * SIGNATURE_LENGTH
+            self._signatures[start:start + SIGNATURE_LENGTH] = _sign_data_string(data_string).encode("ascii")
+
+    def __len__(self):
+        return len(self._timestamps)
+
+    def __getitem__(self, index):
+        """
+        Returns row index as a new Transaction object. Changing it does not change the batch,
+        see __setitem__.
+        :complexity: O(1)
+        """
+        transaction = Transaction(self._timestamps[index], self.from_user_at(index), self.to_user_at(index))
+        transaction.signature = self.signature_at(index)
+        return transaction
+
+    def __setitem__(self, index, transaction):
+        """
+        Overwrites row index with a copy of transaction, e.g. to write back a row signed
+        after it was read out of the batch.
+        :raises ValueError: if the signature is not SIGNATURE_LENGTH ASCII characters.
+        :raises IndexError: if there is no row index.
+        :complexity: O(K) on average where K is the length of the user names (for interning).
+        """
+        encoded = TransactionBatch._encode_signature(transaction.signature)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Out of bounds access in batch.")
+
+        self._timestamps[index] = transaction.timestamp
+        self._from_ids[index] = self._intern(transaction.from_user)
+        self._to_ids[index] = self._intern(transaction.to_user)
+        start = index * SIGNATURE_LENGTH
+        self._signatures[start:start + SIGNATURE_LENGTH] = encoded
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+def _sign_in_workers(transactions, workers, chunk_size=None):
+    """
+    Signs every transaction in the ArrayR transactions, in place.
+    With workers > 1 the data strings are sent, in consecutive chunks of chunk_size (by
+    default, each worker gets ProcessingLine.DEFAULT_CHUNKS_PER_WORKER chunks), to a pool of
+    that many processes and the signatures are written back in order.
+    :complexity: O(T * N) total work where T is the number of transactions and N is the
+    length of the longest data string, spread over the given number of workers.
+    """
+    if workers == 1 or len(transactions) <= 1:
+        sign_batch(transactions)
+        return
+
+    if chunk_size is None:
+        chunks = workers * ProcessingLine.DEFAULT_CHUNKS_PER_WORKER
+        chunk_size = (len(transactions) + chunks - 1) // chunks
+    chunk_size = max(1, chunk_size)
+
+    chunks = (
+        tuple(_data_string(transactions[i]) for i in range(start, min(start + chunk_size, len(transactions))))
+        for start in range(0, len(transactions), chunk_size)
+    )
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        index = 0
+        for signatures in executor.map(_sign_data_strings, chunks):
+            for signature in signatures:
+                transactions[index].signature = signature
+                index += 1
+
+
 class _ProcessingLineIterator:
     def __init__(self, processing_line):
         self.processing_line = processing_line
@@ -73,17 +453,23 @@ class _ProcessingLineIterator:
         raise StopIteration
 
 class ProcessingLine:
-    def __init__(self, critical_transaction):
+    DEFAULT_CHUNKS_PER_WORKER = 4
+
+    def __init__(self, critical_transaction, queue_type=LinkedQueue, stack_type=LinkedStack):
         """
+        queue_type and stack_type are the Queue and Stack classes holding the transactions
+        before and after the critical one. The linked ones allocate a node per transaction;
+        ArrayQueue and ArrayStack keep them in arrays, which suits lines holding millions.
+
         :complexity: Best case is O(1) and worst case is O(1).
         The constructor only assigns references to a few instance variables
-        and creates empty LinkedQueue and LinkedStack objects.  
+        and creates an empty queue and stack.
         All these operations, such as, assigning attributes, creating empty data
         structures, take constant time regardless of the size of any input.
         """
         self.critical_transaction = critical_transaction
-        self._before_queue = LinkedQueue()
-        self._after_stack = LinkedStack()
+        self._before_queue = queue_type()
+        self._after_stack = stack_type()
         self._locked = False
         self._iterator_active = False
         
@@ -95,13 +481,60 @@ class ProcessingLine:
         self._iterator_active = True
         return _ProcessingLineIterator(self)
 
+    def drain(self, workers=1, chunk_size=None):
+        """
+        Empties the line and returns its transactions, signed, as an ArrayR in the order the
+        iterator would have produced them: the before queue (FIFO), the critical transaction,
+        then the after stack (LIFO). Like iterating, this locks the line.
+
+        With workers > 1 the signatures are computed in a pool of that many processes. The
+        transactions are split into consecutive chunks of chunk_size (by default, each worker
+        gets DEFAULT_CHUNKS_PER_WORKER chunks) and only their data strings are sent to the
+        pool, so the emission order is fixed before any signing starts.
+
+        :complexity: O(T * N) total work where T is the number of transactions and N is the
+        length of the longest data string, spread over the given number of workers.
+        Collecting the emission order is O(T).
+        """
+        if self._locked:
+            raise RuntimeError("Processing line is locked.")
+        if workers < 1:
+            raise ValueError("workers should be at least 1.")
+
+        ordered = self._take_ordered()
+        _sign_in_workers(ordered, workers, chunk_size)
+        return ordered
+
+    def _take_ordered(self):
+        """
+        Locks the line and empties it into an ArrayR, in the order the iterator would have
+        produced the transactions, without signing them.
+        :complexity: O(T) where T is the number of transactions.
+        """
+        if self._locked:
+            raise RuntimeError("Processing line is locked.")
+        self._locked = True
+        self._iterator_active = True
+
+        ordered = ArrayR(len(self._before_queue) + 1 + len(self._after_stack))
+        index = 0
+        while not self._before_queue.is_empty():
+            ordered[index] = self._before_queue.serve()
+            index += 1
+        ordered[index] = self.critical_transaction
+        index += 1
+        while not self._after_stack.is_empty():
+            ordered[index] = self._after_stack.pop()
+            index += 1
+        return ordered
+
 
     def add_transaction(self, transaction):
         """
         :complexity: Best case is O(1) and worst case is O(1). This method performs, 
         a O(1) check of the _locked flag, a O(1) comparison of two timestamps, 
-        and appending to a LinkedQueue or pushing to a LinkedStack with a time 
-        complexity of O(1). Therefore, the entire method runs in constant 
+        and appending to the queue or pushing to the stack with an (amortised)
+        time complexity of O(1). Therefore, the entire method runs in constant 
         time in all cases.
         """
         if self._locked:
@@ -112,6 +545,341 @@ class ProcessingLine:
         else:
             self._after_stack.push(transaction)
 
+    def add_transactions(self, transactions, presorted=False):
+        """
+        Adds every transaction in transactions, in order, as add_transaction would.
+        The line is checked for a lock once, and the batch is split in a single pass: the
+        transactions going before the critical one are streamed into the queue with one
+        extend, which a linked queue builds into a chain of nodes and splices on in whole,
+        while the rest are pushed onto the stack as they are met.
+        The queue only takes its share once transactions has run out. If transactions raises
+        part way, the queue is left unchanged and the pushes made so far are popped again,
+        so the line is left as it was.
+
+        With presorted=True the caller promises the transactions are in nondecreasing
+        timestamp order, so they split at the first one after the critical transaction: it
+        and everything following go onto the stack with one extend, without comparisons.
+        This is not checked.
+
+        :complexity: O(T) where T is the number of transactions.
+        """
+        if self._locked:
+            raise RuntimeError("Processing line is locked.")
+
+        critical = self.critical_transaction.timestamp
+        after_stack = self._after_stack
+        if presorted:
+            def before_items():
+                remaining = iter(transactions)
+                for transaction in remaining:
+                    if transaction.timestamp > critical:
+                        after_stack.push(transaction)
+                        try:
+                            after_stack.extend(remaining)
+                        except BaseException:
+                            after_stack.pop()
+                            raise
+                        return
+                    yield transaction
+
+            self._before_queue.extend(before_items())
+            return
+
+        push_after = after_stack.push
+        pushed_from = len(after_stack)
+
+        def before_items():
+            for transaction in transactions:
+                if transaction.timestamp <= critical:
+                    yield transaction
+                else:
+                    push_after(transaction)
+
+        try:
+            self._before_queue.extend(before_items())
+        except BaseException:
+            while len(after_stack) > pushed_from:
+                after_stack.pop()
+            raise
+
+class AsyncProcessingLine(ProcessingLine):
+    """
+    A ProcessingLine for asyncio code: producers await add and consumers use async for,
+    both while the line is open, and the signing happens in an executor so the event loop
+    never runs Transaction signing itself.
+
+    Transactions for the before queue are handed to the consumer as they arrive, in FIFO
+    order. When max_pending of them are waiting, add blocks until the consumer catches up.
+    The critical transaction and the after stack follow once close has been awaited, since
+    the last transaction pushed comes out first; the after stack is not bounded.
+
+    The consumer takes up to batch_size waiting transactions at a time and sends only their
+    data strings to the executor (the loop's default one when None), so both thread and
+    process pools work. Starting to consume locks the line for iteration and drain, as
+    iterating a ProcessingLine does; add keeps working until close.
+
+    Transactions only come in through add, which applies the backpressure and wakes the
+    consumer, so add_transaction and add_transactions raise RuntimeError. close only stops
+    add: a line closed before anyone consumed it can still be drained or iterated.
+    """
+    DEFAULT_MAX_PENDING = 10_000
+    DEFAULT_BATCH_SIZE = 256
+
+    def __init__(self, critical_transaction, max_pending=DEFAULT_MAX_PENDING, batch_size=DEFAULT_BATCH_SIZE,
+                 executor=None, queue_type=LinkedQueue, stack_type=LinkedStack):
+        """
+        :complexity: O(1), as for ProcessingLine.
+        """
+        if max_pending < 1 or batch_size < 1:
+            raise ValueError("max_pending and batch_size should be at least 1.")
+        super().__init__(critical_transaction, queue_type, stack_type)
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self._executor = executor
+        self._changed = asyncio.Condition()
+        self._closed = False
+        self._consuming = False
+
+    def add_transaction(self, transaction):
+        """
+        :raises RuntimeError: always, use add.
+        """
+        raise RuntimeError("Use await add(transaction) to add to an AsyncProcessingLine.")
+
+    def add_transactions(self, transactions, presorted=False):
+        """
+        :raises RuntimeError: always, use add.
+        """
+        raise RuntimeError("Use await add(transaction) to add to an AsyncProcessingLine.")
+
+    async def add(self, transaction):
+        """
+        Adds transaction as add_transaction would, first waiting while max_pending
+        transactions are queued before the critical one.
+        :raises RuntimeError: if the line has been closed, or drained or iterated without
+            async for.
+        :complexity: O(1) once there is room.
+        """
+        async with self._changed:
+            if self._closed:
+                raise RuntimeError("Processing line is closed.")
+            if self._locked and not self._consuming:
+                raise RuntimeError("Processing line is locked.")
+            if transaction.timestamp > self.critical_transaction.timestamp:
+                self._after_stack.push(transaction)
+                return
+            await self._changed.wait_for(lambda: self._closed or len(self._before_queue) < self.max_pending)
+            if self._closed:
+                raise RuntimeError("Processing line is closed.")
+            self._before_queue.append(transaction)
+            self._changed.notify_all()
+
+    async def close(self):
+        """
+        Marks the end of the transactions: later adds raise RuntimeError, and the consumer
+        moves on to the critical transaction and the after stack once the queue is empty.
+        The line is not locked by closing it, see the class docstring.
+        """
+        async with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+
+    def __aiter__(self):
+        if self._iterator_active:
+            raise RuntimeError("Processing line is locked.")
+        self._locked = True
+        self._iterator_active = True
+        self._consuming = True
+        return self.__signed_transactions()
+
+    async def __signed_transactions(self):
+        """
+        Yields the transactions in the order iterating the line would, each signed.
+        :complexity: O(T * N) where T is the number of transactions and N is the length of
+        the longest data string, all of it in the executor.
+        """
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: self._closed or not self._before_queue.is_empty())
+                if self._before_queue.is_empty():
+                    break
+                batch = ArrayR(min(len(self._before_queue), self.batch_size))
+                for index in range(len(batch)):
+                    batch[index] = self._before_queue.serve()
+                self._changed.notify_all()
+
+            await self.__sign(batch)
+            for transaction in batch:
+                yield transaction
+
+        # Closed, so the after stack no longer changes
+        batch = ArrayR(min(len(self._after_stack) + 1, self.batch_size))
+        batch[0] = self.critical_transaction
+        start = 1
+        while len(batch) > 0:
+            for index in range(start, len(batch)):
+                batch[index] = self._after_stack.pop()
+
+            await self.__sign(batch)
+            for transaction in batch:
+                yield transaction
+            batch = ArrayR(min(len(self._after_stack), self.batch_size))
+            start = 0
+
+    async def __sign(self, batch):
+        """
+        Signs the transactions in the ArrayR batch in the executor.
+        """
+        data_strings = tuple(_data_string(batch[index]) for index in range(len(batch)))
+        signatures = await asyncio.get_running_loop().run_in_executor(self._executor, _sign_data_strings, data_strings)
+        for index in range(len(batch)):
+            batch[index].signature = signatures[index]
+
+
+class ProcessingLinePool:
+    """
+    Many processing lines, one per critical transaction, fed from a single stream.
+
+    The lines are kept in order of their critical timestamps, next to a sorted ArrayR of
+    those timestamps. A transaction goes to the line with the latest critical timestamp at or
+    before its own, found by binary search, so it lands in that line's after stack (or its
+    before queue on a tie); transactions earlier than every critical one go to the before
+    queue of the first line. Among lines with equal critical timestamps the one added last
+    receives.
+
+    Draining locks every line and the pool, and signs the transactions of all lines together,
+    so a pool of worker processes is shared across lines rather than started for each one.
+    """
+
+    def __init__(self, critical_transactions=(), queue_type=LinkedQueue, stack_type=LinkedStack):
+        """
+        :param critical_transactions: critical transactions to start a line for, in any order.
+        :param queue_type: the Queue class for the before queue of every line.
+        :param stack_type: the Stack class for the after stack of every line.
+        :complexity: O(L^2) worst case for L critical transactions, see add_line.
+        """
+        self._queue_type = queue_type
+        self._stack_type = stack_type
+        self._timestamps = ArrayR(1)
+        self._lines = ArrayR(1)
+        self._count = 0
+        self._locked = False
+        for critical_transaction in critical_transactions:
+            self.add_line(critical_transaction)
+
+    def add_line(self, critical_transaction):
+        """
+        Starts a line around critical_transaction and returns it.
+        :complexity: O(log L) to find its place and O(L) to shift the later lines along,
+        where L is the number of lines. Adding in increasing timestamp order shifts nothing.
+        """
+        if self._locked:
+            raise RuntimeError("Processing line pool is locked.")
+
+        if self._count == len(self._lines):
+            timestamps = ArrayR(2 * self._count)
+            lines = ArrayR(2 * self._count)
+            for index in range(self._count):
+                timestamps[index] = self._timestamps[index]
+                lines[index] = self._lines[index]
+            self._timestamps = timestamps
+            self._lines = lines
+
+        timestamp = critical_transaction.timestamp
+        position = bisect_right(self._timestamps, timestamp, 0, self._count)
+        for index in range(self._count, position, -1):
+            self._timestamps[index] = self._timestamps[index - 1]
+            self._lines[index] = self._lines[index - 1]
+
+        line = ProcessingLine(critical_transaction, self._queue_type, self._stack_type)
+        self._timestamps[position] = timestamp
+        self._lines[position] = line
+        self._count += 1
+        return line
+
+    def line_for(self, timestamp):
+        """
+        Returns the line a transaction with this timestamp goes to.
+        :raises ValueError: if the pool has no lines.
+        :complexity: O(log L) where L is the number of lines.
+        """
+        if self._count == 0:
+            raise ValueError("Processing line pool has no lines.")
+        return self._lines[max(bisect_right(self._timestamps, timestamp, 0, self._count) - 1, 0)]
+
+    def add_transaction(self, transaction):
+        """
+        Adds transaction to the line it belongs to.
+        :complexity: O(log L) where L is the number of lines.
+        """
+        if self._locked:
+            raise RuntimeError("Processing line pool is locked.")
+        self.line_for(transaction.timestamp).add_transaction(transaction)
+
+    def add_transactions(self, transactions):
+        """
+        Adds every transaction in transactions, in order, to the line it belongs to.
+        :complexity: O(T log L) where T is the number of transactions and L the number of lines.
+        """
+        if self._locked:
+            raise RuntimeError("Processing line pool is locked.")
+        if self._count == 0:
+            raise ValueError("Processing line pool has no lines.")
+
+        timestamps = self._timestamps
+        lines = self._lines
+        count = self._count
+        for transaction in transactions:
+            position = bisect_right(timestamps, transaction.timestamp, 0, count) - 1
+            lines[max(position, 0)].add_transaction(transaction)
+
+    def drain(self, workers=1, chunk_size=None):
+        """
+        Empties every line and returns an ArrayR with, for each line in critical timestamp
+        order, the ArrayR its drain would have returned. This locks the pool and every line.
+
+        The transactions of all lines are signed as one batch; with workers > 1 that batch is
+        split into chunks for a pool of worker processes as in ProcessingLine.drain.
+        :raises RuntimeError: if the pool or any of its lines is locked, before any line is
+            drained.
+        :complexity: O(T * N) total work where T is the number of transactions, including the
+        critical ones, and N is the length of the longest data string, spread over the given
+        number of workers.
+        """
+        if self._locked:
+            raise RuntimeError("Processing line pool is locked.")
+        if workers < 1:
+            raise ValueError("workers should be at least 1.")
+        for index in range(self._count):
+            if self._lines[index]._locked:
+                raise RuntimeError("Processing line is locked.")
+        self._locked = True
+
+        drained = ArrayR(self._count)
+        total = 0
+        for index in range(self._count):
+            drained[index] = self._lines[index]._take_ordered()
+            total += len(drained[index])
+
+        transactions = ArrayR(total)
+        position = 0
+        for index in range(self._count):
+            for transaction in drained[index]:
+                transactions[position] = transaction
+                position += 1
+        _sign_in_workers(transactions, workers, chunk_size)
+        return drained
+
+    def __len__(self):
+        """ Returns the number of lines. """
+        return self._count
+
+    def __getitem__(self, index):
+        """ Returns the line at index, in critical timestamp order. """
+        if not -self._count <= index < self._count:
+            raise IndexError("Line index out of range.")
+        return self._lines[index % self._count]
+
 if __name__ == "__main__":
     # Write tests for your code here...
     # We are not grading your tests, but we will grade your code with our own tests!
@@ -0,0 +1,363 @@
+from unittest import TestCase
+import random
+
+from data_structures import DoubleHashingTable, HashTableSeparateChaining, LinearProbeTable, QuadraticProbeTable
+from data_structures import ArrayQueue, ArrayStack, LinkedList, LinkedQueue, LinkedStack, NodePool, RobinHoodProbeTable
+from data_structures.node import Node
+
+
+def random_keys(rng, count, length=None):
+    keys = []
+    for _ in range(count):
+        key_length = rng.randint(0, 12) if length is None else length
+        keys.append("".join(chr(rng.randrange(32, 0x3000)) for _ in range(key_length)))
+    return keys
+
+
+class LengthProbeTable(LinearProbeTable):
+    def hash(self, key):
+        return len(key) % self.table_size
+
+
+class LengthChainingTable(HashTableSeparateChaining):
+    def hash(self, key):
+        return len(key) % self.table_size
+
+
+class LengthRobinHoodTable(RobinHoodProbeTable):
+    def hash(self, key):
+        return len(key) % self.table_size
+
+
+class TestHashTables(TestCase):
+    def test_hash_many_matches_hash(self):
+        """
+        #name(Test batch hashing gives the same values as hash)
+        """
+        rng = random.Random(0)
+        tables = [
+            LinearProbeTable(),
+            LinearProbeTable(sizes=[1572869]),
+            LinearProbeTable(hash_base=7),
+            HashTableSeparateChaining(),
+            HashTableSeparateChaining(100003),
+            LengthProbeTable(),
+            LengthChainingTable(),
+        ]
+        for keys in (random_keys(rng, 200), random_keys(rng, 200, length=36), []):
+            for table in tables:
+                hashes = table.hash_many(iter(keys))
+                self.assertEqual(len(hashes), len(keys))
+                for index, key in enumerate(keys):
+                    self.assertEqual(hashes[index], table.hash(key))
+
+    def test_linear_probe_bulk_update(self):
+        """
+        #name(Test bulk updates store the same items as repeated inserts)
+        """
+        rng = random.Random(1)
+        keys = random_keys(rng, 300)
+        pairs = [(key, index) for index, key in enumerate(keys)] + [(keys[3], "again"), (keys[7], "again")]
+
+        inserted = LinearProbeTable()
+        for key, value in pairs:
+            inserted[key] = value
+        loaded = LinearProbeTable.from_items(iter(pairs))
+
+        self.assertEqual(len(loaded), len(inserted))
+        self.assertEqual(loaded.table_size, inserted.table_size)
+        for key in keys:
+            self.assertEqual(loaded[key], inserted[key])
+
+        # Updating a filled table grows it once and keeps what was there
+        loaded.update((str(index), index) for index in range(1000))
+        self.assertEqual(len(loaded), len(inserted) + 1000)
+        self.assertEqual(loaded[keys[3]], "again")
+        self.assertEqual(loaded["999"], 999)
+        self.assertLessEqual(len(loaded), loaded.table_size / 2)
+
+    def test_linear_probe_overridden_hash(self):
+        """
+        #name(Test growing and bulk loading keep keys placed by an overridden hash)
+        """
+        keys = ["k" * length + str(index) for index in range(4) for length in range(1, 6)]
+        inserted = LengthProbeTable()
+        for index, key in enumerate(keys):
+            inserted[key] = index
+        loaded = LengthProbeTable.from_items((key, index) for index, key in enumerate(keys))
+        loaded.update(("x" * index, -index) for index in range(30))
+        deleted = LengthProbeTable(tombstones=True)
+        deleted.update((key, index) for index, key in enumerate(keys))
+        for key in keys[:10]:
+            del deleted[key]
+        deleted["new"] = 1
+
+        for index, key in enumerate(keys):
+            self.assertEqual(inserted[key], index)
+            self.assertEqual(loaded[key], index)
+            self.assertEqual(key in deleted, index >= 10)
+        self.assertEqual(loaded["x" * 29], -29)
+
+    def test_linear_probe_tombstones(self):
+        """
+        #name(Test tombstone deletion keeps lookups working and compacts itself)
+        """
+        table = LinearProbeTable(tombstones=True)
+        for index in range(100):
+            table[str(index)] = index
+        for index in range(0, 100, 2):
+            del table[str(index)]
+
+        self.assertEqual(len(table), 50)
+        self.assertLessEqual(table.tombstone_count, table.table_size * LinearProbeTable.TOMBSTONE_COMPACTION_LOAD)
+        for index in range(100):
+            self.assertEqual(str(index) in table, index % 2 == 1)
+        self.assertRaises(KeyError, table.__delitem__, "0")
+
+        # Reinserting reuses tombstone slots rather than growing the table
+        size = table.table_size
+        for index in range(0, 100, 2):
+            table[str(index)] = -index
+        self.assertEqual(table.table_size, size)
+        self.assertEqual(table["4"], -4)
+        self.assertEqual(len(table.items()), 100)
+
+    def test_robin_hood_table(self):
+        """
+        #name(Test the Robin Hood table stores, updates and deletes like a map)
+        """
+        rng = random.Random(2)
+        table = RobinHoodProbeTable()
+        expected = {}
+        for step in range(3000):
+            key = str(rng.randrange(500))
+            if rng.random() < 0.3 and key in expected:
+                del table[key]
+                del expected[key]
+            else:
+                table[key] = step
+                expected[key] = step
+
+        self.assertEqual(len(table), len(expected))
+        for key, value in expected.items():
+            self.assertEqual(table[key], value)
+        for key in ("missing", "-1", "500"):
+            self.assertNotIn(key, table)
+        self.assertRaises(KeyError, table.__delitem__, "missing")
+        self.assertEqual(sorted(table.keys().to_list()), sorted(expected))
+        self.assertGreaterEqual(table.max_probe_length, table.mean_probe_length)
+        self.assertEqual(table.hash("abc"), LinearProbeTable(sizes=[table.table_size]).hash("abc"))
+
+        # A subclass with its own hash keeps its keys as the table grows
+        table = LengthRobinHoodTable()
+        keys = ["k" * length + str(index) for index in range(4) for length in range(1, 11)]
+        for index, key in enumerate(keys):
+            table[key] = index
+        for index, key in enumerate(keys):
+            self.assertEqual(table[key], index)
+
+    def test_probe_sequences(self):
+        """
+        #name(Test quadratic and double hashing tables follow their own probe sequences)
+        """
+        # Keys sharing a home slot in a table of 29 slots
+        probe = LinearProbeTable(sizes=[29])
+        home = probe.hash("k0")
+        colliding = [key for key in (f"k{index}" for index in range(2000)) if probe.hash(key) == home][:3]
+
+        quadratic = QuadraticProbeTable(sizes=[29])
+        double = DoubleHashingTable(sizes=[29])
+        for key in colliding:
+            quadratic[key] = key
+            double[key] = key
+
+        slots = quadratic._LinearProbeTable__array
+        self.assertEqual([slots[(home + offset) % 29][0] for offset in (0, 1, 4)], colliding)
+        slots = double._LinearProbeTable__array
+        self.assertEqual(slots[(home + double.hash2(colliding[1])) % 29][0], colliding[1])
+
+        # Deleting leaves a tombstone, so the keys probed past it are still found
+        for table in (quadratic, double):
+            del table[colliding[0]]
+            self.assertEqual(table.tombstone_count, 1)
+            self.assertEqual(table[colliding[2]], colliding[2])
+            self.assertNotIn(colliding[0], table)
+
+    def test_separate_chaining_resizing(self):
+        """
+        #name(Test the chaining table grows through its sizes and keeps every item)
+        """
+        table = HashTableSeparateChaining()
+        for index in range(1000):
+            table[str(index)] = index
+        self.assertEqual(len(table), 1000)
+        self.assertIn(table.table_size, HashTableSeparateChaining.TABLE_SIZES)
+        self.assertLessEqual(len(table), table.table_size * table.max_load_factor)
+        for index in range(1000):
+            self.assertEqual(table[str(index)], index)
+        del table["10"]
+        self.assertNotIn("10", table)
+        self.assertEqual(len(table.items()), 999)
+
+        # Presized tables never grow, and tables without a load factor keep their size
+        presized = HashTableSeparateChaining(expected_count=1000)
+        size = presized.table_size
+        for index in range(1000):
+            presized[str(index)] = index
+        self.assertEqual(presized.table_size, size)
+        fixed = HashTableSeparateChaining(max_load_factor=None)
+        for index in range(100):
+            fixed[str(index)] = index
+        self.assertEqual(fixed.table_size, HashTableSeparateChaining.DEFAULT_TABLE_SIZE)
+        self.assertEqual(fixed["99"], 99)
+        self.assertRaises(ValueError, HashTableSeparateChaining, 17, 0)
+
+    def test_separate_chaining_overridden_hash(self):
+        """
+        #name(Test a chaining table with its own hash keeps every key as it grows)
+        """
+        table = LengthChainingTable()
+        keys = ["k" * length + str(index) for index in range(10) for length in range(1, 21)]
+        for index, key in enumerate(keys):
+            table[key] = index
+        self.assertGreater(table.table_size, HashTableSeparateChaining.DEFAULT_TABLE_SIZE)
+        for index, key in enumerate(keys):
+            self.assertEqual(table[key], index)
+            self.assertEqual(table.increment(key), index + 1)
+        del table[keys[0]]
+        self.assertNotIn(keys[0], table)
+        self.assertEqual(len(table), len(keys) - 1)
+
+    def test_separate_chaining_increment(self):
+        """
+        #name(Test increment counts keys in place, including within long chains)
+        """
+        rng = random.Random(3)
+        keys = random_keys(rng, 400, length=2)
+        for table in (HashTableSeparateChaining(), HashTableSeparateChaining(max_load_factor=None)):
+            expected = {}
+            for key in keys + keys[:100]:
+                expected[key] = expected.get(key, 0) + 1
+                self.assertEqual(table.increment(key), expected[key])
+            self.assertEqual(table.increment(keys[0], 5), expected[keys[0]] + 5)
+            expected[keys[0]] += 5
+
+            self.assertEqual(len(table), len(expected))
+            for key, count in expected.items():
+                self.assertEqual(table[key], count)
+            for key in keys[:50]:
+                if key in table:
+                    del table[key]
+            self.assertEqual(len(table.items()), len(table))
+            self.assertTrue(all(table[key] == expected[key] for key in keys[50:]))
+
+
+class TestQueuesAndStacks(TestCase):
+    def test_array_queue(self):
+        """
+        #name(Test the circular queue serves in order while it wraps, grows and shrinks)
+        """
+        rng = random.Random(4)
+        queue, reference = ArrayQueue(capacity=4), LinkedQueue()
+        for step in range(5000):
+            if rng.random() < (0.6 if step < 2500 else 0.3) or reference.is_empty():
+                queue.append(step)
+                reference.append(step)
+            else:
+                self.assertEqual(queue.peek(), reference.peek())
+                self.assertEqual(queue.serve(), reference.serve())
+            self.assertEqual(len(queue), len(reference))
+
+        while not reference.is_empty():
+            self.assertEqual(queue.serve(), reference.serve())
+        self.assertRaises(Exception, queue.serve)
+        queue.append("a")
+        queue.append("b")
+        self.assertEqual(str(queue), "<ArrayQueue [a, b]>")
+
+    def test_array_stack(self):
+        """
+        #name(Test the chunked stack pops in order across chunk boundaries)
+        """
+        rng = random.Random(5)
+        stack, reference = ArrayStack(), LinkedStack()
+        for step in range(3 * ArrayStack.CHUNK_SIZE * 4):
+            if rng.random() < (0.7 if step < 6 * ArrayStack.CHUNK_SIZE else 0.3) or reference.is_empty():
+                stack.push(step)
+                reference.push(step)
+            else:
+                self.assertEqual(stack.peek(), reference.peek())
+                self.assertEqual(stack.pop(), reference.pop())
+            self.assertEqual(len(stack), len(reference))
+
+        while not reference.is_empty():
+            self.assertEqual(stack.pop(), reference.pop())
+        self.assertRaises(Exception, stack.pop)
+        stack.push("a")
+        stack.push("b")
+        self.assertEqual(str(stack), "<ArrayStack [a, b]>")
+
+    def test_node_pool(self):
+        """
+        #name(Test linked structures sharing a node pool reuse nodes and keep their order)
+        """
+        pool = NodePool()
+        queue, stack, linked = LinkedQueue(pool=pool), LinkedStack(pool=pool), LinkedList(pool=pool)
+        for item in range(10):
+            queue.append(item)
+            stack.push(item)
+            linked.append(item)
+        self.assertEqual(queue.serve(), 0)
+        self.assertEqual(stack.pop(), 9)
+        self.assertEqual(linked.delete_at_index(3), 3)
+        self.assertEqual(len(pool), 3)
+
+        # New items take the free nodes first, which no longer hold their old items
+        queue.append(10)
+        stack.push(10)
+        self.assertEqual(len(pool), 1)
+        self.assertEqual([queue.serve() for _ in range(len(queue))], list(range(1, 11)))
+        self.assertEqual([stack.pop() for _ in range(len(stack))], [10] + list(range(8, -1, -1)))
+        self.assertEqual(list(linked), [0, 1, 2, 4, 5, 6, 7, 8, 9])
+
+        bounded = NodePool(capacity=2)
+        stack = LinkedStack(pool=bounded)
+        for item in range(5):
+            stack.push(item)
+        while not stack.is_empty():
+            stack.pop()
+        self.assertEqual(len(bounded), 2)
+        self.assertRaises(AttributeError, setattr, Node(1), "extra", 2)
+
+    def test_extend(self):
+        """
+        #name(Test extending queues and stacks matches adding each item)
+        """
+        for queue in (LinkedQueue(), LinkedQueue(pool=NodePool()), ArrayQueue(capacity=2)):
+            queue.append(-1)
+            queue.extend(range(40))
+            queue.extend(iter(range(40, 45)))
+            queue.extend(())
+            self.assertEqual(len(queue), 46)
+            self.assertEqual([queue.serve() for _ in range(46)], list(range(-1, 45)))
+            queue.extend([7])
+            self.assertEqual(queue.peek(), 7)
+
+        for stack in (LinkedStack(), LinkedStack(pool=NodePool()), ArrayStack()):
+            stack.push(-1)
+            stack.extend(range(2000))
+            stack.extend(())
+            self.assertEqual(len(stack), 2001)
+            self.assertEqual([stack.pop() for _ in range(2001)], list(range(1999, -2, -1)))
+
+        def failing():
+            yield from range(5)
+            raise ValueError
+        for queue, stack in ((LinkedQueue(), LinkedStack()), (ArrayQueue(capacity=2), ArrayStack())):
+            queue.append(-1)
+            self.assertRaises(ValueError, queue.extend, failing())
+            self.assertRaises(ValueError, stack.extend, failing())
+            self.assertEqual(len(queue), 1)
+            self.assertTrue(stack.is_empty())
+            queue.extend(range(3))
+            self.assertEqual([queue.serve() for _ in range(4)], [-1, 0, 1, 2])
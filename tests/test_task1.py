@@ -1,11 +1,13 @@
 from unittest import TestCase
+import asyncio
 import ast
 import inspect
 
 from tests.helper import CollectionsFinder
 
 
-from processing_line import ProcessingLine, Transaction
+from data_structures import ArrayQueue, ArrayStack
+from processing_line import AsyncProcessingLine, ProcessingLine, ProcessingLinePool, Transaction, TransactionBatch, sign_batch
 
 
 class TestTask1Setup(TestCase):
@@ -43,6 +45,234 @@ class TestTask1(TestTask1Setup):
                 self.fail("Iterator returned more transactions than expected.")
         
         self.assertEqual(counter, 3, "Line iterator should've returned exactly 3 transactions.")
+
+    def test_sign_batch_matches_sign(self):
+        """
+        #name(sign_batch produces the same signatures as sign)
+        """
+        transactions = [
+            Transaction(50, "alice", "bob"),
+            Transaction(0, "", ""),
+            Transaction(-7, "émile", "zoë"),
+            Transaction(10**30, "a" * 200, "b" * 3),
+        ]
+        expected = []
+        for transaction in transactions:
+            reference = Transaction(transaction.timestamp, transaction.from_user, transaction.to_user)
+            reference.sign()
+            expected.append(reference.signature)
+
+        signatures = sign_batch(iter(transactions))
+        self.assertEqual(len(signatures), len(transactions))
+        for index, transaction in enumerate(transactions):
+            self.assertEqual(transaction.signature, expected[index])
+            self.assertEqual(signatures[index], expected[index])
+
+    def test_parallel_drain_order(self):
+        """
+        #name(Parallel drain keeps the iterator order)
+        """
+        def make_line():
+            line = ProcessingLine(Transaction(100, "bob", "dave"))
+            for timestamp in (120, 50, 130, 70, 100, 10, 150):
+                line.add_transaction(Transaction(timestamp, f"user{timestamp}", "carol"))
+            return line
+
+        expected = [(transaction.timestamp, transaction.signature) for transaction in make_line()]
+        drained = make_line().drain(workers=2, chunk_size=3)
+        self.assertEqual([(transaction.timestamp, transaction.signature) for transaction in drained], expected)
+
+        line = make_line()
+        line.drain()
+        with self.assertRaises(RuntimeError):
+            iter(line)
+
+    def test_array_backed_line(self):
+        """
+        #name(Array queue and stack backends keep the line order)
+        """
+        def make_line(**backends):
+            line = ProcessingLine(Transaction(1000, "bob", "dave"), **backends)
+            for timestamp in range(0, 2000, 3):
+                line.add_transaction(Transaction(timestamp, f"user{timestamp}", "carol"))
+            return line
+
+        expected = [transaction.timestamp for transaction in make_line()]
+        arrays = make_line(queue_type=ArrayQueue, stack_type=ArrayStack)
+        self.assertIsInstance(arrays._before_queue, ArrayQueue)
+        self.assertEqual([transaction.timestamp for transaction in arrays], expected)
+
+    def test_add_transactions(self):
+        """
+        #name(Adding a batch matches adding one at a time, sorted or not)
+        """
+        timestamps = [120, 50, 130, 70, 100, 10, 150, 100, 95]
+        for backends in ({}, {"queue_type": ArrayQueue, "stack_type": ArrayStack}):
+            one_by_one = ProcessingLine(Transaction(100, "bob", "dave"), **backends)
+            for timestamp in timestamps:
+                one_by_one.add_transaction(Transaction(timestamp, "alice", "carol"))
+            expected = [transaction.timestamp for transaction in one_by_one]
+
+            batched = ProcessingLine(Transaction(100, "bob", "dave"), **backends)
+            batched.add_transactions(Transaction(timestamp, "alice", "carol") for timestamp in timestamps[:4])
+            batched.add_transactions(TransactionBatch.from_transactions(
+                [Transaction(timestamp, "alice", "carol") for timestamp in timestamps[4:]]))
+            self.assertEqual([transaction.timestamp for transaction in batched], expected)
+
+            presorted = ProcessingLine(Transaction(100, "bob", "dave"), **backends)
+            presorted.add_transactions((Transaction(timestamp, "alice", "carol") for timestamp in sorted(timestamps)),
+                                       presorted=True)
+            self.assertEqual([transaction.timestamp for transaction in presorted],
+                             [10, 50, 70, 95, 100, 100, 100, 150, 130, 120])
+            with self.assertRaises(RuntimeError):
+                presorted.add_transactions(())
+
+            # A batch that fails part way leaves the line as it was.
+            def failing(timestamps):
+                for timestamp in timestamps:
+                    yield Transaction(timestamp, "alice", "carol")
+                raise ValueError
+            for sort in (False, True):
+                line = ProcessingLine(Transaction(100, "bob", "dave"), **backends)
+                line.add_transaction(Transaction(60, "alice", "carol"))
+                with self.assertRaises(ValueError):
+                    line.add_transactions(failing(sorted(timestamps) if sort else timestamps), presorted=sort)
+                self.assertEqual([transaction.timestamp for transaction in line], [60, 100])
+
+    def test_line_pool_routing_and_drain(self):
+        """
+        #name(Line pool routes by critical timestamp and drains like its lines)
+        """
+        def make_pool(**backends):
+            pool = ProcessingLinePool((Transaction(critical, "bob", "dave") for critical in (300, 100, 200)), **backends)
+            pool.add_transactions(Transaction(timestamp, f"user{timestamp}", "carol") for timestamp in range(0, 400, 7))
+            pool.add_transaction(Transaction(200, "erin", "carol"))
+            return pool
+
+        pool = make_pool()
+        self.assertEqual([pool[index].critical_transaction.timestamp for index in range(len(pool))], [100, 200, 300])
+        self.assertIs(pool.line_for(5), pool[0])
+        self.assertIs(pool.line_for(199), pool[0])
+        self.assertIs(pool.line_for(200), pool[1])
+        self.assertIs(pool.line_for(1000), pool[2])
+
+        expected = [[(transaction.timestamp, transaction.signature) for transaction in pool[index]]
+                    for index in range(len(pool))]
+        self.assertEqual([timestamp for timestamp, _ in expected[1]][:2], [200, 200])
+        for workers in (1, 2):
+            drained = make_pool(queue_type=ArrayQueue, stack_type=ArrayStack).drain(workers=workers, chunk_size=10)
+            self.assertEqual([[(transaction.timestamp, transaction.signature) for transaction in line]
+                              for line in drained], expected)
+
+        with self.assertRaises(RuntimeError):
+            pool.drain()
+        with self.assertRaises(ValueError):
+            ProcessingLinePool().line_for(0)
+
+    def test_async_line(self):
+        """
+        #name(Async line applies backpressure and yields signed transactions in line order)
+        """
+        timestamps = [120, 50, 130, 70, 100, 10, 150, 90, 60, 30]
+
+        def make_transactions():
+            return [Transaction(timestamp, f"user{timestamp}", "carol") for timestamp in timestamps]
+
+        line = ProcessingLine(Transaction(100, "bob", "dave"))
+        for transaction in make_transactions():
+            line.add_transaction(transaction)
+        expected = [(transaction.timestamp, transaction.signature) for transaction in line]
+
+        async def run():
+            line = AsyncProcessingLine(Transaction(100, "bob", "dave"), max_pending=2, batch_size=2)
+
+            async def produce():
+                for transaction in make_transactions():
+                    await line.add(transaction)
+                await line.close()
+
+            # Without a consumer the producer stops once two transactions are queued
+            producer = asyncio.ensure_future(produce())
+            await asyncio.sleep(0.05)
+            self.assertFalse(producer.done())
+            self.assertEqual(len(line._before_queue), 2)
+
+            received = []
+            async for transaction in line:
+                received.append((transaction.timestamp, transaction.signature))
+            await producer
+            with self.assertRaises(RuntimeError):
+                await line.add(Transaction(1, "alice", "bob"))
+            return received
+
+        self.assertEqual(asyncio.run(run()), expected)
+
+        async def run_closed():
+            # Only add feeds the line, and closing it leaves it free to drain.
+            line = AsyncProcessingLine(Transaction(100, "bob", "dave"))
+            with self.assertRaises(RuntimeError):
+                line.add_transaction(Transaction(50, "alice", "bob"))
+            with self.assertRaises(RuntimeError):
+                line.add_transactions([Transaction(50, "alice", "bob")])
+            for transaction in make_transactions():
+                await line.add(transaction)
+            await line.close()
+            drained = line.drain()
+            with self.assertRaises(RuntimeError):
+                line.__aiter__()
+            return [(transaction.timestamp, transaction.signature) for transaction in drained]
+
+        self.assertEqual(asyncio.run(run_closed()), expected)
+
+        async def run_drained():
+            line = AsyncProcessingLine(Transaction(100, "bob", "dave"))
+            line.drain()
+            await line.add(Transaction(50, "alice", "bob"))
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(run_drained())
+
+    def test_transaction_batch_round_trip(self):
+        """
+        #name(TransactionBatch stores and signs rows like Transaction)
+        """
+        transactions = [Transaction(50, "alice", "bob"), Transaction(60, "bob", "alice"), Transaction(70, "alice", "carol")]
+        batch = TransactionBatch.from_transactions(transactions)
+        self.assertEqual(len(batch), 3)
+        self.assertIsNone(batch.signature_at(0))
+
+        batch.sign()
+        sign_batch(transactions)
+        self.assertEqual(list(batch.signatures()), [transaction.signature for transaction in transactions])
+        for index, row in enumerate(batch):
+            self.assertEqual((row.timestamp, row.from_user, row.to_user, row.signature),
+                             (transactions[index].timestamp, transactions[index].from_user,
+                              transactions[index].to_user, transactions[index].signature))
+
+        # Rows come out as copies, and signed copies can be written back.
+        unsigned = TransactionBatch.from_transactions([Transaction(50, "alice", "bob"), Transaction(60, "bob", "alice")])
+        row = unsigned[1]
+        row.sign()
+        self.assertIsNone(unsigned.signature_at(1))
+        unsigned[-1] = row
+        self.assertEqual(unsigned.signature_at(1), transactions[1].signature)
+        self.assertEqual(tuple(unsigned.rows_starting_with(transactions[1].signature[:30])), (1,))
+        self.assertEqual(tuple(unsigned.rows_starting_with("")), (1,))
+        with self.assertRaises(IndexError):
+            unsigned[2] = row
+
+        prefix = transactions[0].signature[:24]
+        self.assertEqual(tuple(batch.rows_starting_with(prefix)),
+                         tuple(index for index, transaction in enumerate(transactions)
+                               if transaction.signature.startswith(prefix)))
+        self.assertEqual(tuple(batch.rows_starting_with(transactions[2].signature[5:])), ())
+
+        with self.assertRaises(AttributeError):
+            transactions[0].amount = 10
+
+        many = TransactionBatch.from_transactions(Transaction(index, f"user{index}", f"user{index // 2}")
+                                                  for index in range(3000))
+        self.assertEqual((many[2999].from_user, many[2999].to_user), ("user2999", "user1499"))
     
 
 class TestTask1Approach(TestTask1Setup):
@@ -1,11 +1,13 @@
 from unittest import TestCase
 import ast
 import inspect
+import os
+import tempfile
 
 from tests.helper import CollectionsFinder
 
 from processing_line import Transaction
-from processing_book import ProcessingBook
+from processing_book import FlatProcessingBook, MappedProcessingBook, ProcessingBook
 
 from data_structures import ArrayR
 
@@ -26,6 +28,197 @@ class TestTask2(TestTask2Setup):
 
         book[transaction] = 100
         self.assertEqual(book[transaction], 100)
+
+    def test_flat_book_matches_book(self):
+        """
+        #name(FlatProcessingBook behaves like ProcessingBook)
+        """
+        signatures = ["abc123", "0bbzzz", "abcxyz", "abd000", "zzzzzz"]
+        transactions = []
+        for index, signature in enumerate(signatures):
+            transaction = Transaction(index, "sender", "receiver")
+            transaction.signature = signature
+            transactions.append(transaction)
+
+        book = ProcessingBook()
+        flat = FlatProcessingBook()
+        for index, transaction in enumerate(transactions):
+            book[transaction] = index * 10
+            flat[transaction] = index * 10
+        book[transactions[1]] = 99
+        flat[transactions[1]] = 99
+
+        self.assertEqual(len(flat), len(book))
+        self.assertEqual(flat.get_error_count(), book.get_error_count())
+        for transaction in transactions:
+            self.assertEqual(flat[transaction], book[transaction])
+
+        del book[transactions[0]]
+        del flat[transactions[0]]
+        del book[transactions[3]]
+        del flat[transactions[3]]
+        with self.assertRaises(KeyError):
+            flat[transactions[0]]
+        self.assertEqual(len(flat), 3)
+        self.assertEqual(flat[transactions[2]], 20)
+        # The "abc" levels collapsed, so abcxyz sits directly on page "a" of the root.
+        self.assertLess(flat.children[flat.page_index("a")], 0)
+        self.assertIsInstance(book.pages[book.page_index("a")], tuple)
+
+    def test_sample(self):
+        """
+        #name(Test sampling from a processing book)
+        """
+        book = ProcessingBook()
+        transactions = []
+        for index, signature in enumerate(["abc123", "abd456", "abe789", "0bbzzz", "zzzzzz", "zzzzza"]):
+            transaction = Transaction(index, "sender", "receiver")
+            transaction.signature = signature
+            transactions.append(transaction)
+            book[transaction] = 0 if index < 3 else 10
+
+        pages = [book.pages[index] for index in range(len(book.pages))]
+        reading = book.items()
+        first = next(reading)
+        sample = book.sample(6, seed=7)
+        self.assertEqual(len(sample), 6)
+        self.assertEqual(len({transaction.signature for transaction in sample}), 6)
+        self.assertEqual([t.signature for t in book.sample(4, seed=3)], [t.signature for t in book.sample(4, seed=3)])
+
+        # Sampling without replacement only reads the book, so a walk over it carries on.
+        self.assertEqual([first] + list(reading), list(book.items()))
+        self.assertTrue(all(book.pages[index] is pages[index] for index in range(len(pages))))
+        self.assertEqual(len(book), 6)
+        for index, transaction in enumerate(transactions):
+            self.assertEqual(book[transaction], 0 if index < 3 else 10)
+
+        weighted = book.sample(20, replace=True, seed=1, weighted=True)
+        self.assertTrue(all(book[transaction] == 10 for transaction in weighted))
+        with self.assertRaises(ValueError):
+            book.sample(4, weighted=True)
+        with self.assertRaises(ValueError):
+            book.sample(7)
+
+        # Any amount can be stored, but weighted sampling needs non-negative numbers.
+        odd = Transaction(6, "sender", "receiver")
+        odd.signature = "zzzzzb"
+        book[odd] = "ten"
+        self.assertEqual(book[odd], "ten")
+        self.assertIsNone(book.amount_total)
+        self.assertEqual(len(book.sample(7, seed=2)), 7)
+        with self.assertRaises(ValueError):
+            book.sample(1, weighted=True)
+
+        negative = ProcessingBook()
+        for index, (signature, amount) in enumerate([("abc", -5), ("abd", 3), ("zzz", 10)]):
+            transaction = Transaction(index, "sender", "receiver")
+            transaction.signature = signature
+            negative[transaction] = amount
+        with self.assertRaises(ValueError):
+            for seed in range(20):
+                negative.sample(1, seed=seed, weighted=True)
+
+    def test_bulk_load_matches_inserts(self):
+        """
+        #name(Test bulk loading builds the same book as inserting)
+        """
+        def pages_of(book):
+            return [pages_of(page) if isinstance(page, ProcessingBook) else page for page in book.pages]
+
+        pairs = []
+        for index in range(200):
+            transaction = Transaction(index, "sender", "receiver")
+            transaction.signature = "000" + format(index * 7919 % 1000, "03d") + "ab"[index % 2]
+            pairs.append((transaction, index % 3))
+        pairs.append((pairs[5][0], 99))
+        pairs.append((pairs[6][0], pairs[6][1]))
+
+        inserted = ProcessingBook()
+        for transaction, amount in pairs:
+            inserted[transaction] = amount
+        loaded = ProcessingBook()
+        loaded.bulk_load(iter(pairs))
+
+        self.assertEqual(pages_of(loaded), pages_of(inserted))
+        self.assertEqual(len(loaded), len(inserted))
+        self.assertEqual(loaded.get_error_count(), 1)
+
+        # Short and prefix signatures, above the cutoff, count the same as inserting them
+        def signed(signatures):
+            pairs = []
+            for index, signature in enumerate(signatures):
+                transaction = Transaction(index, "sender", "receiver")
+                transaction.signature = signature
+                pairs.append((transaction, index % 4))
+            return pairs
+
+        letters = "bcdefghijklmnopqrstu"
+        cases = [
+            ["a"] + ["a" + letter for letter in letters],
+            ["a" + letter for letter in letters] + ["a"],
+            ["ab", "ac"] + ["a"] + ["ab" + letter for letter in letters] + ["", "0", "0"],
+            [str(index % 7) * (index % 5) + "xy"[index % 2] for index in range(300)],
+        ]
+        for signatures in cases:
+            pairs = signed(signatures)
+            inserted = ProcessingBook()
+            for transaction, amount in pairs:
+                inserted[transaction] = amount
+            loaded = ProcessingBook()
+            loaded.bulk_load(pairs)
+
+            self.assertEqual(pages_of(loaded), pages_of(inserted))
+            self.assertEqual(len(loaded), len(inserted))
+            self.assertEqual(loaded.get_error_count(), inserted.get_error_count())
+            self.assertEqual(loaded.amount_total, inserted.amount_total)
+
+    def test_iteration_and_prefix_scans(self):
+        """
+        #name(Test iterating a processing book in signature order)
+        """
+        book = ProcessingBook()
+        signatures = ["abcxyz", "abc123", "0bbzzz", "abd000", "zzzzzz", "ab9999"]
+        for index, signature in enumerate(signatures):
+            transaction = Transaction(index, "sender", "receiver")
+            transaction.signature = signature
+            book[transaction] = index
+
+        self.assertEqual([transaction.signature for transaction in book], sorted(signatures))
+        self.assertEqual([amount for _, amount in book.items()], [2, 5, 1, 0, 3, 4])
+        self.assertEqual([transaction.signature for transaction, _ in book.prefix_items("abc")], ["abc123", "abcxyz"])
+        self.assertEqual([transaction.signature for transaction, _ in book.prefix_items("zz")], ["zzzzzz"])
+        self.assertEqual(list(book.prefix_items("abe")), [])
+        self.assertEqual(list(book.prefix_items("ABC")), [])
+
+    def test_saved_book_maps_back(self):
+        """
+        #name(Test a saved processing book can be memory-mapped back)
+        """
+        book = ProcessingBook()
+        transactions = []
+        for index in range(300):
+            transaction = Transaction(index, "sender", "receiver")
+            transaction.signature = format(index * 7919 % 1000, "03d") + "xy"[index % 2]
+            transactions.append(transaction)
+            book[transaction] = index * 0.5 if index % 3 else index
+        book[transactions[0]] = 42
+        book[transactions[1]] = 1.25
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "book.pbook")
+            book.save(path)
+            with MappedProcessingBook(path) as mapped:
+                self.assertEqual(len(mapped), len(book))
+                self.assertEqual(mapped.get_error_count(), book.get_error_count())
+                for transaction in transactions[2:]:
+                    self.assertEqual(mapped[transaction], book[transaction])
+                    self.assertIn(transaction, mapped)
+                self.assertEqual(mapped[transactions[0]], book[transactions[0]])
+                self.assertEqual([t.signature for t in mapped], [t.signature for t in book])
+
+                missing = Transaction(0, "sender", "receiver")
+                missing.signature = "zzzz"
+                self.assertNotIn(missing, mapped)
     
 
 
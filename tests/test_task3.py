@@ -1,13 +1,15 @@
 from unittest import TestCase
 import ast
 import inspect
+import math
 
 from tests.helper import CollectionsFinder
 
 from data_structures import ArrayR
 
 from processing_line import Transaction
-from fraud_detection import FraudDetection
+from fraud_detection import FraudDetection, StreamingFraudDetector, _ProbeChains
+from data_structures.hash_table_linear_probing import LinearProbeTable
 
 
 def to_array(lst):
@@ -25,6 +27,14 @@ def from_array(arr):
     return [from_array(item) if isinstance(item, ArrayR) else item for item in arr]
 
 
+def timestamp_key(transaction):
+    return transaction.timestamp
+
+
+def clustered_key(transaction):
+    return transaction.timestamp * 19
+
+
 class TestTask3Setup(TestCase):
     pass
     
@@ -47,6 +57,89 @@ class TestTask3(TestTask3Setup):
         self.assertGreaterEqual(blocks_response[1], 1, "Suspicion score for this example is 1, because there is only one transaction.")
 
 
+    def test_detect_by_blocks_prefers_finer_groups(self):
+        """
+        #name(Test block detection picks the block size with the highest score)
+        """
+        signatures = ["abcdef", "cdefab", "efcdab", "badcfe", "dcbafe", "fedcba", "zzzzzz"]
+        transactions = ArrayR(len(signatures))
+        for index, signature in enumerate(signatures):
+            transactions[index] = Transaction(index, "Alice", "Bob")
+            transactions[index].signature = signature
+
+        # Block size 1 puts the first six in one group (6), block size 2 splits them into two groups of 3 (9)
+        self.assertEqual(FraudDetection(transactions).detect_by_blocks(), (2, 9))
+        block_size, log_score = FraudDetection(transactions).detect_by_blocks(exact=False)
+        self.assertEqual(block_size, 2)
+        self.assertAlmostEqual(log_score, math.log(9))
+
+    def test_parallel_detect_by_blocks(self):
+        """
+        #name(Test block detection gives the same answer across worker processes)
+        """
+        signatures = ["abcdef", "cdefab", "efcdab", "badcfe", "dcbafe", "fedcba", "zzzzzz", "zzzzzz", "fabcde"]
+        transactions = ArrayR(len(signatures))
+        for index, signature in enumerate(signatures):
+            transactions[index] = Transaction(index, "Alice", "Bob")
+            transactions[index].signature = signature
+
+        fraud_detection = FraudDetection(transactions)
+        self.assertEqual(fraud_detection.detect_by_blocks(workers=2), fraud_detection.detect_by_blocks())
+        self.assertRaises(ValueError, fraud_detection.detect_by_blocks, 0)
+
+    def test_streaming_detector(self):
+        """
+        #name(Test the streaming detector keeps up with block detection)
+        """
+        signatures = ["abcdef", "cdefab", "efcdab", "badcfe", "dcbafe", "fedcba", "zzzzzz"]
+        transactions = ArrayR(len(signatures))
+        for index, signature in enumerate(signatures):
+            transactions[index] = Transaction(index, "Alice", "Bob")
+            transactions[index].signature = signature
+
+        detector = StreamingFraudDetector()
+        for index in range(len(transactions)):
+            detector.add(transactions[index])
+            seen = ArrayR.from_list([transactions[i] for i in range(index + 1)])
+            self.assertEqual(detector.best(), FraudDetection(seen).detect_by_blocks())
+        self.assertEqual(len(detector), len(signatures))
+
+        # Only the last three timestamps stay in the window, where "dcbafe" and "fedcba" group at block size 1
+        windowed = StreamingFraudDetector(window=2)
+        windowed.extend(transactions[index] for index in range(len(transactions)))
+        self.assertEqual(len(windowed), 3)
+        self.assertEqual(windowed.best(), (1, 2))
+        self.assertRaises(ValueError, windowed.add, Transaction(7, "Alice", "Bob"))
+
+    def test_rectify_across_workers(self):
+        """
+        #name(Test rectify gives the same answer across worker processes)
+        """
+        transactions = to_array([Transaction(timestamp, "Alice", "Bob") for timestamp in range(1, 9)])
+        functions = to_array([clustered_key, timestamp_key, clustered_key, timestamp_key, clustered_key])
+        fraud_detection = FraudDetection(transactions)
+
+        # Keys 1 to 8 hash without a collision, while multiples of 19 probe up to 3 slots
+        self.assertEqual(fraud_detection.rectify(functions), (timestamp_key, 0))
+        self.assertEqual(fraud_detection.rectify(functions, workers=2), (timestamp_key, 0))
+        self.assertEqual(fraud_detection.rectify(to_array([clustered_key])), (clustered_key, 3))
+        self.assertEqual(fraud_detection.rectify(ArrayR(0)), (None, float("inf")))
+
+    def test_probe_chains_at_last_size(self):
+        """
+        #name(Test replayed probing fills the last table size like a LinearProbeTable)
+        """
+        keys = [str(key) for key in range(14)]
+        table = LinearProbeTable(sizes=[5, 13])
+        for key in keys[:13]:
+            table[key] = None
+        self.assertRaises(RuntimeError, table.__setitem__, keys[13], None)
+
+        chains = _ProbeChains(sizes=(5, 13))
+        self.assertIsInstance(chains.max_probe_chain(iter(keys[:13] + keys[:13])), int)
+        self.assertRaises(RuntimeError, chains.max_probe_chain, iter(keys))
+
+
 
 class TestTask3Approach(TestTask3Setup):
     def test_python_built_ins_not_used(self):